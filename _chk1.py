@@ -0,0 +1,34 @@
+import os, pickle, time
+os.environ["TRADINGSIGNALS_DATA_SOURCE"]="synthetic"
+import numpy as np, pandas as pd
+from data.synthetic import synthetic_ohlcv
+from backtesting.backtester import run_backtest, iter_trade_arrays
+from backtesting import checkpoint
+pd_ = {"15m": synthetic_ohlcv("BTCUSDT","15m",6000,seed=2), "1h": synthetic_ohlcv("BTCUSDT","1h",1500,seed=2)}
+base = pd_["15m"]
+full = run_backtest(base,"BTCUSDT","15m",[],pd_,verbose=False)
+print("trades", len(full), full.exit_reason.value_counts().to_dict())
+# interrupt
+path="/tmp/ck.pkl"
+if os.path.exists(path): os.remove(path)
+orig = checkpoint.save_checkpoint
+n={"c":0}
+def boom(*a, **k):
+    orig(*a, **k); n["c"]+=1
+    if n["c"]==2: raise RuntimeError("preempt")
+checkpoint.save_checkpoint = boom
+try:
+    checkpoint.run_backtest_resumable(base,"BTCUSDT","15m",pd_,path,chunk_bars=500)
+except RuntimeError as e: print("interrupted", e)
+checkpoint.save_checkpoint = orig
+res = checkpoint.run_backtest_resumable(base,"BTCUSDT","15m",pd_,path,chunk_bars=500, verbose=True)
+print("equal", res.equals(full), pickle.dumps(res)==pickle.dumps(full))
+# ambiguity
+tf = run_backtest(base,"BTCUSDT","15m",[],pd_,verbose=False, ambiguity="tp_first")
+print("tp_first", tf.exit_reason.value_counts().to_dict())
+# monte carlo timing
+from backtesting.monte_carlo import monte_carlo_report
+df = pd.DataFrame({"net_return_percent": np.random.default_rng(0).normal(0.1,1,1000)})
+t=time.time(); r=monte_carlo_report(df, print_report=False, seed=1); print("mc", time.time()-t)
+from backtesting.evaluator import calculate_backtest_metrics
+t=time.time(); m=calculate_backtest_metrics(full); print(m.scalars()); print(time.time()-t)
@@ -1,20 +1,62 @@
 # backtesting/backtester.py
 
+import io
+import os
+
+import numpy as np
 import pandas as pd
 from datetime import timedelta
-from indicators.rsi import calculate_rsi
-from indicators.macd import calculate_macd
-from indicators.bollinger import calculate_bollinger_bands
-from indicators.volatility import calculate_volatility
-from logic.risk_manager import calculate_risk_management
-from logic.signal_timer import estimate_signal_duration
-#from logic.signal_engine import generate_backtest_signal
-from logic.signal_engine import generate_live_signal as generate_backtest_signal
-
-# Load historical sentiment data
-url = "https://intern-tradingsignals.onrender.com/sentiment/csv"
-sentiment_df = pd.read_csv(url, names=["timestamp", "symbol", "sentiment"], header=None)
-sentiment_df["timestamp"] = pd.to_datetime(sentiment_df["timestamp"])
+from config import DATA_SOURCE, SYNTHETIC_SEED
+from data.synthetic import synthetic_sentiment_history
+from indicators.atr import calculate_atr_series
+from logic.risk_manager import calculate_risk_management_batch, format_risk_reward_label
+from logic.signal_timer import estimate_signal_durations
+from logic.signal_series import indicator_frame, signal_series
+from strategies.params import resolve_params
+from backtesting.exit_engine import interval_to_minutes, duration_to_bars, find_exits
+from utils.metrics import record_cache_lookup
+from utils.transport import http_get
+
+# Signal thresholds of generate_live_signal, which the backtest has always used
+BACKTEST_MIN_AGREEING = 2
+BACKTEST_CONFIDENCE_THRESHOLD = 57
+
+# Historical sentiment log, as served by server.py
+SENTIMENT_HISTORY_URL = "https://intern-tradingsignals.onrender.com/sentiment/csv"
+SENTIMENT_HISTORY_FILE = "data/sentiment_history.csv"
+
+# Loaded on first use by get_sentiment_history; worker processes set it directly
+sentiment_df = None
+
+def load_sentiment_history():
+    """
+    The sentiment log: downloaded from the server, read from the local log file if
+    that fails, or generated when DATA_SOURCE is "synthetic".
+    """
+    columns = ["timestamp", "symbol", "sentiment"]
+    if DATA_SOURCE == "synthetic":
+        return synthetic_sentiment_history(seed=SYNTHETIC_SEED)
+    try:
+        response = http_get(SENTIMENT_HISTORY_URL, timeout=30)
+        response.raise_for_status()
+        history = pd.read_csv(io.BytesIO(response.content), names=columns, header=None)
+    except Exception as e:
+        print(f"⚠️ Could not download sentiment history ({e}), using {SENTIMENT_HISTORY_FILE}")
+        if os.path.exists(SENTIMENT_HISTORY_FILE) and os.path.getsize(SENTIMENT_HISTORY_FILE) > 0:
+            history = pd.read_csv(SENTIMENT_HISTORY_FILE, names=columns, header=None)
+        else:
+            history = pd.DataFrame(columns=columns)
+    # sentiment_logger writes a header row when it creates the file
+    history = history[history["timestamp"] != "timestamp"].reset_index(drop=True)
+    history["timestamp"] = pd.to_datetime(history["timestamp"])
+    return history
+
+def get_sentiment_history():
+    global sentiment_df
+    record_cache_lookup("sentiment_history", sentiment_df is not None)
+    if sentiment_df is None:
+        sentiment_df = load_sentiment_history()
+    return sentiment_df
 
 def sentiment_label_to_score(label):
     mapping = {"bullish": 1.0, "neutral": 0.0, "bearish": -1.0}
@@ -22,6 +64,7 @@ def sentiment_label_to_score(label):
 
 def get_historical_sentiment(symbol, ts):
     ts_rounded = ts.replace(minute=(ts.minute // 30) * 30, second=0, microsecond=0)
+    sentiment_df = get_sentiment_history()
     filtered = sentiment_df[
         (sentiment_df["symbol"] == symbol) & 
         (sentiment_df["timestamp"] <= ts_rounded)
@@ -31,139 +74,375 @@ def get_historical_sentiment(symbol, ts):
         return sentiment_label_to_score(label)
     return 0.0
 
-def run_backtest(price_df, symbol, interval, headlines, price_data_dict):
-    backtest_results = []
-    commission_rate = 0.002  # 0.2%
-    next_trade_possible_at = price_df.index[0]
+def get_historical_sentiment_series(symbol, timestamps):
+    """get_historical_sentiment for many timestamps with one sorted search."""
+    sentiment_df = get_sentiment_history()
+    history = sentiment_df[sentiment_df["symbol"] == symbol].sort_values("timestamp", kind="mergesort")
+    scores = np.array([sentiment_label_to_score(label) for label in history["sentiment"]] + [0.0])
 
-    for i in range(20, len(price_df) - 5):
-        current_time = pd.to_datetime(price_df.index[i])
-        if current_time < next_trade_possible_at:
-            continue
+    rounded = pd.DatetimeIndex(timestamps).floor("30min")
+    position = pd.DatetimeIndex(history["timestamp"]).searchsorted(rounded, side="right") - 1
+    # -1 (nothing logged yet) picks the trailing 0.0
+    return scores[position]
+
+def prepare_backtest_series(price_df, symbol, interval, price_data_dict, params=None, cache=None):
+    """
+    Per-bar arrays the backtest reads: signal and confidence at each bar, the
+    indicators of the candles before it, ATR and the estimated signal duration.
+
+    `cache` (a dict) keeps sentiment, ATR and indicator frames between calls on
+    the same candles, so sweeps and walk-forward folds only recompute what their
+    parameters change.
+    """
+    params = dict(params or {})
+    min_agreeing = params.pop("min_agreeing", BACKTEST_MIN_AGREEING)
+    confidence_threshold = params.pop("confidence_threshold", BACKTEST_CONFIDENCE_THRESHOLD)
+    strategy_params = resolve_params(params)
+    cache = {} if cache is None else cache
+
+    if "sentiment" not in cache:
+        cache["sentiment"] = get_historical_sentiment_series(symbol, price_df.index)
+    if "atr" not in cache:
+        cache["atr"] = calculate_atr_series(price_df).to_numpy()
+    frames = cache.setdefault(("frames", tuple(sorted(strategy_params.items()))), {})
+
+    sentiment = cache["sentiment"]
+    signals, confidences = signal_series(
+        price_data_dict, price_df.index, sentiment, min_agreeing, confidence_threshold,
+        strategy_params, frames
+    )
+
+    # signal_series has just cached the base timeframe's frame when it is these candles
+    candles = price_data_dict.get(interval)
+    cached = candles is not None and candles.index.equals(price_df.index)
+    base = frames.get(interval) if cached else None
+    if base is None:
+        base = indicator_frame(price_df, strategy_params)
+        if cached:
+            frames[interval] = base
 
-        subset = price_df.iloc[:i]
-        current = price_df.iloc[i]
-        next_candles = price_df.iloc[i+1:i+6]
-        sentiment_score = get_historical_sentiment(symbol, current_time)
+    # Indicators are read from the candles before the entry bar (df.iloc[:i])
+    before = base.shift(1)
+    macd = before["macd"].to_numpy()
+    volatility = before["volatility"].to_numpy()
 
-        current_tf_data = {
-            tf: df[df.index <= current_time].copy()
-            for tf, df in price_data_dict.items()
-        }
+    durations = estimate_signal_durations(
+        signal_types=signals,
+        confidences=confidences,
+        trends=np.where(macd == "bullish", "uptrend", np.where(macd == "bearish", "downtrend", "sideways")),
+        sentiments=np.where(sentiment > 0.3, "bullish", np.where(sentiment < -0.3, "bearish", "neutral")),
+        volatilities=volatility,
+        timeframe=interval
+    )
 
-        signal, confidence = generate_backtest_signal(current_tf_data, sentiment_score, symbol)
-        if signal == "HOLD":
+    return {
+        "signal": signals,
+        "confidence": confidences,
+        "sentiment": sentiment,
+        "rsi": before["rsi"].to_numpy(),
+        "rsi_signal": before["rsi_signal"].to_numpy(),
+        "macd": macd,
+        "bollinger": before["bollinger"].to_numpy(),
+        "volatility": volatility,
+        "atr": np.round(np.r_[np.nan, cache["atr"][:-1]], 4),
+        "estimated_duration_minutes": durations,
+    }
+
+COMMISSION_RATE = 0.002  # 0.2%
+
+def simulate_trades(price_df, series, idx, interval_minutes, ambiguity="sl_first", commission_rate=COMMISSION_RATE,
+                    horizon=None):
+    """
+    Risk levels, exits and returns for trades opened at bar positions `idx`,
+    all resolved with array operations. With `horizon`, exits are resolved on the
+    candles before that bar position only (a trade still open there exits on TIME).
+
+    Returns a dict of arrays aligned with idx (series fields at the entry plus
+    stop_loss, take_profit, risk, reward, expected_profit_percent, risk_level,
+    exit_index, exit_price, exit_reason, raw_return, net_return_percent, result).
+    """
+    idx = np.asarray(idx, dtype=np.int64)
+    trades = {key: values[idx] for key, values in series.items()}
+    signals = trades["signal"]
+    opens = price_df["open"].to_numpy()[idx]
+    closes = price_df["close"].to_numpy()
+    is_buy = signals == "BUY"
+
+    # Risk is sized off the last closed candle before the entry, as in the live pipeline
+    risk = calculate_risk_management_batch(
+        closes[idx - 1], signals, trades["confidence"], trades["volatility"], trades["atr"],
+        trend_strength=0.6, sentiment=trades["sentiment"]
+    )
+
+    window_bars = duration_to_bars(trades["estimated_duration_minutes"], interval_minutes)
+    exit_index, exit_price, exit_reason = find_exits(
+        price_df["high"].to_numpy()[:horizon], price_df["low"].to_numpy()[:horizon], closes[:horizon],
+        idx, signals, risk["stop_loss"], risk["take_profit"], window_bars, ambiguity=ambiguity
+    )
+
+    raw_return = np.where(is_buy, (exit_price - opens) / opens * 100, (opens - exit_price) / opens * 100)
+    # TIME exits succeed when the price moved in the expected direction
+    moved_right = np.where(is_buy, exit_price > opens, exit_price < opens)
+    result = np.where(exit_reason == "TP", "SUCCESS",
+                      np.where(exit_reason == "SL", "FAILURE",
+                               np.where(moved_right, "SUCCESS", "FAILURE")))
+
+    trades.update(
+        index=idx, open=opens, close=closes[idx],
+        stop_loss=risk["stop_loss"], take_profit=risk["take_profit"],
+        risk=risk["risk"], reward=risk["reward"],
+        expected_profit_percent=risk["expected_profit_percent"], risk_level=risk["risk_level"],
+        exit_index=exit_index, exit_price=exit_price, exit_reason=exit_reason,
+        raw_return=raw_return, net_return_percent=np.round(raw_return - (commission_rate * 100), 2),
+        result=result
+    )
+    return trades
+
+# Bars per chunk when results are streamed (iter_backtest / write_backtest_results)
+BACKTEST_CHUNK_BARS = 50_000
+
+def _take_entries(signals, times, durations_ns, start, end, next_trade_possible_at):
+    """Bars in [start, end) that open a trade: non-HOLD signals once the previous one has expired."""
+    taken = []
+    for i in np.flatnonzero(signals[start:end] != "HOLD") + start:
+        if times[i] < next_trade_possible_at:
             continue
+        taken.append(i)
+        next_trade_possible_at = times[i] + durations_ns[i]
+    return np.array(taken, dtype=np.int64), next_trade_possible_at
 
-        entry_price = current["close"]
-        rsi_val, rsi_signal = calculate_rsi(subset)
-        macd_signal = calculate_macd(subset)
-        bb_signal = calculate_bollinger_bands(subset)
-        volatility = calculate_volatility(subset)
-
-        indicators = {
-            "rsi": float(rsi_val),
-            "macd": macd_signal,
-            "bb": bb_signal,
-            "volatility": volatility,
-            "sentiment": sentiment_score,
-            "trend_strength": 0.6
-        }
-
-        risk_info = calculate_risk_management(subset, signal, volatility, indicators, pd.DataFrame(backtest_results), confidence)
-        stop_loss = risk_info["suggested_stop_loss"]
-        take_profit = risk_info["suggested_take_profit"]
-
-        estimated_duration_minutes = estimate_signal_duration(
-            signal_type=signal,
-            confidence=confidence,
-            trend="uptrend" if macd_signal == "bullish" else "downtrend" if macd_signal == "bearish" else "sideways",
-            sentiment="bullish" if sentiment_score > 0.3 else "bearish" if sentiment_score < -0.3 else "neutral",
-            volatility=volatility,
-            timeframe=interval
-        )
+def _warn_weak_signals(trades, index):
+    timestamps = pd.to_datetime(index[trades["index"]])
+    for ts, sig, ret in zip(timestamps, trades["signal"], trades["raw_return"]):
+        if abs(ret) < 0.25:
+            print(f"⚠️ Weak signal at {ts}: {sig} had only {ret:.2f}% return")
+
+def iter_trade_arrays(price_df, symbol, interval, price_data_dict, ambiguity="sl_first", params=None,
+                      cache=None, start=20, end=None, chunk_bars=BACKTEST_CHUNK_BARS, verbose=False, state=None,
+                      resimulate=None, horizon=None):
+    """
+    The backtest engine: walks the bars `chunk_bars` at a time and yields the
+    simulate_trades arrays of every chunk that opened trades.
+
+    `state` (a dict) is the engine position: the next bar to scan ("cursor"), when
+    the next trade may open and how many candles the run has seen ("bars"). It is
+    updated after every chunk; passing a saved copy back in resumes the walk from
+    there (see backtesting/checkpoint.py).
 
-        start_time = current_time
-        end_time = current_time + timedelta(minutes=estimated_duration_minutes)
-        next_trade_possible_at = end_time
-
-        exit_price = None
-        exit_reason = "TIME"
-        for _, row in next_candles.iterrows():
-            high, low = row["high"], row["low"]
-            if signal == "BUY":
-                if low <= stop_loss:
-                    exit_price = stop_loss
-                    exit_reason = "SL"
-                    break
-                elif high >= take_profit:
-                    exit_price = take_profit
-                    exit_reason = "TP"
-                    break
-            elif signal == "SELL":
-                if high >= stop_loss:
-                    exit_price = stop_loss
-                    exit_reason = "SL"
-                    break
-                elif low <= take_profit:
-                    exit_price = take_profit
-                    exit_reason = "TP"
-                    break
-
-        if exit_price is None:
-            exit_price = next_candles.iloc[-1]["close"]
-
-        raw_return = (
-            (exit_price - current["open"]) / current["open"] * 100 if signal == "BUY"
-            else (current["open"] - exit_price) / current["open"] * 100
+    `resimulate`: entry bars of an earlier run whose exits are resolved again
+    (against these candles) and yielded first, see extend_trade_arrays.
+
+    `horizon`: bar position from which candles are not used to resolve exits (see simulate_trades).
+    """
+    end = len(price_df) - 5 if end is None else end
+    series = prepare_backtest_series(price_df, symbol, interval, price_data_dict, params, cache)
+    interval_minutes = interval_to_minutes(interval, price_df.index)
+
+    # Only the one-open-signal-at-a-time rule is sequential
+    times = price_df.index.values.astype("datetime64[ns]").view(np.int64)
+    durations_ns = series["estimated_duration_minutes"].astype(np.int64) * 60_000_000_000
+    state = {} if state is None else state
+    cursor = state.get("cursor", start)
+    next_trade_possible_at = state.get("next_trade_possible_at", times[0] if len(times) else 0)
+    state["bars"] = len(price_df)
+
+    if resimulate is not None and len(resimulate):
+        trades = simulate_trades(price_df, series, resimulate, interval_minutes, ambiguity)
+        if verbose:
+            _warn_weak_signals(trades, price_df.index)
+        yield trades
+
+    for chunk_start in range(cursor, end, max(1, chunk_bars)):
+        chunk_end = min(chunk_start + chunk_bars, end)
+        taken, next_trade_possible_at = _take_entries(
+            series["signal"], times, durations_ns, chunk_start, chunk_end, next_trade_possible_at
         )
+        state.update(cursor=chunk_end, next_trade_possible_at=int(next_trade_possible_at))
+        if not len(taken):
+            continue
+
+        trades = simulate_trades(price_df, series, taken, interval_minutes, ambiguity, horizon=horizon)
+        if verbose:
+            _warn_weak_signals(trades, price_df.index)
+
+        yield trades
+
+def concat_trade_arrays(chunks):
+    """One set of trade arrays from several iter_trade_arrays chunks."""
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+def _cut_off_by_data_end(exit_reasons, exit_indices, bars):
+    # A TIME exit on the last candle of the old data may only be there because the data ended
+    return (np.asarray(exit_reasons, dtype=object) == "TIME") & (np.asarray(exit_indices) >= bars - 1)
+
+def extend_trade_arrays(price_df, symbol, interval, price_data_dict, trades, state, ambiguity="sl_first",
+                        params=None, cache=None, verbose=False):
+    """
+    Brings an earlier run up to date after candles were appended, at the cost of the new bars.
+
+    `trades` and `state` come from a run over a prefix of these candles (state["bars"]
+    long, default end). Its trades keep their entries; the ones whose exit window was
+    cut off by the end of the old data are re-resolved against the new candles, and the
+    scan for new entries continues at state["cursor"].
+
+    Returns:
+    - (trades, state) equal to a full run on the new candles (trades is None if there are none)
+    """
+    state = dict(state)
+    kept, reopened = [], None
+    if trades is not None and len(trades["index"]):
+        still_open = _cut_off_by_data_end(trades["exit_reason"], trades["exit_index"], state["bars"])
+        kept.append({key: values[~still_open] for key, values in trades.items()})
+        reopened = trades["index"][still_open]
+
+    kept.extend(iter_trade_arrays(price_df, symbol, interval, price_data_dict, ambiguity, params, cache,
+                                  chunk_bars=len(price_df) or 1, verbose=verbose, state=state,
+                                  resimulate=reopened))
+    kept = [chunk for chunk in kept if len(chunk["index"])]
+    return (concat_trade_arrays(kept) if kept else None), state
+
+def iter_backtest(price_df, symbol, interval, price_data_dict, ambiguity="sl_first", params=None,
+                  cache=None, start=20, end=None, chunk_bars=BACKTEST_CHUNK_BARS, verbose=False, state=None,
+                  horizon=None):
+    """
+    run_backtest as a generator: yields one result frame per chunk of `chunk_bars` bars
+    that opened trades, so long runs never hold every trade at once.
+    Concatenating the chunks gives the same rows as run_backtest's table.
+    """
+    for trades in iter_trade_arrays(price_df, symbol, interval, price_data_dict, ambiguity, params,
+                                    cache, start, end, chunk_bars, verbose, state, horizon=horizon):
+        yield build_results_frame(trades, price_df.index, symbol, interval)
+
+def extend_backtest(price_df, symbol, interval, price_data_dict, previous, state, ambiguity="sl_first",
+                    params=None, cache=None, verbose=False):
+    """
+    run_backtest's extend mode on result tables: `previous` is the table of a run over
+    a prefix of these candles and `state` that run's engine state (updated in place).
+    Rows of settled trades are kept as they are; trades cut off by the end of the old
+    data are re-resolved, and only bars from state["cursor"] on are scanned.
+    """
+    if not state or "cursor" not in state:
+        raise ValueError("Extending a backtest needs the engine state of the previous run")
+
+    index = pd.DatetimeIndex(price_df.index)
+    frames, reopened = [], None
+    if previous is not None and not previous.empty:
+        exit_indices = index.get_indexer(pd.DatetimeIndex(previous["exit_time"]))
+        still_open = _cut_off_by_data_end(previous["exit_reason"], exit_indices, state["bars"])
+        frames.append(previous[~still_open])
+        reopened = index.get_indexer(pd.DatetimeIndex(previous.loc[still_open, "timestamp"]))
+
+    for trades in iter_trade_arrays(price_df, symbol, interval, price_data_dict, ambiguity, params, cache,
+                                    chunk_bars=len(price_df) or 1, verbose=verbose, state=state,
+                                    resimulate=reopened):
+        frames.append(build_results_frame(trades, price_df.index, symbol, interval))
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    return frames[0].reset_index(drop=True) if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+def run_backtest(price_df, symbol, interval, headlines, price_data_dict, ambiguity="sl_first",
+                 params=None, cache=None, start=20, end=None, verbose=True, on_trades=None,
+                 state=None, previous=None, horizon=None):
+    """
+    Walks the candles, opens a trade on every non-HOLD signal once the previous signal's
+    duration has expired, and resolves all exits in one pass with the exit engine.
+
+    Parameters:
+    - ambiguity: "sl_first" / "tp_first", which level counts when one candle touches both
+    - params (dict): strategy threshold overrides plus min_agreeing and confidence_threshold
+    - cache (dict): see prepare_backtest_series
+    - start, end: bar range in which trades may open (default 20 .. len - 5)
+    - horizon (int): bar position from which candles are not used to resolve exits, so a
+      run over a window never sees the candles after it (walk-forward in-sample windows)
+    - verbose (bool): print warnings (weak signals, no trades)
+    - on_trades (callable): if given, results are streamed to it in chunks of
+      BACKTEST_CHUNK_BARS bars instead of being collected; the return value is then
+      the number of trades
+    - state (dict): receives the engine state at the end of the run, which is what
+      extend mode needs next time
+    - previous (DataFrame): extend mode. The table of an earlier run over a prefix of
+      these candles (default start/end), with `state` holding that run's state; only
+      the new bars are processed and their trades appended (see extend_backtest)
+    """
+    if previous is not None:
+        return extend_backtest(price_df, symbol, interval, price_data_dict, previous, state, ambiguity,
+                               params, cache, verbose)
+
+    if on_trades is not None:
+        count = 0
+        for chunk in iter_backtest(price_df, symbol, interval, price_data_dict, ambiguity, params,
+                                   cache, start, end, verbose=verbose, state=state, horizon=horizon):
+            on_trades(chunk)
+            count += len(chunk)
+        return count
+
+    # One chunk covering every bar: a single simulate_trades call
+    chunks = list(iter_trade_arrays(price_df, symbol, interval, price_data_dict, ambiguity, params,
+                                    cache, start, end, chunk_bars=len(price_df) or 1, verbose=verbose,
+                                    state=state, horizon=horizon))
+    if not chunks:
+        if verbose:
+            print("⚠️ Warning: No valid backtest results generated.")
+        return pd.DataFrame()
+    return build_results_frame(chunks[0], price_df.index, symbol, interval)
+
+def write_backtest_results(chunks, path):
+    """
+    Appends result frames (e.g. from iter_backtest) to `path` as they arrive.
+    ".parquet" paths are written as one row group per chunk (needs pyarrow), anything
+    else as CSV. Returns the number of rows written.
+    """
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            if path.endswith(".parquet"):
+                if writer is None:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pq.ParquetWriter(path, table.schema)
+                else:
+                    table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
 
-        # ✅ FIXED: Correct result logic for TIME exits
-        if exit_reason == "TP":
-            result = "SUCCESS"
-        elif exit_reason == "SL":
-            result = "FAILURE"
-        else:  # exit_reason == "TIME"
-            # For TIME exits, check if the price moved in the expected direction
-            if signal == "BUY":
-                result = "SUCCESS" if exit_price > current["open"] else "FAILURE"
-            else:  # signal == "SELL"
-                result = "SUCCESS" if exit_price < current["open"] else "FAILURE"
-
-        net_return = round(raw_return - (commission_rate * 100), 2)
-
-        if abs(raw_return) < 0.25:
-            print(f"⚠️ Weak signal at {current_time}: {signal} had only {raw_return:.2f}% return")
-
-        backtest_results.append({
-            "timestamp": current_time,
-            "coin": symbol,
-            "interval": interval,
-            "open": current["open"],
-            "close": current["close"],
-            "exit_price": exit_price,
-            "rsi": round(rsi_val, 2),
-            "rsi_signal": rsi_signal,
-            "macd": macd_signal,
-            "bollinger": bb_signal,
-            "sentiment": sentiment_score,
-            "volatility": volatility,
-            "signal": signal,
-            "confidence": confidence,
-            "stop_loss": stop_loss,
-            "take_profit": take_profit,
-            "estimated_duration_minutes": estimated_duration_minutes,
-            "risk_reward_ratio": risk_info["risk_reward_label"],
-            "expected_profit_percent": risk_info["expected_profit_percent"],
-            "risk_level": risk_info["risk_level"],
-            "exit_reason": exit_reason,
-            "net_return_percent": net_return,
-            "result": result
-        })
-
-    df = pd.DataFrame(backtest_results)
-    if not df.empty and "timestamp" in df.columns:
-        df["Time"] = pd.to_datetime(df["timestamp"])
-    else:
-        print("⚠️ Warning: No valid backtest results generated.")
+def build_results_frame(trades, index, symbol, interval):
+    """Backtest result table (one row per trade) from simulate_trades arrays and the candle index."""
+    timestamps = pd.to_datetime(index[trades["index"]])
+    df = pd.DataFrame({
+        "timestamp": timestamps,
+        "coin": symbol,
+        "interval": interval,
+        "open": trades["open"],
+        "close": trades["close"],
+        "exit_price": trades["exit_price"],
+        "rsi": np.round(trades["rsi"], 2),
+        "rsi_signal": trades["rsi_signal"].tolist(),
+        "macd": trades["macd"].tolist(),
+        "bollinger": trades["bollinger"].tolist(),
+        "sentiment": trades["sentiment"],
+        "volatility": trades["volatility"].tolist(),
+        "signal": trades["signal"].tolist(),
+        "confidence": trades["confidence"],
+        "stop_loss": trades["stop_loss"],
+        "take_profit": trades["take_profit"],
+        "estimated_duration_minutes": trades["estimated_duration_minutes"],
+        "risk_reward_ratio": [format_risk_reward_label(r, w) for r, w in zip(trades["risk"], trades["reward"])],
+        "expected_profit_percent": trades["expected_profit_percent"],
+        "risk_level": trades["risk_level"].tolist(),
+        "exit_reason": trades["exit_reason"].tolist(),
+        "exit_time": pd.to_datetime(index[trades["exit_index"]]),
+        "net_return_percent": trades["net_return_percent"],
+        "result": trades["result"].tolist()
+    })
+    df["Time"] = pd.to_datetime(df["timestamp"])
     return df
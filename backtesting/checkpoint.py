@@ -0,0 +1,110 @@
+# backtesting/checkpoint.py
+#
+# Checkpoints for long backtests, so an interrupted run (exception, preempted worker)
+# resumes where it stopped instead of starting over. A checkpoint stores only what
+# cannot be recomputed exactly: the engine position and the trade arrays emitted so far.
+# Indicator and signal series are pure functions of the candles and parameters, so
+# they are rebuilt on resume, which is what keeps resumed results byte-identical.
+
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from backtesting import backtester
+from backtesting.backtester import BACKTEST_CHUNK_BARS, build_results_frame, concat_trade_arrays, iter_trade_arrays
+
+CHECKPOINT_VERSION = 1
+
+
+def _update_digest(digest, part):
+    if isinstance(part, (pd.DataFrame, pd.Series)):
+        labels = list(part.columns) if isinstance(part, pd.DataFrame) else part.name
+        digest.update(repr((type(part).__name__, labels, part.shape)).encode())
+        digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+    elif isinstance(part, np.ndarray):
+        digest.update(repr((part.dtype.str, part.shape)).encode())
+        digest.update(part.tobytes() if part.dtype != object else repr(part.tolist()).encode())
+    elif isinstance(part, dict):
+        digest.update(b"{")
+        for key in sorted(part, key=repr):
+            digest.update(repr(key).encode())
+            _update_digest(digest, part[key])
+        digest.update(b"}")
+    elif isinstance(part, (list, tuple)):
+        digest.update(b"[")
+        for item in part:
+            _update_digest(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(repr(part).encode())
+
+
+def backtest_fingerprint(*parts):
+    """SHA-256 of the inputs a run depends on; DataFrames and arrays are hashed by content."""
+    digest = hashlib.sha256()
+    for part in parts:
+        _update_digest(digest, part)
+    return digest.hexdigest()
+
+
+def symbol_sentiment(symbol):
+    """The logged sentiment rows a backtest of `symbol` reads."""
+    history = backtester.get_sentiment_history()
+    return history[history["symbol"] == symbol].reset_index(drop=True)
+
+
+def save_checkpoint(path, fingerprint, payload):
+    # Write-then-rename, so a crash mid-write leaves the previous checkpoint intact
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": CHECKPOINT_VERSION, "fingerprint": fingerprint, "payload": payload}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path, fingerprint):
+    """Saved payload, or None when there is no checkpoint or it belongs to other inputs."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        saved = pickle.load(f)
+    if saved.get("version") != CHECKPOINT_VERSION or saved.get("fingerprint") != fingerprint:
+        print(f"⚠️ Ignoring checkpoint {path}: it was written for different inputs.")
+        return None
+    return saved["payload"]
+
+
+def run_backtest_resumable(price_df, symbol, interval, price_data_dict, checkpoint_path, ambiguity="sl_first",
+                           params=None, start=20, end=None, chunk_bars=BACKTEST_CHUNK_BARS, verbose=False,
+                           keep_checkpoint=False):
+    """
+    run_backtest that saves its progress to `checkpoint_path` after every chunk of
+    trades and picks up from an existing checkpoint for the same inputs.
+
+    Returns the same table an uninterrupted run_backtest returns. The checkpoint
+    file is removed once the run completes unless `keep_checkpoint` is set.
+    """
+    fingerprint = backtest_fingerprint(
+        price_df, price_data_dict, symbol, interval, ambiguity, params, start, end, symbol_sentiment(symbol)
+    )
+    payload = load_checkpoint(checkpoint_path, fingerprint) or {"state": {}, "chunks": []}
+    if payload["state"] and verbose:
+        done = sum(len(chunk["index"]) for chunk in payload["chunks"])
+        print(f"♻️ Resuming backtest from bar {payload['state']['cursor']} ({done} trades so far)")
+
+    for trades in iter_trade_arrays(price_df, symbol, interval, price_data_dict, ambiguity, params,
+                                    start=start, end=end, chunk_bars=chunk_bars, verbose=verbose,
+                                    state=payload["state"]):
+        payload["chunks"].append(trades)
+        save_checkpoint(checkpoint_path, fingerprint, payload)
+
+    chunks = payload["chunks"]
+    if not keep_checkpoint and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    if not chunks:
+        return pd.DataFrame()
+    # Built once from the stitched arrays, exactly like an uninterrupted run_backtest
+    return build_results_frame(concat_trade_arrays(chunks), price_df.index, symbol, interval)
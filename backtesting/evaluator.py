@@ -1,59 +1,198 @@
 # backtesting/evaluator.py
 #to print the backtest report in the terminal
 
-from prettytable import PrettyTable
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
 import pandas as pd
 
-def evaluate_backtest_results(df):
-    if "result" not in df.columns:
-        print("\n⚠️ No 'result' column in backtest data. Skipping evaluation.")
-        return {}
+# Profit factor reported when no trade lost money (gains / 0), so it stays finite
+# for JSON, the result cache and the parameter rankings
+MAX_PROFIT_FACTOR = 999.0
 
-    total_signals = len(df)
-    success_signals = df[df['result'] == 'SUCCESS']
-    failed_signals = df[df['result'] == 'FAILURE']
-    neutral_signals = df[df['result'] == 'NEUTRAL']
-
-    buy_signals = df[df['signal'] == 'BUY']
-    sell_signals = df[df['signal'] == 'SELL']
-    hold_signals = df[df['signal'] == 'HOLD']
-
-    success_rate = round((len(success_signals) / total_signals) * 100, 2) if total_signals else 0
-    # Average profit only from successful signals
-    if not success_signals.empty and 'net_return_percent' in success_signals.columns:
-        avg_profit = round(success_signals['net_return_percent'].mean(), 2)
+@dataclass
+class BacktestMetrics:
+    """Machine-readable backtest statistics. Returns and drawdowns are in percent."""
+    total_signals: int = 0
+    success_rate: float = 0.0
+    avg_profit: float = 0.0
+    cumulative_return: float = 0.0
+    total_gains: float = 0.0
+    total_losses: float = 0.0
+    buy_signals: int = 0
+    sell_signals: int = 0
+    hold_signals: int = 0
+    successful_signals: int = 0
+    failed_signals: int = 0
+    neutral_signals: int = 0
+    expectancy: float = 0.0
+    avg_win: float = 0.0
+    avg_loss: float = 0.0
+    profit_factor: float = 0.0
+    sharpe_ratio: float = 0.0
+    sortino_ratio: float = 0.0
+    max_drawdown: float = 0.0
+    max_drawdown_duration_hours: float = 0.0
+    max_drawdown_duration_trades: int = 0
+    exposure_percent: float = 0.0
+    by_signal: dict = field(default_factory=dict)
+    by_exit_reason: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        return asdict(self)
+
+    def scalars(self):
+        """Numeric fields only (no breakdowns), e.g. one row of a sweep table."""
+        return {k: v for k, v in asdict(self).items() if not isinstance(v, dict)}
+
+def _breakdown(df, column, returns, wins):
+    grouped = pd.DataFrame({"key": df[column].to_numpy(), "ret": returns, "win": wins}).groupby("key", sort=True)
+    table = grouped.agg(trades=("ret", "size"), wins=("win", "sum"), avg_return=("ret", "mean"), total_return=("ret", "sum"))
+    table["win_rate"] = table["wins"] / table["trades"] * 100
+    return {
+        key: {name: (int(v) if name in ("trades", "wins") else round(float(v), 4)) for name, v in row.items()}
+        for key, row in table.iterrows()
+    }
+
+def _drawdown(returns, times):
+    # Compounded equity per trade, starting at 1.0 before the first trade
+    equity = np.concatenate([[1.0], np.cumprod(1 + returns)])
+    peak = np.maximum.accumulate(equity)
+    max_drawdown = float((equity / peak - 1).min() * 100)
+
+    # Position of the last equity high at every point, and how long ago it was
+    position = np.arange(len(equity))
+    last_high = np.maximum.accumulate(np.where(equity >= peak, position, 0))
+    duration_trades = int((position - last_high).max())
+    duration_hours = 0.0
+    if times is not None and len(times):
+        t = np.concatenate([times[:1], times]).astype("datetime64[ns]").view(np.int64)
+        duration_hours = float((t - t[last_high]).max() / 3.6e12)
+    return max_drawdown, duration_trades, duration_hours
+
+def _exposure(df):
+    if "timestamp" not in df.columns or df.empty:
+        return 0.0
+    start = pd.to_datetime(df["timestamp"]).to_numpy().astype("datetime64[ns]").view(np.int64)
+    if "exit_time" in df.columns:
+        end = pd.to_datetime(df["exit_time"]).to_numpy().astype("datetime64[ns]").view(np.int64)
+    elif "estimated_duration_minutes" in df.columns:
+        end = start + df["estimated_duration_minutes"].to_numpy(dtype=np.int64) * 60_000_000_000
     else:
-        avg_profit = 0.0
-    # Cumulative Net Return (Compounded Growth)
+        return 0.0
+
+    order = np.argsort(start, kind="mergesort")
+    start, end = start[order], np.maximum(end[order], start[order])
+    # Union of [entry, exit] intervals: clip each start to the furthest exit so far
+    covered_until = np.maximum.accumulate(end)
+    clipped_start = np.maximum(start, np.concatenate([[start[0]], covered_until[:-1]]))
+    in_market = np.clip(end - clipped_start, 0, None).sum()
+    span = covered_until[-1] - start[0]
+    return float(in_market / span * 100) if span > 0 else 0.0
+
+def calculate_backtest_metrics(df, periods_per_year=None):
+    """
+    Backtest statistics as a BacktestMetrics object, computed with one pass of
+    NumPy / groupby work over the result table.
+
+    Sharpe and Sortino use per-trade returns, annualised by the number of trades
+    per year (taken from the timestamps unless `periods_per_year` is given).
+    Without losing trades the profit factor is MAX_PROFIT_FACTOR.
+    """
+    total_signals = len(df)
+    if total_signals == 0:
+        return BacktestMetrics()
+
+    result_counts = df["result"].value_counts() if "result" in df.columns else pd.Series(dtype=int)
+    signal_counts = df["signal"].value_counts() if "signal" in df.columns else pd.Series(dtype=int)
+    successful = int(result_counts.get("SUCCESS", 0))
+
     if "net_return_percent" in df.columns:
-        df["return_multiplier"] = 1 + (df["net_return_percent"] / 100)
-        cumulative_return = round((df["return_multiplier"].prod() - 1) * 100, 2)
+        returns_percent = df["net_return_percent"].to_numpy(dtype=float)
     else:
-        cumulative_return = 0.0
+        returns_percent = np.zeros(total_signals)
+    result = df["result"].to_numpy() if "result" in df.columns else np.full(total_signals, "")
+    is_success = result == "SUCCESS"
+    is_failure = result == "FAILURE"
+
+    returns = returns_percent / 100
+    wins = returns > 0
+    gross_gain = returns_percent[wins].sum()
+    gross_loss = -returns_percent[returns < 0].sum()
+
+    times = pd.to_datetime(df["timestamp"]).to_numpy() if "timestamp" in df.columns else None
+    if periods_per_year is None and times is not None and total_signals > 1:
+        span_years = (times.max() - times.min()) / np.timedelta64(1, "D") / 365.25
+        periods_per_year = total_signals / span_years if span_years > 0 else None
+    annualise = np.sqrt(periods_per_year) if periods_per_year else 1.0
+
+    std = returns.std(ddof=1) if total_signals > 1 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    max_drawdown, drawdown_trades, drawdown_hours = _drawdown(returns, times)
 
-    # Total Gains and Losses
-    total_gains = round(success_signals["net_return_percent"].sum(), 2) if not success_signals.empty else 0.0
-    total_losses = round(failed_signals["net_return_percent"].sum(), 2) if not failed_signals.empty else 0.0
+    return BacktestMetrics(
+        total_signals=total_signals,
+        success_rate=round(successful / total_signals * 100, 2),
+        # Average profit only from successful signals
+        avg_profit=round(float(returns_percent[is_success].mean()), 2) if successful else 0.0,
+        # Cumulative Net Return (Compounded Growth)
+        cumulative_return=round(float((np.prod(1 + returns) - 1) * 100), 2),
+        total_gains=round(float(returns_percent[is_success].sum()), 2),
+        total_losses=round(float(returns_percent[is_failure].sum()), 2),
+        buy_signals=int(signal_counts.get("BUY", 0)),
+        sell_signals=int(signal_counts.get("SELL", 0)),
+        hold_signals=int(signal_counts.get("HOLD", 0)),
+        successful_signals=successful,
+        failed_signals=int(result_counts.get("FAILURE", 0)),
+        neutral_signals=int(result_counts.get("NEUTRAL", 0)),
+        expectancy=round(float(returns_percent.mean()), 4),
+        avg_win=round(float(returns_percent[wins].mean()), 4) if wins.any() else 0.0,
+        avg_loss=round(float(returns_percent[returns < 0].mean()), 4) if (returns < 0).any() else 0.0,
+        profit_factor=(min(round(float(gross_gain / gross_loss), 4), MAX_PROFIT_FACTOR) if gross_loss > 0
+                       else MAX_PROFIT_FACTOR if gross_gain > 0 else 0.0),
+        sharpe_ratio=round(float(returns.mean() / std * annualise), 4) if std > 0 else 0.0,
+        sortino_ratio=round(float(returns.mean() / downside * annualise), 4) if downside > 0 else 0.0,
+        max_drawdown=round(max_drawdown, 4),
+        max_drawdown_duration_hours=round(drawdown_hours, 2),
+        max_drawdown_duration_trades=drawdown_trades,
+        exposure_percent=round(_exposure(df), 2),
+        by_signal=_breakdown(df, "signal", returns_percent, wins) if "signal" in df.columns else {},
+        by_exit_reason=_breakdown(df, "exit_reason", returns_percent, wins) if "exit_reason" in df.columns else {},
+    )
+
+def evaluate_backtest_results(df):
+    if "result" not in df.columns:
+        print("\n⚠️ No 'result' column in backtest data. Skipping evaluation.")
+        return {}
+
+    metrics = calculate_backtest_metrics(df)
 
     summary = {
-        "Total Signals": total_signals,
-        "Success Rate": f"{success_rate}%",
-        "Avg Profit % (per trade)": f"{avg_profit}%",
-        "Cumulative Net Return %": f"{cumulative_return}%",
-        "Total Gains from Wins": f"{total_gains}%",
-        "Total Losses from Failures": f"{total_losses}%",
-        "BUY Signals": len(buy_signals),
-        "SELL Signals": len(sell_signals),
-        "HOLD Signals": len(hold_signals),
-        "Successful Signals": len(success_signals),
-        "Failed Signals": len(failed_signals),
-        "Neutral Signals (HOLD)": len(neutral_signals),
+        "Total Signals": metrics.total_signals,
+        "Success Rate": f"{metrics.success_rate}%",
+        "Avg Profit % (per trade)": f"{metrics.avg_profit}%",
+        "Cumulative Net Return %": f"{metrics.cumulative_return}%",
+        "Total Gains from Wins": f"{metrics.total_gains}%",
+        "Total Losses from Failures": f"{metrics.total_losses}%",
+        "BUY Signals": metrics.buy_signals,
+        "SELL Signals": metrics.sell_signals,
+        "HOLD Signals": metrics.hold_signals,
+        "Successful Signals": metrics.successful_signals,
+        "Failed Signals": metrics.failed_signals,
+        "Neutral Signals (HOLD)": metrics.neutral_signals,
     }
 
     print("\n📊 Backtest Evaluation Report:\n" + "-"*40)
     for k, v in summary.items():
         print(f"{k}: {v}")
     print("-"*40)
+    print(f"Sharpe: {metrics.sharpe_ratio} | Sortino: {metrics.sortino_ratio} | Profit Factor: {metrics.profit_factor}")
+    print(f"Expectancy: {metrics.expectancy}% | Max Drawdown: {metrics.max_drawdown}% "
+          f"({metrics.max_drawdown_duration_hours}h, {metrics.max_drawdown_duration_trades} trades)")
+    print(f"Exposure: {metrics.exposure_percent}% of the tested period")
+    for reason, stats in metrics.by_exit_reason.items():
+        print(f"  {reason}: {stats['trades']} trades, win rate {stats['win_rate']:.2f}%, avg {stats['avg_return']}%")
+    print("-"*40)
 
     print_detailed_backtest_table(df)
 
@@ -61,6 +200,7 @@ def evaluate_backtest_results(df):
 
 def print_detailed_backtest_table(df):
     df = df.sort_values(by="timestamp")
+    from prettytable import PrettyTable
     table = PrettyTable()
     table.field_names = [
         "Time", "Coin", "Open", "Close", "Profit/Loss %", "RSI",
@@ -0,0 +1,96 @@
+# backtesting/exit_engine.py
+
+import numpy as np
+import pandas as pd
+
+from logic.signal_timer import INTERVAL_MINUTES
+
+AMBIGUITY_MODES = ("sl_first", "tp_first")
+
+
+def interval_to_minutes(interval, index=None):
+    """Candle length in minutes, inferred from the index for unknown intervals."""
+    if interval in INTERVAL_MINUTES:
+        return INTERVAL_MINUTES[interval]
+    if index is not None and len(index) > 1:
+        return pd.Series(pd.to_datetime(index)).diff().median().total_seconds() / 60
+    raise ValueError(f"Unknown interval '{interval}'")
+
+
+def duration_to_bars(duration_minutes, interval_minutes):
+    """Number of candles after the entry covered by a signal duration (at least 1)."""
+    bars = np.ceil(np.asarray(duration_minutes, dtype=float) / interval_minutes).astype(int)
+    return np.maximum(bars, 1)
+
+
+def find_exits(high, low, close, entry_indices, signals, stop_losses, take_profits, window_bars,
+               ambiguity="sl_first", chunk_size=65536):
+    """
+    Finds the first SL/TP touch of every entry inside its own window of candles.
+
+    The window of an entry at index i is candles i + 1 .. i + window_bars (cut at the
+    end of the data). A BUY stops out on low <= SL and takes profit on high >= TP, a
+    SELL the other way round. When both levels are touched by the same candle the
+    order is unknown; `ambiguity` decides which one counts ("sl_first" or "tp_first").
+    Entries without a touch exit on the close of the last window candle ("TIME").
+
+    Returns:
+    - (exit_indices: int array, exit_prices: float array, exit_reasons: object array)
+    """
+    if ambiguity not in AMBIGUITY_MODES:
+        raise ValueError(f"Unknown ambiguity mode '{ambiguity}', expected one of {AMBIGUITY_MODES}")
+
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    entry_indices = np.asarray(entry_indices, dtype=np.int64)
+    is_buy = np.asarray(signals, dtype=object) == "BUY"
+    stop_losses = np.asarray(stop_losses, dtype=float)
+    take_profits = np.asarray(take_profits, dtype=float)
+    window_bars = np.broadcast_to(np.asarray(window_bars, dtype=np.int64), entry_indices.shape)
+
+    n_entries = len(entry_indices)
+    exit_indices = np.minimum(entry_indices + window_bars, len(close) - 1)
+    exit_prices = close[exit_indices] if n_entries else np.empty(0)
+    exit_reasons = np.full(n_entries, "TIME", dtype=object)
+    if n_entries == 0:
+        return exit_indices, exit_prices, exit_reasons
+
+    # Bound the (entries x window) matrices by processing entries in chunks
+    rows_per_chunk = max(1, chunk_size // max(1, int(window_bars.max())))
+    for start in range(0, n_entries, rows_per_chunk):
+        part = slice(start, start + rows_per_chunk)
+        entries = entry_indices[part]
+        windows = window_bars[part]
+        width = int(windows.max())
+
+        offsets = np.arange(1, width + 1)
+        candle_idx = entries[:, None] + offsets
+        in_window = (offsets <= windows[:, None]) & (candle_idx < len(close))
+        candle_idx = np.minimum(candle_idx, len(close) - 1)
+
+        highs, lows = high[candle_idx], low[candle_idx]
+        buy = is_buy[part][:, None]
+        sl = stop_losses[part][:, None]
+        tp = take_profits[part][:, None]
+
+        sl_hit = np.where(buy, lows <= sl, highs >= sl) & in_window
+        tp_hit = np.where(buy, highs >= tp, lows <= tp) & in_window
+        touched = sl_hit | tp_hit
+
+        has_exit = touched.any(axis=1)
+        first = touched.argmax(axis=1)
+        rows = np.arange(len(entries))
+        first_sl = sl_hit[rows, first]
+        first_tp = tp_hit[rows, first]
+        take_sl = first_sl & ~first_tp if ambiguity == "tp_first" else first_sl
+
+        hit_idx = entries + 1 + first
+        reasons = np.where(take_sl, "SL", "TP").astype(object)
+        prices = np.where(take_sl, stop_losses[part], take_profits[part])
+
+        exit_indices[part] = np.where(has_exit, hit_idx, exit_indices[part])
+        exit_prices[part] = np.where(has_exit, prices, exit_prices[part])
+        exit_reasons[part] = np.where(has_exit, reasons, exit_reasons[part])
+
+    return exit_indices, exit_prices, exit_reasons
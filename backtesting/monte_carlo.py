@@ -0,0 +1,114 @@
+# backtesting/monte_carlo.py
+#
+# Monte Carlo robustness check for a backtest: resample the trade return sequence
+# many times and look at the spread of final return, drawdown and losing streaks
+# instead of the single ordering the backtest happened to produce.
+
+import numpy as np
+
+RESAMPLE_METHODS = ("bootstrap", "shuffle")
+
+
+def _max_drawdown(returns):
+    # returns: (simulations, trades) as fractions; equity starts at 1.0
+    equity = np.cumprod(1 + returns, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    return (equity / peak - 1).min(axis=1)
+
+
+def _max_losing_streak(returns):
+    losing = returns < 0
+    count = np.cumsum(losing, axis=1)
+    # Running count at the last winning/flat trade, subtracted to restart each streak
+    reset = np.maximum.accumulate(np.where(losing, 0, count), axis=1)
+    return (count - reset).max(axis=1)
+
+
+def monte_carlo_resample(returns_percent, n_simulations=10_000, method="bootstrap", seed=None, chunk_size=2_000):
+    """
+    Resamples a sequence of per-trade returns (in %) `n_simulations` times.
+
+    - "bootstrap": draw trades with replacement (varies the final return too)
+    - "shuffle":   random reordering of the same trades (varies path, not final return)
+
+    Returns:
+    - dict of arrays, one value per simulation: final_return_percent,
+      max_drawdown_percent, max_losing_streak
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unknown resample method '{method}', expected one of {RESAMPLE_METHODS}")
+
+    returns = np.asarray(returns_percent, dtype=float) / 100
+    returns = returns[~np.isnan(returns)]
+    rng = np.random.default_rng(seed)
+
+    final_return = np.empty(n_simulations)
+    max_drawdown = np.empty(n_simulations)
+    losing_streak = np.empty(n_simulations, dtype=np.int64)
+    if len(returns) == 0:
+        final_return[:] = max_drawdown[:] = losing_streak[:] = 0
+        return {"final_return_percent": final_return, "max_drawdown_percent": max_drawdown,
+                "max_losing_streak": losing_streak}
+
+    # Chunks keep the (simulations x trades) matrices in cache-friendly sizes
+    for start in range(0, n_simulations, chunk_size):
+        rows = min(chunk_size, n_simulations - start)
+        if method == "bootstrap":
+            sample = returns[rng.integers(0, len(returns), size=(rows, len(returns)))]
+        else:
+            sample = rng.permuted(np.broadcast_to(returns, (rows, len(returns))), axis=1)
+
+        part = slice(start, start + rows)
+        final_return[part] = np.prod(1 + sample, axis=1) - 1
+        max_drawdown[part] = _max_drawdown(sample)
+        losing_streak[part] = _max_losing_streak(sample)
+
+    return {
+        "final_return_percent": final_return * 100,
+        "max_drawdown_percent": max_drawdown * 100,
+        "max_losing_streak": losing_streak,
+    }
+
+
+def monte_carlo_report(backtest_df, n_simulations=10_000, method="bootstrap", seed=None, confidence=0.95,
+                       print_report=True):
+    """
+    Monte Carlo distribution report for a backtest result table (net_return_percent column).
+
+    Returns:
+    - dict with, per metric, the percentiles (p5 .. p95), mean and the two-sided
+      `confidence` interval, plus the probability of ending with a loss.
+    """
+    if backtest_df is None or backtest_df.empty or "net_return_percent" not in backtest_df.columns:
+        if print_report:
+            print("\n⚠️ No trades to resample. Skipping Monte Carlo report.")
+        return {}
+
+    results = monte_carlo_resample(backtest_df["net_return_percent"].to_numpy(), n_simulations, method, seed)
+    tail = (1 - confidence) / 2 * 100
+
+    report = {
+        "simulations": n_simulations,
+        "trades": len(backtest_df),
+        "method": method,
+        "confidence": confidence,
+        "probability_of_loss": float((results["final_return_percent"] < 0).mean()),
+    }
+    for name, values in results.items():
+        p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+        low, high = np.percentile(values, [tail, 100 - tail])
+        report[name] = {
+            "mean": float(values.mean()),
+            "p5": float(p5), "p25": float(p25), "p50": float(p50), "p75": float(p75), "p95": float(p95),
+            "ci_low": float(low), "ci_high": float(high),
+        }
+
+    if print_report:
+        print(f"\n🎲 Monte Carlo Robustness Report ({n_simulations} {method} runs, {len(backtest_df)} trades):\n" + "-"*40)
+        for name in results:
+            stats = report[name]
+            print(f"{name}: median {stats['p50']:.2f} | {confidence:.0%} CI [{stats['ci_low']:.2f}, {stats['ci_high']:.2f}]")
+        print(f"Probability of loss: {report['probability_of_loss']:.2%}")
+        print("-"*40)
+
+    return report
@@ -0,0 +1,108 @@
+# backtesting/optimizer.py
+#
+# Parameter sweeps over run_backtest. Each worker process receives the candles and
+# the sentiment history once (pool initializer) and keeps a per-process cache of the
+# precomputed series, so a trial only recomputes what its own parameters change.
+
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from backtesting import backtester
+from backtesting.backtester import run_backtest
+from backtesting.evaluator import calculate_backtest_metrics
+
+# Default search space (current hard-coded values included)
+DEFAULT_PARAM_SPACE = {
+    "macd_threshold": [0.1, 0.3, 0.5],
+    "rsi_overbought": [70, 75, 80],
+    "rsi_oversold": [20, 25, 30],
+    "bb_window": [20, 30],
+    "bb_num_std_dev": [1.5, 2, 2.5],
+    "confidence_threshold": [55, 57, 60],
+    "min_agreeing": [1, 2, 3],
+}
+
+_worker_data = {}
+
+
+def grid_search_space(space=None):
+    """Every combination of the parameter space, as a list of param dicts."""
+    space = space or DEFAULT_PARAM_SPACE
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_search_space(space=None, n_trials=100, seed=None):
+    """`n_trials` distinct random combinations of the parameter space."""
+    grid = grid_search_space(space)
+    if n_trials >= len(grid):
+        return grid
+    return random.Random(seed).sample(grid, n_trials)
+
+
+def _init_worker(price_df, symbol, interval, price_data_dict, sentiment_df):
+    _worker_data.clear()
+    _worker_data.update(
+        price_df=price_df, symbol=symbol, interval=interval,
+        price_data_dict=price_data_dict, cache={}
+    )
+    if sentiment_df is not None:
+        backtester.sentiment_df = sentiment_df
+
+
+def _run_trial(trial):
+    trial_id, params, ambiguity = trial
+    data = _worker_data
+    try:
+        df = run_backtest(
+            data["price_df"], data["symbol"], data["interval"], [], data["price_data_dict"],
+            ambiguity=ambiguity, params=params, cache=data["cache"], verbose=False
+        )
+    except Exception as e:
+        return {"trial": trial_id, **params, "error": str(e)}
+
+    metrics = calculate_backtest_metrics(df).scalars()
+    return {"trial": trial_id, **params, **metrics}
+
+
+def run_parameter_sweep(price_df, symbol, interval, price_data_dict, trials=None,
+                        rank_by="cumulative_return", ascending=False, min_trades=1,
+                        ambiguity="sl_first", max_workers=None):
+    """
+    Runs run_backtest once per parameter set in parallel worker processes.
+
+    Parameters:
+    - price_df, symbol, interval, price_data_dict: as for run_backtest
+    - trials (list of dict): parameter sets, e.g. from grid_search_space / random_search_space
+    - rank_by (str): BacktestMetrics field to sort on (e.g. "sharpe_ratio")
+    - min_trades (int): trials with fewer trades are ranked last
+    - max_workers (int): pool size, defaults to the number of CPUs
+
+    Returns:
+    - DataFrame with one row per trial (params + metrics), best first
+    """
+    trials = trials if trials is not None else grid_search_space()
+    work = [(i, params, ambiguity) for i, params in enumerate(trials)]
+    workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(price_df, symbol, interval, price_data_dict, backtester.get_sentiment_history())
+    ) as executor:
+        rows = list(executor.map(_run_trial, work, chunksize=max(1, len(work) // (workers * 4))))
+
+    results = pd.DataFrame(rows)
+    if results.empty:
+        return results
+
+    if rank_by not in results.columns:
+        results[rank_by] = float("nan")
+    enough_trades = results.get("total_signals", 0) >= min_trades
+    results["_eligible"] = enough_trades
+    results = results.sort_values(["_eligible", rank_by], ascending=[False, ascending], na_position="last")
+    return results.drop(columns="_eligible").reset_index(drop=True)
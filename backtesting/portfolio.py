@@ -0,0 +1,184 @@
+# backtesting/portfolio.py
+#
+# Multi-symbol backtest on one shared clock. Every symbol's candidate trades
+# (non-HOLD signals with their exits already resolved) are computed with the same
+# vectorized series as run_backtest; the event loop then only walks the merged,
+# time-ordered candidate arrays and applies the capital and position limits.
+
+import heapq
+import os
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import prepare_backtest_series, simulate_trades
+from backtesting.checkpoint import backtest_fingerprint, load_checkpoint, save_checkpoint, symbol_sentiment
+from backtesting.exit_engine import interval_to_minutes
+
+
+def _symbol_candidates(symbol, price_df, price_data_dict, interval, params, ambiguity):
+    series = prepare_backtest_series(price_df, symbol, interval, price_data_dict, params)
+    idx = np.flatnonzero(series["signal"][20:len(price_df) - 5] != "HOLD") + 20
+    trades = simulate_trades(price_df, series, idx, interval_to_minutes(interval, price_df.index), ambiguity)
+
+    times = price_df.index.values.astype("datetime64[ns]").view(np.int64)
+    return {
+        "entry_time": times[idx],
+        "exit_time": times[trades["exit_index"]],
+        "gate_until": times[idx] + trades["estimated_duration_minutes"].astype(np.int64) * 60_000_000_000,
+        "net_return_percent": trades["net_return_percent"],
+        "signal": trades["signal"],
+        "confidence": trades["confidence"],
+        "exit_reason": trades["exit_reason"],
+    }
+
+
+def run_portfolio_backtest(symbol_data, interval, initial_capital=10_000.0, max_positions=5,
+                           position_fraction=None, params=None, ambiguity="sl_first", checkpoint_path=None):
+    """
+    Portfolio backtest over many symbols with shared capital.
+
+    Each symbol follows the single-symbol rule (one signal at a time, gated by its
+    estimated duration). On top of that a trade only opens while fewer than
+    `max_positions` are open and enough cash is free; it is sized at
+    `position_fraction` of current equity (default 1 / max_positions).
+
+    Parameters:
+    - symbol_data (dict): symbol -> (price_df, price_data_dict) on the same interval
+    - interval (str): base candle interval
+    - initial_capital (float), max_positions (int), position_fraction (float)
+    - params (dict), ambiguity (str): as for run_backtest
+    - checkpoint_path (str): if given, each symbol's candidate trades are saved there
+      as they finish and reused when the run is restarted with the same inputs
+
+    Returns:
+    - (trades: one row per executed trade,
+       equity: equity (cash + open positions at cost) after every entry/exit event,
+       attribution: per-symbol trade counts, PnL and share of total PnL)
+    """
+    if max_positions < 1:
+        raise ValueError(f"max_positions must be at least 1, got {max_positions}")
+    position_fraction = position_fraction or 1.0 / max_positions
+    if not 0 < position_fraction <= 1:
+        raise ValueError(f"position_fraction must be in (0, 1], got {position_fraction}")
+    symbols = list(symbol_data)
+
+    # Merge every symbol's candidates into one time-ordered event stream
+    finished = {}
+    if checkpoint_path:
+        fingerprint = backtest_fingerprint(
+            symbol_data, interval, params, ambiguity, [symbol_sentiment(symbol) for symbol in symbols]
+        )
+        finished = load_checkpoint(checkpoint_path, fingerprint) or {}
+
+    parts = []
+    for code, symbol in enumerate(symbols):
+        if symbol not in finished:
+            price_df, price_data_dict = symbol_data[symbol]
+            finished[symbol] = _symbol_candidates(symbol, price_df, price_data_dict, interval, params, ambiguity)
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, fingerprint, finished)
+        candidates = dict(finished[symbol])
+        candidates["symbol"] = np.full(len(candidates["entry_time"]), code, dtype=np.int64)
+        parts.append(candidates)
+
+    # The event loop below is cheap to replay; only the candidates are worth keeping
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    events = {key: np.concatenate([p[key] for p in parts]) for key in parts[0]} if parts else {}
+    if not events or not len(events["entry_time"]):
+        return _empty_results(symbols)
+
+    order = np.lexsort((events["symbol"], events["entry_time"]))
+    events = {key: values[order] for key, values in events.items()}
+    entry_time = events["entry_time"]
+    exit_time = events["exit_time"]
+    gate_until = events["gate_until"]
+    returns = events["net_return_percent"] / 100
+    symbol_code = events["symbol"]
+
+    cash = float(initial_capital)
+    open_cost = 0.0
+    open_positions = []  # heap of (exit_time, seq, symbol, cost, proceeds)
+    symbol_busy_until = np.full(len(symbols), np.iinfo(np.int64).min, dtype=np.int64)
+    symbol_open = np.zeros(len(symbols), dtype=bool)
+
+    executed, sizes = [], []
+    equity_times, equity_values = [], []
+
+    def close_until(t):
+        nonlocal cash, open_cost
+        while open_positions and open_positions[0][0] <= t:
+            closed_at, _, code, cost, proceeds = heapq.heappop(open_positions)
+            cash += proceeds
+            open_cost -= cost
+            symbol_open[code] = False
+            equity_times.append(closed_at)
+            equity_values.append(cash + open_cost)
+
+    for k in range(len(entry_time)):
+        t = entry_time[k]
+        close_until(t)
+
+        code = symbol_code[k]
+        if t < symbol_busy_until[code] or symbol_open[code] or len(open_positions) >= max_positions:
+            continue
+
+        size = min((cash + open_cost) * position_fraction, cash)
+        if size <= 0:
+            continue
+
+        cash -= size
+        open_cost += size
+        symbol_open[code] = True
+        symbol_busy_until[code] = gate_until[k]
+        heapq.heappush(open_positions, (exit_time[k], k, code, size, size * (1 + returns[k])))
+
+        executed.append(k)
+        sizes.append(size)
+        equity_times.append(t)
+        equity_values.append(cash + open_cost)
+
+    close_until(np.iinfo(np.int64).max)
+
+    executed = np.array(executed, dtype=np.int64)
+    sizes = np.array(sizes, dtype=float)
+    pnl = sizes * returns[executed]
+
+    trades = pd.DataFrame({
+        "symbol": [symbols[c] for c in symbol_code[executed]],
+        "entry_time": pd.to_datetime(entry_time[executed]),
+        "exit_time": pd.to_datetime(exit_time[executed]),
+        "signal": events["signal"][executed].tolist(),
+        "confidence": events["confidence"][executed],
+        "exit_reason": events["exit_reason"][executed].tolist(),
+        "position_size": sizes,
+        "net_return_percent": events["net_return_percent"][executed],
+        "pnl": pnl,
+    })
+
+    equity = pd.Series(equity_values, index=pd.to_datetime(np.array(equity_times, dtype=np.int64)), name="equity")
+    equity = equity.groupby(level=0).last()
+
+    return trades, equity, _attribution(trades, symbols)
+
+
+def _attribution(trades, symbols):
+    total_pnl = trades["pnl"].sum()
+    attribution = trades.assign(win=trades["net_return_percent"] > 0).groupby("symbol").agg(
+        trades=("pnl", "size"),
+        wins=("win", "sum"),
+        pnl=("pnl", "sum"),
+    ).reindex(symbols, fill_value=0)
+    attribution["pnl_share_percent"] = attribution["pnl"] / total_pnl * 100 if total_pnl else 0.0
+    return attribution
+
+
+def _empty_results(symbols):
+    trades = pd.DataFrame(columns=[
+        "symbol", "entry_time", "exit_time", "signal", "confidence", "exit_reason",
+        "position_size", "net_return_percent", "pnl"
+    ])
+    equity = pd.Series(dtype=float, index=pd.DatetimeIndex([]), name="equity")
+    return trades, equity, _attribution(trades.astype({"pnl": float, "net_return_percent": float}), symbols)
@@ -0,0 +1,115 @@
+# backtesting/refresh.py
+#
+# Nightly backtest refresh. For every symbol / interval a store file keeps the
+# closed candles seen so far (every timeframe the signal uses), the backtest table
+# and the engine state. A refresh appends the candles that closed since the last
+# run and extends the backtest over them with run_backtest's extend mode.
+#
+#   python -m backtesting.refresh BTCUSDT ETHUSDT --intervals 1h 4h
+
+import argparse
+import os
+
+import pandas as pd
+
+from backtesting.backtester import run_backtest
+from backtesting.checkpoint import load_checkpoint, save_checkpoint
+from backtesting.evaluator import calculate_backtest_metrics
+from backtesting.result_cache import run_key
+from data.fetch_price import get_adjacent_timeframes, get_price_data
+
+REFRESH_STORE_DIR = os.path.join("data", "backtest_store")
+
+
+def merge_candles(stored, fetched):
+    """Stored candles followed by the fetched ones that closed after them."""
+    # The last kline Binance returns is the current candle, which is still changing
+    closed = fetched.iloc[:-1]
+    if stored is None or stored.empty:
+        return closed
+    return pd.concat([stored, closed[closed.index > stored.index[-1]]])
+
+
+def refresh_backtest(symbol, interval, fetch=get_price_data, store_dir=REFRESH_STORE_DIR, params=None,
+                     ambiguity="sl_first", verbose=True):
+    """
+    Brings the stored backtest of one symbol / interval up to date.
+
+    Returns:
+    - dict with the number of new candles, trades before / after and the metrics
+    """
+    lower_tf, higher_tf = get_adjacent_timeframes(interval)
+    timeframes = [tf for tf in (interval, lower_tf, higher_tf) if tf]
+
+    path = os.path.join(store_dir, f"{symbol}_{interval}.pkl")
+    store_id = f"{symbol}:{interval}"
+    stored = load_checkpoint(path, store_id) or {"candles": {}, "results": None, "state": {}, "run_key": None}
+
+    candles = {}
+    for tf in timeframes:
+        fetched = fetch(symbol, tf)
+        if fetched is None or fetched.empty:
+            raise ValueError(f"No {tf} candles returned for {symbol}")
+        old = stored["candles"].get(tf)
+        if old is not None and not old.empty and fetched.index[0] > old.index[-1]:
+            print(f"⚠️ {symbol} {tf}: gap between stored candles ({old.index[-1]}) and fetched ones ({fetched.index[0]})")
+        candles[tf] = merge_candles(old, fetched)
+
+    price_df = candles[interval]
+    old_bars = len(stored["candles"].get(interval, ()))
+    key = run_key(symbol, interval, ambiguity, params)
+    previous = stored["results"]
+    # Code or parameter changes invalidate the stored trades, not the stored candles
+    extend = stored["run_key"] == key and stored["state"] and previous is not None
+
+    state = dict(stored["state"]) if extend else {}
+    results = run_backtest(
+        price_df, symbol, interval, [], candles, ambiguity=ambiguity, params=params,
+        verbose=False, state=state, previous=previous if extend else None
+    )
+
+    os.makedirs(store_dir, exist_ok=True)
+    save_checkpoint(path, store_id, {"candles": candles, "results": results, "state": state, "run_key": key})
+
+    summary = {
+        "symbol": symbol,
+        "interval": interval,
+        "new_candles": len(price_df) - old_bars,
+        "mode": "extend" if extend else "full",
+        "previous_trades": len(previous) if extend else 0,
+        **calculate_backtest_metrics(results).scalars(),
+    }
+    if verbose:
+        print(f"🔄 {symbol} {interval}: +{summary['new_candles']} candles ({summary['mode']}), "
+              f"{summary['total_signals']} trades, cumulative return {summary['cumulative_return']}%")
+    return summary
+
+
+def refresh_all(symbols, intervals, **kwargs):
+    """
+    refresh_backtest for every symbol / interval pair. A failing pair is reported
+    and skipped so one bad symbol does not stop the nightly run.
+
+    Returns:
+    - DataFrame with one row per pair
+    """
+    rows = []
+    for symbol in symbols:
+        for interval in intervals:
+            try:
+                rows.append(refresh_backtest(symbol, interval, **kwargs))
+            except Exception as e:
+                print(f"❌ Refresh failed for {symbol} {interval}: {e}")
+                rows.append({"symbol": symbol, "interval": interval, "error": str(e)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extend the stored backtests with newly closed candles.")
+    parser.add_argument("symbols", nargs="+", help="trading pairs, e.g. BTCUSDT ETHUSDT")
+    parser.add_argument("--intervals", nargs="+", default=["1h"], help="base intervals to refresh")
+    parser.add_argument("--store-dir", default=REFRESH_STORE_DIR)
+    args = parser.parse_args()
+
+    report = refresh_all([s.upper() for s in args.symbols], args.intervals, store_dir=args.store_dir)
+    print(report.to_string(index=False))
@@ -0,0 +1,181 @@
+# backtesting/replay.py
+#
+# Replay feed: streams stored candles through the live engine (logic/live_engine.py)
+# the way live_daemon.py feeds it, as fast as possible or at N× real time, and
+# checks the live signal at every base bar against the batch backtester's.
+#
+# Candles of all timeframes are pushed in open-time order; the base timeframe is
+# evaluated once every candle that opened at or before its bar is in, which is the
+# cut prepare_backtest_series makes. Sentiment per bar is the backtester's too, so
+# any mismatch is a difference between the streaming and the batch logic.
+#
+#   python -m backtesting.replay BTCUSDT --interval 1h                  (refresh store)
+#   python -m backtesting.replay BTCUSDT --interval 15m --record-dir recordings --speed 600
+#   python -m backtesting.replay BTCUSDT --interval 1m --synthetic 200000  (soak test)
+
+import argparse
+import heapq
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import (
+    BACKTEST_CONFIDENCE_THRESHOLD, BACKTEST_MIN_AGREEING, get_historical_sentiment_series, prepare_backtest_series
+)
+from backtesting.checkpoint import load_checkpoint
+from backtesting.refresh import REFRESH_STORE_DIR
+from data.fetch_price import get_adjacent_timeframes
+from data.synthetic import synthetic_ohlcv
+from logic.live_engine import LiveSignalEngine
+from logic.signal_timer import INTERVAL_MINUTES
+
+
+def load_stored_candles(symbol, interval, store_dir=REFRESH_STORE_DIR, record_dir=None):
+    """
+    Candles of `interval` and its adjacent timeframes: from recorded <SYMBOL>_<INTERVAL>.csv
+    files in `record_dir` (the stand-in server's format), else from the refresh store.
+
+    Returns:
+    - dict of timeframe -> OHLCV DataFrame
+    """
+    lower_tf, higher_tf = get_adjacent_timeframes(interval)
+    timeframes = [tf for tf in (interval, lower_tf, higher_tf) if tf]
+    if record_dir:
+        candles = {}
+        for tf in timeframes:
+            path = os.path.join(record_dir, f"{symbol}_{tf}.csv")
+            if os.path.exists(path):
+                df = pd.read_csv(path, index_col="timestamp", parse_dates=["timestamp"])
+                candles[tf] = df[["open", "high", "low", "close", "volume"]].astype(float)
+    else:
+        stored = load_checkpoint(os.path.join(store_dir, f"{symbol}_{interval}.pkl"), f"{symbol}:{interval}")
+        candles = dict(stored["candles"]) if stored else {}
+    if interval not in candles:
+        raise ValueError(f"No stored {interval} candles for {symbol}")
+    return candles
+
+
+def synthetic_candles(symbol, interval, bars, seed=0):
+    """`bars` synthetic base candles plus the adjacent timeframes over the same span."""
+    candles = {interval: synthetic_ohlcv(symbol, interval, bars, seed=seed)}
+    for tf in get_adjacent_timeframes(interval):
+        if tf:
+            length = int(bars * INTERVAL_MINUTES[interval] / INTERVAL_MINUTES[tf]) + 1
+            candles[tf] = synthetic_ohlcv(symbol, tf, length, seed=seed)
+    return candles
+
+
+def replay_events(price_data):
+    """(timestamp, timeframe, close) of every candle, in open-time order."""
+    streams = [
+        zip(df.index, [tf] * len(df), df["close"].to_numpy())
+        for tf, df in price_data.items() if df is not None and not df.empty
+    ]
+    return heapq.merge(*streams, key=lambda event: event[0])
+
+
+def replay_signals(price_data, symbol, interval, sentiment=None, engine=None, speed=None, sleep=time.sleep):
+    """
+    Pushes the candles through a live engine and yields the live signal at each base bar.
+
+    Parameters:
+    - price_data (dict): timeframe -> candles (base interval and its adjacent timeframes)
+    - sentiment: value per base bar (the backtester's historical sentiment by default)
+    - engine (LiveSignalEngine): the engine to feed; by default one with the backtest
+      thresholds and unbounded volatility history, so it matches the backtester exactly
+    - speed (float): N× real time (candle time / speed between bars); None = as fast as possible
+
+    Yields:
+    - (timestamp, signal, confidence)
+    """
+    base = price_data[interval]
+    if sentiment is None:
+        sentiment = get_historical_sentiment_series(symbol, base.index)
+    sentiment = dict(zip(base.index, np.broadcast_to(np.asarray(sentiment, dtype=object), (len(base),))))
+    if engine is None:
+        engine = LiveSignalEngine(min_agreeing=BACKTEST_MIN_AGREEING,
+                                  confidence_threshold=BACKTEST_CONFIDENCE_THRESHOLD, history=None)
+
+    pending = None  # base bar waiting for the other candles that opened at the same time
+    previous_ts = None
+    for ts, tf, close in replay_events(price_data):
+        if pending is not None and ts > pending:
+            yield (pending, *engine.evaluate(symbol, interval, sentiment[pending]))
+            pending = None
+        if speed and previous_ts is not None and ts > previous_ts:
+            sleep((ts - previous_ts).total_seconds() / speed)
+        previous_ts = ts
+        engine.add_candle(symbol, tf, ts, close)
+        if tf == interval:
+            pending = ts
+    if pending is not None:
+        yield (pending, *engine.evaluate(symbol, interval, sentiment[pending]))
+
+
+def verify_replay(price_data, symbol, interval, params=None, speed=None, max_mismatches=20, verbose=True):
+    """
+    Replays `price_data` through the live engine and compares every base bar with
+    the backtester's signal series.
+
+    Returns:
+    - dict with bars, candles, mismatch count, the first mismatches and the replay rate
+    """
+    series = prepare_backtest_series(price_data[interval], symbol, interval, price_data, params=params)
+    strategy_params = {k: v for k, v in (params or {}).items() if k not in ("min_agreeing", "confidence_threshold")}
+    engine = LiveSignalEngine(
+        strategy_params or None,
+        min_agreeing=(params or {}).get("min_agreeing", BACKTEST_MIN_AGREEING),
+        confidence_threshold=(params or {}).get("confidence_threshold", BACKTEST_CONFIDENCE_THRESHOLD),
+        history=None,
+    )
+    candles = sum(len(df) for df in price_data.values() if df is not None)
+
+    mismatches, count = [], 0
+    start = time.perf_counter()
+    replayed = replay_signals(price_data, symbol, interval, series["sentiment"], engine, speed)
+    for bar, (ts, signal, confidence) in enumerate(replayed):
+        expected = (series["signal"][bar], int(series["confidence"][bar]))
+        if (signal, confidence) != expected:
+            count += 1
+            if len(mismatches) < max_mismatches:
+                mismatches.append({"timestamp": ts, "replay": (signal, confidence), "backtest": expected})
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "symbol": symbol,
+        "interval": interval,
+        "bars": len(series["signal"]),
+        "candles": candles,
+        "mismatches": count,
+        "first_mismatches": mismatches,
+        "seconds": round(elapsed, 3),
+        "candles_per_hour": int(candles / elapsed * 3600) if elapsed else None,
+    }
+    if verbose:
+        status = "✅ matches the backtester" if not count else f"❌ {count} bars differ from the backtester"
+        print(f"🔁 {symbol} {interval}: replayed {candles} candles ({report['bars']} bars) in {elapsed:.1f} s "
+              f"≈ {report['candles_per_hour'] or 0:,} candles/hour, {status}")
+        for item in mismatches:
+            print(f"   {item['timestamp']}: replay {item['replay']} vs backtest {item['backtest']}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay stored candles through the live engine and verify it against the backtester.")
+    parser.add_argument("symbol", help="trading pair, e.g. BTCUSDT")
+    parser.add_argument("--interval", default="1h", help="base interval")
+    parser.add_argument("--store-dir", default=REFRESH_STORE_DIR, help="refresh store to read candles from")
+    parser.add_argument("--record-dir", help="directory of recorded <SYMBOL>_<INTERVAL>.csv candles")
+    parser.add_argument("--synthetic", type=int, metavar="BARS", help="replay this many synthetic base candles instead")
+    parser.add_argument("--speed", type=float, help="N× real time (default: as fast as possible)")
+    args = parser.parse_args()
+
+    symbol = args.symbol.upper()
+    if args.synthetic:
+        price_data = synthetic_candles(symbol, args.interval, args.synthetic)
+    else:
+        price_data = load_stored_candles(symbol, args.interval, args.store_dir, args.record_dir)
+    report = verify_replay(price_data, symbol, args.interval, speed=args.speed)
+    raise SystemExit(1 if report["mismatches"] else 0)
@@ -0,0 +1,155 @@
+# backtesting/result_cache.py
+#
+# Content-addressed cache of backtest results. An entry is keyed by everything the
+# trades depend on: the candles of every timeframe, the sentiment each bar reads,
+# the engine and strategy code, and the parameters. Rerunning on unchanged inputs
+# is a file read; when candles were only appended, the newest entry of the same run
+# is extended over the new bars instead of recomputing from bar 20.
+#
+# Extension needs a history that only grows at the end, such as the candles kept by
+# the refresh store (backtesting/refresh.py). A rolling window like main.py's last
+# HISTORICAL_LIMIT candles drops old candles as new ones close, and the indicators
+# start from the window's first candle, so a shifted window shares no trades with
+# the cached run: it is a miss and runs in full. Such callers only hit the cache on
+# an unchanged window.
+
+import functools
+import hashlib
+import importlib
+import os
+
+import pandas as pd
+
+from backtesting.backtester import (
+    BACKTEST_CONFIDENCE_THRESHOLD, BACKTEST_MIN_AGREEING, build_results_frame, concat_trade_arrays,
+    extend_trade_arrays, get_historical_sentiment_series, iter_trade_arrays
+)
+from backtesting.checkpoint import backtest_fingerprint, load_checkpoint, save_checkpoint
+from backtesting.evaluator import calculate_backtest_metrics
+from strategies.params import resolve_params
+from utils.metrics import record_cache_lookup
+
+BACKTEST_CACHE_DIR = os.path.join("data", "backtest_cache")
+ENTRIES_PER_RUN = 3
+
+# Modules whose code decides the trades and their metrics; editing any of them
+# invalidates the cache. Where candles and sentiment come from (config,
+# data.synthetic) is not listed: data_key hashes the values themselves.
+ENGINE_MODULES = (
+    "backtesting.backtester", "backtesting.exit_engine", "logic.signal_series",
+    "logic.risk_manager", "logic.signal_timer", "indicators.atr", "strategies.params",
+    "backtesting.evaluator",
+)
+
+
+@functools.lru_cache(maxsize=1)
+def engine_fingerprint():
+    digest = hashlib.sha256()
+    for name in ENGINE_MODULES:
+        with open(importlib.import_module(name).__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def run_key(symbol, interval, ambiguity="sl_first", params=None):
+    """Hash of what identifies a run apart from its data: code, symbol, interval and parameters."""
+    params = dict(params or {})
+    thresholds = {
+        "min_agreeing": params.pop("min_agreeing", BACKTEST_MIN_AGREEING),
+        "confidence_threshold": params.pop("confidence_threshold", BACKTEST_CONFIDENCE_THRESHOLD),
+    }
+    return backtest_fingerprint(engine_fingerprint(), symbol, interval, ambiguity, resolve_params(params), thresholds)
+
+
+def data_key(price_df, price_data_dict, sentiment):
+    """Hash of the candles of every timeframe and the sentiment score of every base bar."""
+    return backtest_fingerprint(price_df, price_data_dict, sentiment)
+
+
+def _prefix_entry(run_dir, price_df, price_data_dict, sentiment):
+    # Newest stored run whose candles are an exact prefix of the current ones
+    paths = [os.path.join(run_dir, name) for name in os.listdir(run_dir) if name.endswith(".pkl")]
+    for path in sorted(paths, key=os.path.getmtime, reverse=True):
+        key = os.path.basename(path)[:-len(".pkl")]
+        payload = load_checkpoint(path, key)
+        if payload is None:
+            continue
+        lengths = payload["bars"]
+        if set(lengths) != set(price_data_dict) or payload["base_bars"] > len(price_df):
+            continue
+        # A window that starts elsewhere (e.g. a rolling one moved on) is never a prefix
+        if payload.get("first_bar") != (price_df.index[0] if len(price_df) else None):
+            continue
+        if any(lengths[tf] > len(df) for tf, df in price_data_dict.items()):
+            continue
+        bars = payload["base_bars"]
+        prefix = {tf: df.iloc[:lengths[tf]] for tf, df in price_data_dict.items()}
+        if data_key(price_df.iloc[:bars], prefix, sentiment[:bars]) == key:
+            return payload
+    return None
+
+
+def _prune(run_dir, keep=ENTRIES_PER_RUN):
+    paths = [os.path.join(run_dir, name) for name in os.listdir(run_dir) if name.endswith(".pkl")]
+    for path in sorted(paths, key=os.path.getmtime, reverse=True)[keep:]:
+        os.remove(path)
+
+
+def cached_backtest(price_df, symbol, interval, price_data_dict, ambiguity="sl_first", params=None,
+                    cache_dir=BACKTEST_CACHE_DIR, verbose=True):
+    """
+    run_backtest (default bar range) served from the result cache when possible.
+
+    Returns:
+    - (results: the run_backtest table, metrics: its BacktestMetrics)
+    """
+    sentiment = get_historical_sentiment_series(symbol, price_df.index)
+    run_dir = os.path.join(cache_dir, run_key(symbol, interval, ambiguity, params))
+    key = data_key(price_df, price_data_dict, sentiment)
+    path = os.path.join(run_dir, f"{key}.pkl")
+
+    payload = load_checkpoint(path, key)
+    record_cache_lookup("backtest_results", payload is not None)
+    if payload is not None:
+        if verbose:
+            print(f"⚡ Backtest for {symbol} {interval} served from cache.")
+        return payload["results"], payload["metrics"]
+
+    os.makedirs(run_dir, exist_ok=True)
+    previous = _prefix_entry(run_dir, price_df, price_data_dict, sentiment)
+    # The sentiment scores are already known, no need for prepare_backtest_series to look them up again
+    series_cache = {"sentiment": sentiment}
+
+    if previous is not None:
+        if verbose:
+            print(f"➕ Extending cached backtest for {symbol} {interval} by "
+                  f"{len(price_df) - previous['base_bars']} new candles.")
+        trades, state = extend_trade_arrays(
+            price_df, symbol, interval, price_data_dict, previous["trades"], previous["state"],
+            ambiguity, params, series_cache, verbose=verbose
+        )
+    else:
+        state = {}
+        chunks = list(iter_trade_arrays(price_df, symbol, interval, price_data_dict, ambiguity, params,
+                                        series_cache, chunk_bars=len(price_df) or 1, verbose=verbose, state=state))
+        trades = concat_trade_arrays(chunks) if chunks else None
+
+    if trades is None:
+        if verbose:
+            print("⚠️ Warning: No valid backtest results generated.")
+        results = pd.DataFrame()
+    else:
+        results = build_results_frame(trades, price_df.index, symbol, interval)
+    metrics = calculate_backtest_metrics(results)
+
+    save_checkpoint(path, key, {
+        "bars": {tf: len(df) for tf, df in price_data_dict.items()},
+        "base_bars": len(price_df),
+        "first_bar": price_df.index[0] if len(price_df) else None,
+        "trades": trades,
+        "state": state,
+        "results": results,
+        "metrics": metrics,
+    })
+    _prune(run_dir)
+    return results, metrics
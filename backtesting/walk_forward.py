@@ -0,0 +1,153 @@
+# backtesting/walk_forward.py
+#
+# Walk-forward evaluation: pick parameters on an in-sample window, trade them on the
+# following out-of-sample window, roll forward, and stitch the out-of-sample trades
+# into one equity curve. Folds are independent and run in parallel; every worker
+# computes the indicator series over the full history once per parameter set and
+# reuses them for all of its folds (run_backtest's start/end only limit entries).
+# In-sample trades resolve their exits on the train window's candles only, so the
+# parameter choice never sees the out-of-sample window. When stitching, a fold's
+# trades that open before the previous folds' last exit are dropped, as a single
+# run would never hold them at the same time.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+
+from backtesting import backtester
+from backtesting.backtester import run_backtest
+from backtesting.evaluator import BacktestMetrics, calculate_backtest_metrics
+from backtesting.optimizer import _init_worker, _worker_data, random_search_space
+
+# Parameter sets searched per fold by default: a fixed random sample of the
+# optimizer's space (the full grid is 1458 sets, each backtested in every fold)
+DEFAULT_TRIALS = 50
+
+# BacktestMetrics fields a fold can be ranked by (not the breakdown dicts)
+RANKABLE_METRICS = tuple(f.name for f in fields(BacktestMetrics) if f.type is not dict)
+
+
+def walk_forward_folds(n_bars, train_bars, test_bars, step=None, first_bar=20, last_bar=None):
+    """
+    Rolling (train_start, train_end, test_start, test_end) bar ranges.
+    Test windows follow their train window directly; `step` defaults to test_bars
+    so consecutive test windows tile the history without overlap.
+    """
+    step = step or test_bars
+    last_bar = n_bars - 5 if last_bar is None else last_bar
+    folds = []
+    train_start = first_bar
+    while train_start + train_bars < last_bar:
+        train_end = train_start + train_bars
+        test_end = min(train_end + test_bars, last_bar)
+        folds.append((train_start, train_end, train_end, test_end))
+        train_start += step
+    return folds
+
+
+def _backtest(params, start, end, ambiguity, horizon=None):
+    data = _worker_data
+    return run_backtest(
+        data["price_df"], data["symbol"], data["interval"], [], data["price_data_dict"],
+        ambiguity=ambiguity, params=params, cache=data["cache"], start=start, end=end, verbose=False,
+        horizon=horizon
+    )
+
+
+def _run_fold(job):
+    fold_id, (train_start, train_end, test_start, test_end), trials, rank_by, min_trades, ambiguity = job
+
+    best_params, best_score = None, None
+    for params in trials:
+        trades = _backtest(params, train_start, train_end, ambiguity, horizon=train_end)
+        if len(trades) < min_trades:
+            continue
+        score = getattr(calculate_backtest_metrics(trades), rank_by)
+        if best_score is None or score > best_score:
+            best_params, best_score = params, score
+
+    index = _worker_data["price_df"].index
+    fold = {
+        "fold": fold_id,
+        "train_from": index[train_start], "train_to": index[train_end - 1],
+        "test_from": index[test_start], "test_to": index[test_end - 1],
+        "params": best_params, "in_sample_score": best_score,
+    }
+    if best_params is None:
+        return fold, pd.DataFrame()
+
+    trades = _backtest(best_params, test_start, test_end, ambiguity)
+    if not trades.empty:
+        trades["fold"] = fold_id
+    return fold, trades
+
+
+def _stitch(results):
+    """Out-of-sample trades of the folds in order, without trades overlapping an earlier fold's."""
+    fold_rows, trade_frames = [], []
+    last_exit = None
+    for fold, trades in results:
+        if not trades.empty and last_exit is not None:
+            overlapping = pd.DatetimeIndex(trades["timestamp"]) < last_exit
+            trades = trades[~overlapping]
+            fold["oos_overlapping_dropped"] = int(overlapping.sum())
+        if not trades.empty:
+            last_exit = max(pd.Timestamp(trades["exit_time"].max()), last_exit or pd.Timestamp.min)
+            fold.update({f"oos_{k}": v for k, v in calculate_backtest_metrics(trades).scalars().items()})
+            trade_frames.append(trades)
+        fold_rows.append(fold)
+    return fold_rows, trade_frames
+
+
+def run_walk_forward(price_df, symbol, interval, price_data_dict, train_bars, test_bars, step=None,
+                     trials=None, rank_by="cumulative_return", min_trades=1, ambiguity="sl_first",
+                     max_workers=None):
+    """
+    Walk-forward backtest.
+
+    Parameters:
+    - price_df, symbol, interval, price_data_dict: as for run_backtest
+    - train_bars, test_bars, step: fold sizes in base candles (see walk_forward_folds)
+    - trials (list of dict): parameter sets searched in every in-sample window; by
+      default DEFAULT_TRIALS sets sampled (seeded) from the optimizer's space
+    - rank_by (str): BacktestMetrics field maximised in-sample (one of RANKABLE_METRICS)
+    - min_trades (int): parameter sets with fewer in-sample trades are ignored
+    - max_workers (int): folds evaluated in parallel, defaults to the number of CPUs
+
+    Returns:
+    - (trades: out-of-sample trades of all folds in time order,
+       folds: one row per fold with the chosen params and its metrics,
+       equity: compounded equity curve over the stitched trades, starting at 1.0)
+    """
+    if rank_by not in RANKABLE_METRICS:
+        raise ValueError(f"Unknown rank_by '{rank_by}', expected one of {RANKABLE_METRICS}")
+    trials = trials if trials is not None else random_search_space(n_trials=DEFAULT_TRIALS, seed=0)
+    folds = walk_forward_folds(len(price_df), train_bars, test_bars, step)
+    jobs = [(i, fold, trials, rank_by, min_trades, ambiguity) for i, fold in enumerate(folds)]
+    workers = min(max_workers or os.cpu_count() or 1, max(1, len(jobs)))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(price_df, symbol, interval, price_data_dict, backtester.get_sentiment_history())
+    ) as executor:
+        results = list(executor.map(_run_fold, jobs))
+
+    fold_rows, trade_frames = _stitch(results)
+    trades = (
+        pd.concat(trade_frames).sort_values("timestamp", kind="mergesort").reset_index(drop=True)
+        if trade_frames else pd.DataFrame()
+    )
+
+    if trades.empty:
+        equity = pd.Series(dtype=float, name="equity")
+    else:
+        equity = pd.Series(
+            np.cumprod(1 + trades["net_return_percent"].to_numpy() / 100),
+            index=pd.DatetimeIndex(trades["timestamp"]), name="equity"
+        )
+
+    return trades, pd.DataFrame(fold_rows), equity
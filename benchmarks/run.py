@@ -0,0 +1,140 @@
+# benchmarks/run.py
+#
+# Runs the benchmark suite on synthetic data and stores the timings as JSON, one
+# file per commit, so runs on different commits can be compared.
+#
+#   python -m benchmarks.run                         # everything -> benchmarks/results/<commit>.json
+#   python -m benchmarks.run --filter backtest       # only names containing "backtest"
+#   python -m benchmarks.run --compare benchmarks/results/<older>.json
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+# Benchmarks never touch the network
+os.environ.setdefault("TRADINGSIGNALS_DATA_SOURCE", "synthetic")
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.suite import BENCHMARKS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+MIN_RUN_SECONDS = 0.2
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, dirty
+
+
+def time_benchmark(setup, repeat):
+    """Seconds per call over `repeat` rounds; each round runs for at least MIN_RUN_SECONDS."""
+    func = setup()
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < MIN_RUN_SECONDS:
+        number = max(1, int(number * MIN_RUN_SECONDS / max(elapsed, 1e-9)))
+    per_call = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "mean": statistics.fmean(per_call),
+        "stdev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run_suite(name_filter=None, verbose=True):
+    results = {}
+    for name, (setup, repeat) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_benchmark(setup, repeat)
+        if verbose:
+            print(f"⏱️ {name:<45} median {format_seconds(results[name]['median'])}")
+    return results
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Prints median ratios (current / baseline) of the benchmarks both runs have.
+    Returns the names that got slower by more than `threshold`.
+    """
+    regressions = []
+    print(f"\n📊 Compared with {baseline.get('commit', '?')}:\n" + "-"*80)
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["median"]
+        ratio = result["median"] / before if before else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "⚠️ slower"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "✅ faster"
+        print(f"{name:<45} {format_seconds(before)} -> {format_seconds(result['median'])}  x{ratio:5.2f} {flag}")
+    print("-"*80)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the TradingSignals benchmark suite.")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on regressions")
+    args = parser.parse_args(argv)
+
+    commit, dirty = git_commit()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": run_suite(args.filter),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# benchmarks/suite.py
+#
+# Benchmark cases. Each case is a setup function, registered under a name, that
+# prepares its inputs from fixed synthetic data and returns the zero-argument
+# callable to time. Setup cost is never part of the measurement.
+
+import contextlib
+import os
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
+
+from backtesting.backtester import run_backtest
+from backtesting.evaluator import evaluate_backtest_results
+from data.synthetic import synthetic_headlines, synthetic_ohlcv
+from indicators.bollinger import calculate_bollinger_bands
+from indicators.macd import calculate_macd
+from indicators.rsi import calculate_rsi
+from indicators.volatility import calculate_volatility
+from logic.risk_manager import calculate_risk_management
+from logic.signal_engine import generate_signal
+from reports.generate_pdf import create_pdf_report
+from reports.visualization import plot_backtest_results, plot_price_with_indicators
+
+BENCHMARK_SEED = 42
+
+# name -> (setup, repeat)
+BENCHMARKS = {}
+
+
+def benchmark(name, repeat=5):
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeat)
+        return setup
+    return register
+
+
+def candles(length, interval="15m", symbol="BTCUSDT"):
+    return synthetic_ohlcv(symbol, interval, length, seed=BENCHMARK_SEED)
+
+
+def multi_timeframe(length, interval="15m", lower="5m", higher="1h"):
+    # Lower / higher timeframes cover the same period as the base one
+    return {
+        interval: candles(length, interval),
+        lower: candles(length * 3, lower),
+        higher: candles(max(length // 4, 1), higher),
+    }
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _register_indicators():
+    for func in (calculate_macd, calculate_rsi, calculate_bollinger_bands, calculate_volatility):
+        for length in (250, 5_000):
+            def setup(func=func, length=length):
+                df = candles(length)
+                return lambda: func(df)
+            benchmark(f"indicators.{func.__name__}[{length}]")(setup)
+
+
+_register_indicators()
+
+
+@benchmark("signal.generate_signal[3tf x 250]")
+def _generate_signal():
+    price_data = multi_timeframe(250)
+    return lambda: generate_signal(price_data, "bullish", "BTCUSDT", min_agreeing=2, confidence_threshold=57)
+
+
+def _register_backtests():
+    for length, repeat in ((250, 5), (5_000, 5), (50_000, 3)):
+        def setup(length=length):
+            price_data = multi_timeframe(length)
+            price_df = price_data["15m"]
+            return lambda: run_backtest(price_df, "BTCUSDT", "15m", [], price_data, verbose=False)
+        benchmark(f"backtest.run_backtest[{length}]", repeat=repeat)(setup)
+
+
+_register_backtests()
+
+
+@benchmark("risk.calculate_risk_management")
+def _risk_management():
+    df = candles(250)
+    indicators = {"volatility": "medium", "sentiment": 0.3, "trend_strength": 0.6}
+    return lambda: calculate_risk_management(df, "BUY", "medium", indicators, confidence=65)
+
+
+@benchmark("reports.create_pdf_report[end to end]", repeat=3)
+def _pdf_report():
+    price_data = multi_timeframe(250)
+    price_df = price_data["15m"]
+    backtest_df = run_backtest(price_df, "BTCUSDT", "15m", [], price_data, verbose=False)
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        summary = evaluate_backtest_results(backtest_df) if not backtest_df.empty else {}
+    headlines = synthetic_headlines("Bitcoin", "BTC", seed=BENCHMARK_SEED)
+    for item in headlines:
+        item["score"] = 0.0
+
+    signal_info = {
+        "signal": "BUY", "confidence": 62, "sentiment": "bullish", "price_snapshot": price_df.copy(),
+        "indicators": {"macd": "bullish", "rsi": "neutral", "bb": "within_range", "volatility": "medium"},
+    }
+    close = price_df["close"].iloc[-1]
+    risk_info = {
+        "stop_loss": close * 0.98, "take_profit": close * 1.04, "rr_ratio": "1 : 2",
+        "risk_level": "MODERATE", "expected_profit_percent": 4.0,
+    }
+    timing_info = {"start": price_df.index[-1], "end": price_df.index[-1], "duration": "~90 minutes"}
+
+    # The report writes its charts relative to the working directory
+    workdir = tempfile.mkdtemp(prefix="tradingsignals-bench-")
+    os.makedirs(os.path.join(workdir, "reports", "plots"))
+
+    def run():
+        with working_directory(workdir), contextlib.redirect_stdout(open(os.devnull, "w")):
+            plot_backtest_results(backtest_df, "reports/plots/backtest_chart.png")
+            plot_price_with_indicators(price_df, backtest_df, "BTCUSDT", "reports/plots/price_chart.png")
+            create_pdf_report("BTCUSDT", "15m", signal_info, risk_info, timing_info, summary,
+                              "report.pdf", backtest_df, headlines)
+    return run
@@ -1,10 +1,16 @@
 # config.py
 
-from pycoingecko import CoinGeckoAPI
+import os
 
 # === BINANCE SETTINGS ===
-BINANCE_BASE_URL = "https://api.binance.com"
+# The base URLs can be pointed at a stand-in server (data/standin_server.py) through the environment
+BINANCE_BASE_URL = os.environ.get("TRADINGSIGNALS_BINANCE_URL", "https://api.binance.com")
 HISTORICAL_LIMIT = 250  # Number of candles to fetch
+BINANCE_WEIGHT_PER_MINUTE = 1200  # Request weight budget per IP (utils/http_client.py)
+
+# === COINGECKO SETTINGS ===
+COINGECKO_BASE_URL = os.environ.get("TRADINGSIGNALS_COINGECKO_URL", "https://api.coingecko.com/api/v3")
+COINGECKO_CALLS_PER_MINUTE = 30  # Free (public) API limit
 
 # === SENTIMENT SETTINGS ===
 RSS_FEEDS = [
@@ -12,6 +18,9 @@ RSS_FEEDS = [
     "https://cointelegraph.com/rss",
     "https://news.bitcoin.com/feed/",
 ]
+# Comma-separated replacement list, e.g. the stand-in server's feeds
+if os.environ.get("TRADINGSIGNALS_RSS_FEEDS"):
+    RSS_FEEDS = [url.strip() for url in os.environ["TRADINGSIGNALS_RSS_FEEDS"].split(",") if url.strip()]
 
 USE_FINBERT = False  # If False, fall back to VADER
 
@@ -23,12 +32,45 @@ LOG_FILE = "logs/trading_signals.log"
 # === OTHER SETTINGS ===
 DEBUG = True
 
+# === DATA SOURCE ===
+# "binance" for live candles/news, "synthetic" for the seeded offline generator (data/synthetic.py)
+DATA_SOURCE = os.environ.get("TRADINGSIGNALS_DATA_SOURCE", "binance").lower()
+SYNTHETIC_SEED = int(os.environ.get("TRADINGSIGNALS_SYNTHETIC_SEED", "0"))
+
+# === PROFILING ===
+# TRADINGSIGNALS_PROFILE=1 prints a per-stage timing tree after each run (utils/profiler.py);
+# TRADINGSIGNALS_PROFILE_PSTATS=<path> also dumps a cProfile run there
+PROFILE = os.environ.get("TRADINGSIGNALS_PROFILE", "").lower() not in ("", "0", "false", "no")
+PROFILE_PSTATS = os.environ.get("TRADINGSIGNALS_PROFILE_PSTATS")
+
 # config.py
 
 
+# Used offline (synthetic data source) and whenever CoinGecko cannot be reached
+DEFAULT_SYMBOL_NAME_MAP = {
+    "BTC": ("Bitcoin", "BTC"),
+    "ETH": ("Ethereum", "ETH"),
+    "BNB": ("Binance Coin", "BNB"),
+    "SOL": ("Solana", "SOL"),
+    "ADA": ("Cardano", "ADA"),
+    "XRP": ("Ripple", "XRP"),
+    "DOGE": ("Dogecoin", "DOGE"),
+    "DOT": ("Polkadot", "DOT"),
+    "MATIC": ("Polygon", "MATIC"),
+    "LTC": ("Litecoin", "LTC"),
+}
+
 def build_symbol_name_map(top_n=100):
-    cg = CoinGeckoAPI()
-    coins = cg.get_coins_markets(vs_currency='usd', per_page=top_n, page=1)
+    if DATA_SOURCE == "synthetic":
+        return dict(DEFAULT_SYMBOL_NAME_MAP)
+    try:
+        from utils.transport import upstream_get
+        response = upstream_get("coingecko", "/coins/markets", params={"vs_currency": "usd", "per_page": top_n, "page": 1})
+        response.raise_for_status()
+        coins = response.json()
+    except Exception as e:
+        print(f"⚠️ Could not load the CoinGecko top {top_n} ({e}), using the built-in coin list.")
+        return dict(DEFAULT_SYMBOL_NAME_MAP)
     mapping = {}
     for coin in coins:
         symbol = coin['symbol'].upper()
@@ -36,20 +78,9 @@ def build_symbol_name_map(top_n=100):
         mapping[symbol] = (name, symbol)
     return mapping
 
-# Pre-build top‑100
-SYMBOL_NAME_MAP = build_symbol_name_map(100)
-
-# SYMBOL_NAME_MAP = {
-#     "BTC": ("Bitcoin", "BTC"),
-#     "ETH": ("Ethereum", "ETH"),
-#     "BNB": ("Binance Coin", "BNB"),
-#     "SOL": ("Solana", "SOL"),
-#     "ADA": ("Cardano", "ADA"),
-#     "XRP": ("Ripple", "XRP"),
-#     "DOGE": ("Dogecoin", "DOGE"),
-#     "DOT": ("Polkadot", "DOT"),
-#     "MATIC": ("Polygon", "MATIC"),
-#     "LTC": ("Litecoin", "LTC"),
-#     # Add more as needed...
-# }
-
+def __getattr__(name):
+    # SYMBOL_NAME_MAP (top-100) is built on first access, so importing config stays offline
+    if name == "SYMBOL_NAME_MAP":
+        globals()["SYMBOL_NAME_MAP"] = build_symbol_name_map(100)
+        return globals()["SYMBOL_NAME_MAP"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
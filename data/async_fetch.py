@@ -0,0 +1,213 @@
+# data/async_fetch.py
+#
+# asyncio counterpart of the fetch layer: Binance klines, RSS feeds and CoinGecko
+# calls on one aiohttp session, with a concurrency semaphore per upstream. Requests
+# charge the same rate-limit budgets as utils/http_client.py and retry the same way,
+# and identical in-flight requests are coalesced. Feed XML is parsed on a worker
+# thread so the event loop keeps serving other downloads.
+#
+#   async with AsyncFetcher() as fetcher:
+#       frames = await fetcher.klines_many([("BTCUSDT", "1h"), ("ETHUSDT", "1h")])
+#
+# or, from synchronous code, get_price_data_many(...) / fetch_feeds(...).
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from config import DATA_SOURCE, HISTORICAL_LIMIT, SYNTHETIC_SEED
+from data.fetch_price import klines_to_frame, klines_weight
+from data.synthetic import synthetic_ohlcv
+from utils import http_client
+from utils.metrics import (
+    HTTP_COALESCED, HTTP_FETCH_RESPONSES, HTTP_FETCH_SECONDS, HTTP_RATE_LIMIT_WAIT_SECONDS, HTTP_RETRIES
+)
+from utils.profiler import span
+from utils.transport import upstream_url
+
+# aiohttp and feedparser are imported where they are used: together they cost
+# about as much start-up time as pandas, and synthetic runs never need them
+
+# Requests in flight per upstream at any moment
+KLINES_CONCURRENCY = 32
+COINGECKO_CONCURRENCY = 4
+FEED_CONCURRENCY = 16
+CONNECTION_LIMIT = 100
+
+
+class AsyncFetcher:
+    """One aiohttp session plus per-upstream semaphores; use as an async context manager."""
+
+    def __init__(self, timeout=10, klines_concurrency=KLINES_CONCURRENCY,
+                 coingecko_concurrency=COINGECKO_CONCURRENCY, feed_concurrency=FEED_CONCURRENCY):
+        import aiohttp
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.semaphores = {
+            "binance": asyncio.Semaphore(klines_concurrency),
+            "coingecko": asyncio.Semaphore(coingecko_concurrency),
+            None: asyncio.Semaphore(feed_concurrency),
+        }
+        self.in_flight = {}
+        self.session = None
+
+    async def __aenter__(self):
+        import aiohttp
+        connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def get(self, url, params=None, upstream=None, weight=1):
+        """
+        GET with rate limiting, retries and coalescing.
+
+        Returns:
+        - (status, headers, body bytes) of the final attempt; connection errors and
+          timeouts are raised after the last retry
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        task = self.in_flight.get(key)
+        if task is None:
+            task = self.in_flight[key] = asyncio.ensure_future(self._fetch(url, params, upstream, weight))
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        else:
+            HTTP_COALESCED.inc(upstream=upstream or "other")
+        # Shielded, so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, url, params, upstream, weight):
+        import aiohttp
+        bucket = http_client.rate_limit_bucket(upstream)
+        label = upstream or "other"
+        host = urlparse(url).netloc
+        start = time.perf_counter()
+        try:
+            for attempt in range(http_client.MAX_RETRIES + 1):
+                if bucket is not None:
+                    waited = 0.0
+                    while True:
+                        delay = bucket.reserve(weight)
+                        if not delay:
+                            break
+                        await asyncio.sleep(delay)
+                        waited += delay
+                    if waited:
+                        HTTP_RATE_LIMIT_WAIT_SECONDS.inc(waited, upstream=label)
+                try:
+                    async with self.semaphores.get(upstream, self.semaphores[None]):
+                        async with self.session.get(url, params=params) as response:
+                            status, headers, body = response.status, response.headers, await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if attempt == http_client.MAX_RETRIES:
+                        HTTP_FETCH_RESPONSES.inc(upstream=host, status="error")
+                        raise
+                    HTTP_RETRIES.inc(upstream=label, reason="connection")
+                    await asyncio.sleep(http_client.backoff_delay(attempt))
+                    continue
+
+                used = headers.get(http_client.USED_WEIGHT_HEADER)
+                if bucket is not None and used and used.isdigit():
+                    bucket.sync_used(int(used))
+                if status not in http_client.RETRY_STATUSES or attempt == http_client.MAX_RETRIES:
+                    HTTP_FETCH_RESPONSES.inc(upstream=host, status=str(status))
+                    return status, headers, body
+
+                HTTP_RETRIES.inc(upstream=label, reason=str(status))
+                retry_after = http_client.retry_after_seconds(headers)
+                if bucket is not None and status in (418, 429) and retry_after:
+                    bucket.pause(retry_after)
+                await asyncio.sleep(max(retry_after or 0.0, http_client.backoff_delay(attempt)))
+        finally:
+            HTTP_FETCH_SECONDS.observe(time.perf_counter() - start, upstream=host)
+
+    async def klines(self, symbol, interval, limit=HISTORICAL_LIMIT, start_time=None):
+        """
+        Same result as get_price_data: the OHLCV DataFrame, or an empty one on errors.
+        With `start_time` (a Timestamp) the first `limit` candles opened at or after it.
+        """
+        if DATA_SOURCE == "synthetic":
+            df = synthetic_ohlcv(symbol, interval, limit, seed=SYNTHETIC_SEED)
+            return df if start_time is None else df[df.index >= start_time]
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = int(pd.Timestamp(start_time).timestamp() * 1000)
+        try:
+            status, _, body = await self.get(upstream_url("binance", "/api/v3/klines"), params, "binance",
+                                             klines_weight(limit))
+            if status != 200:
+                raise ValueError(f"HTTP {status}: {body[:200].decode(errors='replace')}")
+            return klines_to_frame(json.loads(body))
+        except Exception as e:
+            print(f"❌ Error fetching data from Binance ({symbol} {interval}): {e}")
+            return pd.DataFrame()
+
+    async def klines_many(self, pairs, limit=HISTORICAL_LIMIT):
+        """{(symbol, interval): DataFrame} for every pair, fetched concurrently."""
+        pairs = list(dict.fromkeys(pairs))
+        frames = await asyncio.gather(*(self.klines(symbol, interval, limit) for symbol, interval in pairs))
+        return dict(zip(pairs, frames))
+
+    async def feed(self, url):
+        """The feedparser result of one RSS feed; raises on HTTP errors."""
+        import feedparser
+        status, _, body = await self.get(url)
+        if status != 200:
+            raise ValueError(f"HTTP {status}")
+        return await asyncio.to_thread(feedparser.parse, body)
+
+    async def feeds(self, urls):
+        """Parsed feeds in `urls` order; a failed feed is returned as its exception."""
+        return await asyncio.gather(*(self.feed(url) for url in urls), return_exceptions=True)
+
+    async def coingecko(self, path, params=None):
+        """JSON of a CoinGecko API call, or None on errors."""
+        import aiohttp
+        try:
+            status, _, body = await self.get(upstream_url("coingecko", path), params, "coingecko")
+            return json.loads(body) if status == 200 else None
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"⚠️ CoinGecko request {path} failed: {e}")
+            return None
+
+
+def run_async(coro):
+    """Runs `coro` to completion from synchronous code, also when called inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def get_price_data_many(pairs, limit=HISTORICAL_LIMIT):
+    """Sync wrapper: {(symbol, interval): DataFrame} like get_price_data, fetched concurrently."""
+    async def fetch():
+        async with AsyncFetcher() as fetcher:
+            return await fetcher.klines_many(pairs, limit)
+    with span("http async klines"):
+        return run_async(fetch())
+
+
+def fetch_feeds(urls):
+    """Sync wrapper: parsed RSS feeds (or the exception a feed failed with), in `urls` order."""
+    async def fetch():
+        async with AsyncFetcher() as fetcher:
+            return await fetcher.feeds(urls)
+    with span("http async feeds"):
+        return run_async(fetch())
+
+
+def get_coingecko_many(paths):
+    """Sync wrapper: JSON (or None) of several CoinGecko calls, e.g. ["/coins/bitcoin", "/coins/ethereum"]."""
+    async def fetch():
+        async with AsyncFetcher() as fetcher:
+            return await asyncio.gather(*(fetcher.coingecko(path) for path in paths))
+    with span("http async coingecko"):
+        return run_async(fetch())
@@ -1,5 +1,9 @@
-import feedparser
 import re
+from urllib.parse import urlparse
+from config import DATA_SOURCE, SYNTHETIC_SEED
+from data.synthetic import synthetic_headlines
+from utils.metrics import RSS_ENTRIES_PARSED
+from data.async_fetch import fetch_feeds
 
 def clean_text(text):
     """
@@ -15,12 +19,19 @@ def fetch_rss_headlines(rss_feeds, coin_name=None, coin_symbol=None):
     """
     Parses RSS feeds and filters news related to the given coin.
     Returns a list of dictionaries with title, summary, published time, source, and link.
+    With DATA_SOURCE = "synthetic" the feeds are not read and seeded headlines are returned.
     """
+    if DATA_SOURCE == "synthetic":
+        return synthetic_headlines(coin_name or "Bitcoin", coin_symbol or "BTC", seed=SYNTHETIC_SEED)
+
     all_news = []
 
-    for feed_url in rss_feeds:
+    # All feeds are downloaded concurrently (data/async_fetch.py)
+    for feed_url, feed in zip(rss_feeds, fetch_feeds(rss_feeds)):
         try:
-            feed = feedparser.parse(feed_url)
+            if isinstance(feed, Exception):
+                raise feed
+            RSS_ENTRIES_PARSED.inc(len(feed.entries), feed=urlparse(feed_url).netloc)
 
             for entry in feed.entries:
                 title = clean_text(entry.get("title", ""))
@@ -1,15 +1,29 @@
 # data/fetch_price.py
 
-import requests
 import pandas as pd
-from config import BINANCE_BASE_URL, HISTORICAL_LIMIT
+from config import HISTORICAL_LIMIT, DATA_SOURCE, SYNTHETIC_SEED
+from data.synthetic import synthetic_ohlcv
+from utils.transport import upstream_get
+
+def klines_weight(limit):
+    # Binance request weight of GET /api/v3/klines, by limit
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
 
 def get_price_data(symbol: str, interval: str) -> pd.DataFrame:
     """
     Fetch historical OHLCV candlestick data for a given symbol and interval from Binance.
     Returns a cleaned DataFrame with datetime index.
+    With DATA_SOURCE = "synthetic" the candles come from data/synthetic.py instead.
     """
-    url = f"{BINANCE_BASE_URL}/api/v3/klines"
+    if DATA_SOURCE == "synthetic":
+        return synthetic_ohlcv(symbol, interval, HISTORICAL_LIMIT, seed=SYNTHETIC_SEED)
+
     params = {
         "symbol": symbol,
         "interval": interval,
@@ -17,14 +31,18 @@ def get_price_data(symbol: str, interval: str) -> pd.DataFrame:
     }
 
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = upstream_get("binance", "/api/v3/klines", params=params, timeout=10,
+                                weight=klines_weight(HISTORICAL_LIMIT))
         response.raise_for_status()
         data = response.json()
     except Exception as e:
         print(f"❌ Error fetching data from Binance: {e}")
         return pd.DataFrame()
 
-    # Convert response to DataFrame
+    return klines_to_frame(data)
+
+def klines_to_frame(data):
+    """Binance kline rows -> OHLCV DataFrame with a datetime "timestamp" index."""
     df = pd.DataFrame(data, columns=[
         "timestamp", "open", "high", "low", "close", "volume",
         "close_time", "quote_asset_volume", "num_trades",
@@ -37,3 +55,17 @@ def get_price_data(symbol: str, interval: str) -> pd.DataFrame:
     df = df[["open", "high", "low", "close", "volume"]].astype(float)
 
     return df
+
+def get_adjacent_timeframes(interval):
+    tf_map = {
+        "1m": (None, "5m"),
+        "5m": ("1m", "15m"),
+        "15m": ("5m", "1h"),
+        "30m": ("15m", "2h"),
+        "1h": ("15m", "4h"),
+        "2h": ("30m", "6h"),
+        "4h": ("1h", "1d"),
+        "1d": ("4h", "3d"),
+        "1w": ("1d", "1M")
+    }
+    return tf_map.get(interval, (None, None))
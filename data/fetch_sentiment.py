@@ -1,8 +1,7 @@
 # data/fetch_sentiment.py
 
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from config import RSS_FEEDS, USE_FINBERT, SYMBOL_NAME_MAP
-from data.fetch_news_utils import fetch_rss_headlines
+# vaderSentiment, the feed fetcher and the coin list load on the first call
+from utils.metrics import HEADLINES_SCORED
 
 def get_sentiment_score(symbol, print_news=True):
     from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
@@ -28,6 +27,7 @@ def get_sentiment_score(symbol, print_news=True):
         total_score += compound
         scored_headlines.append(item)
 
+    HEADLINES_SCORED.inc(len(scored_headlines))
     avg_score = total_score / len(scored_headlines)
 
     if print_news:
@@ -0,0 +1,410 @@
+# data/standin_server.py
+#
+# Local stand-in for the upstreams the app talks to, for load-testing the fetch
+# layer without the network. It serves, on one port:
+#
+#   /api/v3/klines           Binance klines (synthetic, or recorded CSVs)
+#   /api/v3/coins/markets    CoinGecko top coins
+#   /api/v3/coins/<id>       CoinGecko coin detail, with icon URLs pointing back here
+#   /icons/<id>.png          coin icons
+#   /rss/<feed>.xml          RSS feeds with synthetic headlines
+#   /_standin/stats          request / response counters (JSON)
+#
+# with configurable latency, Binance request-weight and CoinGecko calls-per-minute
+# budgets (HTTP 429 + Retry-After once exhausted), random 5xx failures and dropped
+# connections.
+#
+#   python -m data.standin_server --port 8765 --latency 0.05 --failure-rate 0.02
+#
+# then start the app with the printed TRADINGSIGNALS_* variables, or in-process:
+#
+#   server = start_standin_server(latency=0.05)
+#   with using_upstreams(server.base_urls): ...
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from config import BINANCE_WEIGHT_PER_MINUTE, COINGECKO_CALLS_PER_MINUTE, DEFAULT_SYMBOL_NAME_MAP
+from data.fetch_price import klines_weight
+from data.synthetic import REFERENCE_PRICES, synthetic_headlines, synthetic_ohlcv
+from logic.signal_timer import INTERVAL_MINUTES
+
+# Synthetic candles reach this far back from server start, and run ahead of it
+# (so candles keep closing while the server is up) for up to a day
+STANDIN_HISTORY_BARS = 1_000
+STANDIN_HORIZON = pd.Timedelta(days=1)
+STANDIN_MAX_FUTURE_BARS = 20_000
+
+STANDIN_FEEDS = ("cryptopanic", "cointelegraph", "bitcoin-news")
+HEADLINES_PER_COIN = 4
+
+COINGECKO_IDS = {
+    "BTC": "bitcoin", "ETH": "ethereum", "BNB": "binancecoin", "SOL": "solana", "ADA": "cardano",
+    "XRP": "ripple", "DOGE": "dogecoin", "DOT": "polkadot", "MATIC": "matic-network", "LTC": "litecoin",
+}
+
+
+def _png(rgb, size=32):
+    # Solid-colour RGB PNG, built with the standard library only
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + bytes(rgb) * size
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(row * size)) + chunk(b"IEND", b"")
+
+
+def _read_recorded(record_dir):
+    # <SYMBOL>_<INTERVAL>.csv files as written by get_price_data(...).to_csv(path)
+    recorded = {}
+    for name in os.listdir(record_dir):
+        match = re.fullmatch(r"([A-Z0-9]+)_(\w+)\.csv", name)
+        if match:
+            df = pd.read_csv(os.path.join(record_dir, name), index_col="timestamp", parse_dates=["timestamp"])
+            recorded[(match.group(1), match.group(2))] = df[["open", "high", "low", "close", "volume"]].astype(float)
+    return recorded
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.0, failure_rate=0.0, drop_rate=0.0,
+                 binance_weight_limit=BINANCE_WEIGHT_PER_MINUTE, coingecko_calls_per_minute=COINGECKO_CALLS_PER_MINUTE,
+                 record_dir=None, seed=0, verbose=False):
+        super().__init__(address, StandInHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self.limits = {"binance": binance_weight_limit, "coingecko": coingecko_calls_per_minute}
+        self.recorded = _read_recorded(record_dir) if record_dir else None
+        self.seed = seed
+        self.verbose = verbose
+        self.clock = time.time  # replaceable, e.g. to pin the rate-limit minute in tests
+        self.started = pd.Timestamp(self.clock(), unit="s")
+
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.windows = {}  # upstream -> (minute, used)
+        self.series = {}
+        self.stats = {"requests": Counter(), "responses": Counter(), "dropped": 0}
+
+        host, port = self.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+        self.base_urls = {"binance": self.base_url, "coingecko": f"{self.base_url}/api/v3"}
+        self.rss_feeds = [f"{self.base_url}/rss/{feed}.xml" for feed in STANDIN_FEEDS]
+
+    def environment(self):
+        """TRADINGSIGNALS_* variables that point a separate app process at this server."""
+        return {
+            "TRADINGSIGNALS_DATA_SOURCE": "binance",
+            "TRADINGSIGNALS_BINANCE_URL": self.base_urls["binance"],
+            "TRADINGSIGNALS_COINGECKO_URL": self.base_urls["coingecko"],
+            "TRADINGSIGNALS_RSS_FEEDS": ",".join(self.rss_feeds),
+        }
+
+    def random(self):
+        with self.lock:
+            return self.rng.random()
+
+    def spend(self, upstream, weight):
+        """
+        Charges `weight` to the upstream's budget of the current minute.
+        Returns (allowed, used weight, seconds until the window resets).
+        """
+        now = self.clock()
+        minute = int(now // 60)
+        with self.lock:
+            window, used = self.windows.get(upstream, (minute, 0))
+            if window != minute:
+                used = 0
+            allowed = used + weight <= self.limits[upstream]
+            if allowed:
+                used += weight
+            self.windows[upstream] = (minute, used)
+        return allowed, used, math.ceil((minute + 1) * 60 - now)
+
+    def candles(self, symbol, interval):
+        if self.recorded is not None:
+            return self.recorded.get((symbol, interval))
+        key = (symbol, interval)
+        if key not in self.series:
+            step = pd.Timedelta(minutes=INTERVAL_MINUTES[interval])
+            future = min(math.ceil(STANDIN_HORIZON / step), STANDIN_MAX_FUTURE_BARS)
+            # Fixed at first use so overlapping requests see the same candles
+            series = synthetic_ohlcv(symbol, interval, STANDIN_HISTORY_BARS + future, seed=self.seed,
+                                     end=self.started + future * step)
+            with self.lock:
+                self.series.setdefault(key, series)
+        return self.series[key]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        route, handler, upstream = self._route(url.path)
+        with server.lock:
+            server.stats["requests"][route] += 1
+
+        if server.latency or server.jitter:
+            time.sleep(server.latency + server.jitter * server.random())
+
+        if server.random() < server.drop_rate:
+            with server.lock:
+                server.stats["dropped"] += 1
+            self.close_connection = True
+            return
+        if server.random() < server.failure_rate:
+            with server.lock:
+                status = server.rng.choice((500, 502, 503, 504))
+            return self._send(status, {"error": "injected failure"})
+
+        try:
+            handler(url.path, query, upstream)
+        except ValueError as e:
+            self._send(400, {"code": -1100, "msg": str(e)})
+
+    def _route(self, path):
+        if path == "/api/v3/klines":
+            return "klines", self._klines, "binance"
+        if path == "/api/v3/ping":
+            return "ping", self._ping, "binance"
+        if path == "/api/v3/coins/markets":
+            return "coins_markets", self._coins_markets, "coingecko"
+        if path.startswith("/api/v3/coins/"):
+            return "coin_detail", self._coin_detail, "coingecko"
+        if path.startswith("/icons/"):
+            return "icon", self._icon, None
+        if path.startswith("/rss/"):
+            return "rss", self._rss, None
+        if path == "/_standin/stats":
+            return "stats", self._stats, None
+        return "unknown", self._not_found, None
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.stats["responses"][str(status)] += 1
+
+    def _budget(self, upstream, weight=1):
+        # Sends the 429 and returns None when the budget is spent, else the headers to add
+        allowed, used, retry_after = self.server.spend(upstream, weight)
+        headers = {"X-MBX-USED-WEIGHT-1M": used} if upstream == "binance" else {}
+        if allowed:
+            return headers
+        if upstream == "binance":
+            body = {"code": -1003, "msg": "Too much request weight used; please use WebSocket Streams for live updates."}
+        else:
+            body = {"status": {"error_code": 429, "error_message": "You've exceeded the Rate Limit."}}
+        self._send(429, body, headers={**headers, "Retry-After": retry_after})
+        return None
+
+    def _base_url(self):
+        return f"http://{self.headers.get('Host') or self.server.base_url[len('http://'):]}"
+
+    def _ping(self, path, query, upstream):
+        headers = self._budget(upstream)
+        if headers is not None:
+            self._send(200, {}, headers=headers)
+
+    def _klines(self, path, query, upstream):
+        symbol = query.get("symbol", "").upper()
+        interval = query.get("interval", "")
+        if not symbol:
+            raise ValueError("Mandatory parameter 'symbol' was not sent, was empty/null, or malformed.")
+        if interval not in INTERVAL_MINUTES:
+            return self._send(400, {"code": -1120, "msg": "Invalid interval."})
+        limit = min(int(query.get("limit", 500)), 1000)
+
+        headers = self._budget(upstream, klines_weight(limit))
+        if headers is None:
+            return
+        df = self.server.candles(symbol, interval)
+        if df is None:
+            return self._send(400, {"code": -1121, "msg": "Invalid symbol."}, headers=headers)
+
+        step_ms = int(INTERVAL_MINUTES[interval] * 60_000)
+        open_ms = df.index.values.astype("datetime64[ms]").astype("int64")
+        # Only candles that have opened by now (the last one is still in progress)
+        mask = np.ones(len(open_ms), dtype=bool)
+        if self.server.recorded is None:
+            mask &= open_ms <= int(self.server.clock() * 1000)
+        if "startTime" in query:
+            mask &= open_ms >= int(query["startTime"])
+        if "endTime" in query:
+            mask &= open_ms <= int(query["endTime"])
+        rows = df[mask]
+        rows = rows.iloc[:limit] if "startTime" in query else rows.iloc[-limit:]
+        open_ms = rows.index.values.astype("datetime64[ms]").astype("int64")
+
+        klines = [
+            [int(t), f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.8f}", int(t) + step_ms - 1,
+             f"{v * c:.8f}", int(v // 10) + 1, f"{v / 2:.8f}", f"{v * c / 2:.8f}", "0"]
+            for t, o, h, l, c, v in zip(open_ms, rows["open"], rows["high"], rows["low"], rows["close"], rows["volume"])
+        ]
+        self._send(200, klines, headers=headers)
+
+    def _coins_markets(self, path, query, upstream):
+        headers = self._budget(upstream)
+        if headers is None:
+            return
+        per_page = int(query.get("per_page", 100))
+        page = int(query.get("page", 1))
+        coins = list(DEFAULT_SYMBOL_NAME_MAP.items())[(page - 1) * per_page:page * per_page]
+        base = self._base_url()
+        self._send(200, [
+            {
+                "id": COINGECKO_IDS.get(symbol, symbol.lower()),
+                "symbol": symbol.lower(),
+                "name": name,
+                "image": f"{base}/icons/{COINGECKO_IDS.get(symbol, symbol.lower())}.png",
+                "current_price": REFERENCE_PRICES.get(symbol),
+                "market_cap_rank": (page - 1) * per_page + rank,
+            }
+            for rank, (symbol, (name, _)) in enumerate(coins, 1)
+        ], headers=headers)
+
+    def _coin_detail(self, path, query, upstream):
+        headers = self._budget(upstream)
+        if headers is None:
+            return
+        coin_id = path[len("/api/v3/coins/"):]
+        symbols = {coin: symbol for symbol, coin in COINGECKO_IDS.items()}
+        if coin_id not in symbols:
+            return self._send(404, {"error": "coin not found"}, headers=headers)
+        icon = f"{self._base_url()}/icons/{coin_id}.png"
+        symbol = symbols[coin_id]
+        self._send(200, {
+            "id": coin_id,
+            "symbol": symbol.lower(),
+            "name": DEFAULT_SYMBOL_NAME_MAP[symbol][0],
+            "image": {"thumb": icon, "small": icon, "large": icon},
+        }, headers=headers)
+
+    def _icon(self, path, query, upstream):
+        coin_id = path[len("/icons/"):].removesuffix(".png")
+        digest = zlib.crc32(coin_id.encode())
+        self._send(200, _png((digest & 0xFF, (digest >> 8) & 0xFF, (digest >> 16) & 0xFF)), "image/png")
+
+    def _rss(self, path, query, upstream):
+        feed = path[len("/rss/"):].removesuffix(".xml")
+        if feed not in STANDIN_FEEDS:
+            return self._not_found(path, query, upstream)
+
+        # Headlines move with the clock, a new batch every 10 minutes
+        now = pd.Timestamp(self.server.clock(), unit="s").floor("10min")
+        items = []
+        for symbol, (name, code) in DEFAULT_SYMBOL_NAME_MAP.items():
+            items += synthetic_headlines(name, code, HEADLINES_PER_COIN, seed=(self.server.seed, feed, now.value), end=now)
+        items.sort(key=lambda item: pd.Timestamp(item["published"]), reverse=True)
+
+        entries = "".join(
+            f"<item><title>{escape(item['title'])}</title><description>{escape(item['summary'])}</description>"
+            f"<link>{escape(item['link'])}</link><pubDate>{item['published']}</pubDate></item>"
+            for item in items
+        )
+        xml = (
+            f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Stand-in {feed}</title><link>{self._base_url()}/rss/{feed}.xml</link>"
+            f"<description>Synthetic headlines</description>"
+            f"<lastBuildDate>{format_datetime(now.tz_localize('UTC').to_pydatetime())}</lastBuildDate>"
+            f"{entries}</channel></rss>"
+        )
+        self._send(200, xml.encode(), "application/rss+xml")
+
+    def _stats(self, path, query, upstream):
+        with self.server.lock:
+            stats = {
+                "requests": dict(self.server.stats["requests"]),
+                "responses": dict(self.server.stats["responses"]),
+                "dropped": self.server.stats["dropped"],
+            }
+        self._send(200, stats)
+
+    def _not_found(self, path, query, upstream):
+        self._send(404, {"error": f"no stand-in route for {path}"})
+
+
+def start_standin_server(host="127.0.0.1", port=0, **options):
+    """
+    Starts the stand-in server on a background thread (port 0 picks a free port).
+
+    Parameters:
+    - latency, jitter (float): seconds added to every response (latency + uniform(0, jitter))
+    - failure_rate (float): share of requests answered with a random 5xx
+    - drop_rate (float): share of connections closed without a response
+    - binance_weight_limit, coingecko_calls_per_minute (int): budgets per minute before 429s
+    - record_dir (str): serve klines from <SYMBOL>_<INTERVAL>.csv files instead of synthetic ones
+    - seed (int), verbose (bool)
+
+    Returns:
+    - StandInServer with base_url, base_urls (for utils.transport), rss_feeds and stats;
+      stop it with server.shutdown()
+    """
+    server = StandInServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="standin-server", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Binance / CoinGecko / RSS stand-in for offline load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered with a 5xx")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="share of connections closed without a response")
+    parser.add_argument("--binance-weight-limit", type=int, default=BINANCE_WEIGHT_PER_MINUTE)
+    parser.add_argument("--coingecko-calls-per-minute", type=int, default=COINGECKO_CALLS_PER_MINUTE)
+    parser.add_argument("--record-dir", help="directory of recorded <SYMBOL>_<INTERVAL>.csv candles")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = StandInServer(
+        (args.host, args.port), latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+        drop_rate=args.drop_rate, binance_weight_limit=args.binance_weight_limit,
+        coingecko_calls_per_minute=args.coingecko_calls_per_minute, record_dir=args.record_dir,
+        seed=args.seed, verbose=args.verbose,
+    )
+    print(f"🧪 Stand-in server listening on {server.base_url}. Point the app at it with:")
+    for name, value in server.environment().items():
+        print(f"export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stand-in server stopped.")
+    finally:
+        server.server_close()
@@ -0,0 +1,156 @@
+# data/synthetic.py
+#
+# Seeded, offline stand-ins for the live data sources: OHLCV candles with trend and
+# volatility regimes, fat-tailed returns and opening gaps, coin headlines in the
+# fetch_rss_headlines format, and a sentiment history like the logged CSV.
+# The same (seed, symbol, interval, length) always gives the same data, so
+# benchmarks and tests can run on machines without network access.
+#
+# Select it for the whole app with TRADINGSIGNALS_DATA_SOURCE=synthetic (see config.py).
+
+import hashlib
+from email.utils import format_datetime
+
+import numpy as np
+import pandas as pd
+
+from config import DEFAULT_SYMBOL_NAME_MAP
+from logic.signal_timer import INTERVAL_MINUTES
+
+# Fixed "now" of the synthetic world, so runs do not depend on the clock
+SYNTHETIC_END = pd.Timestamp("2024-06-01 00:00:00")
+
+# Per-minute return volatility (about 3% a day) and the regime multipliers
+BASE_VOLATILITY = 0.0008
+VOLATILITY_REGIMES = np.array([0.5, 1.0, 2.2])
+TREND_REGIMES = np.array([-1.0, 0.0, 1.0])
+TREND_STRENGTH = 0.08  # drift per candle, as a fraction of that candle's volatility
+AVERAGE_REGIME_BARS = 120
+GAP_PROBABILITY = 0.01
+
+BULLISH_TEMPLATES = [
+    "{name} rallies as institutional inflows hit a record",
+    "{name} breaks key resistance, traders eye new highs",
+    "Analysts upgrade {symbol} outlook after strong network growth",
+    "{name} ETF demand surges as buyers return",
+    "Whales accumulate {symbol} ahead of major upgrade",
+]
+BEARISH_TEMPLATES = [
+    "{name} slides as regulators announce new crackdown",
+    "{symbol} drops sharply after exchange hack fears",
+    "Traders dump {name} amid weak demand and rising outflows",
+    "{name} faces heavy selling pressure, support lost",
+    "Analysts warn of deeper {symbol} losses after failed breakout",
+]
+NEUTRAL_TEMPLATES = [
+    "{name} trades sideways as markets await economic data",
+    "{symbol} volume steady ahead of options expiry",
+    "What to watch for {name} this week",
+    "{name} developers publish quarterly roadmap update",
+    "{symbol} holds range while traders stay cautious",
+]
+SYNTHETIC_SOURCES = ["Synthetic Wire", "Mock Ledger", "Test Chain Daily"]
+
+# Rough price levels of the default coins (absolute thresholds such as the MACD
+# noise filter depend on them); other symbols get a seeded level
+REFERENCE_PRICES = {
+    "BTC": 60_000.0, "ETH": 3_000.0, "BNB": 550.0, "SOL": 150.0, "ADA": 0.45,
+    "XRP": 0.5, "DOGE": 0.15, "DOT": 7.0, "MATIC": 0.7, "LTC": 80.0,
+}
+
+
+def _rng(seed, *keys):
+    # Stable stream per (seed, keys); Python's hash() is salted per process
+    digest = hashlib.sha256(repr((seed,) + keys).encode()).digest()
+    return np.random.default_rng(int.from_bytes(digest[:8], "little"))
+
+
+def _regimes(rng, length, levels):
+    # Regime index per bar: switches on average every AVERAGE_REGIME_BARS bars
+    switches = np.cumsum(rng.random(length) < 1.0 / AVERAGE_REGIME_BARS)
+    picks = rng.integers(0, len(levels), size=switches[-1] + 1 if length else 1)
+    return levels[picks[switches]] if length else np.empty(0)
+
+
+def synthetic_ohlcv(symbol="BTCUSDT", interval="1h", length=500, seed=0, end=SYNTHETIC_END):
+    """
+    OHLCV candles in the get_price_data format (float columns, "timestamp" index).
+
+    Prices follow fat-tailed log returns whose drift and volatility switch between
+    regimes; about 1% of candles open with a gap from the previous close. The start
+    price depends only on the symbol, so every interval of a symbol trades at
+    similar levels.
+    """
+    if interval not in INTERVAL_MINUTES:
+        raise ValueError(f"Unknown interval '{interval}'")
+    minutes = INTERVAL_MINUTES[interval]
+    rng = _rng(seed, symbol, interval, length)
+
+    volatility = BASE_VOLATILITY * np.sqrt(minutes) * _regimes(rng, length, VOLATILITY_REGIMES)
+    drift = TREND_STRENGTH * volatility * _regimes(rng, length, TREND_REGIMES)
+    # Student-t with 4 degrees of freedom, scaled to unit variance
+    returns = drift + volatility * rng.standard_t(4, size=length) / np.sqrt(2)
+    gaps = np.where(rng.random(length) < GAP_PROBABILITY, rng.normal(0, 3, length) * volatility, 0.0)
+
+    coin = symbol[:-4] if symbol.endswith("USDT") else symbol
+    start_price = REFERENCE_PRICES.get(coin) or float(np.exp(_rng(0, symbol).uniform(np.log(0.05), np.log(60_000))))
+    log_close = np.log(start_price) + np.cumsum(returns + gaps)
+    close = np.exp(log_close)
+    open_ = np.exp(np.r_[np.log(start_price), log_close[:-1]] + gaps)
+
+    wick = np.abs(rng.normal(0, 0.5, (2, length))) * volatility
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+    volume = rng.lognormal(mean=np.log(1_000), sigma=0.4, size=length) * (1 + np.abs(returns) / volatility)
+
+    step = pd.Timedelta(minutes=minutes)
+    last = pd.Timestamp(0) + ((pd.Timestamp(end) - pd.Timestamp(0)) // step) * step
+    index = pd.date_range(end=last, periods=length, freq=step, name="timestamp")
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume}, index=index)
+
+
+def synthetic_headlines(coin_name="Bitcoin", coin_symbol="BTC", count=20, seed=0, end=SYNTHETIC_END, bias=0.0):
+    """
+    Headlines in the fetch_rss_headlines format (title, summary, published, source,
+    link, text), all mentioning the coin. `bias` in [-1, 1] tilts the mix towards
+    bearish (-) or bullish (+) stories.
+    """
+    rng = _rng(seed, "headlines", coin_symbol, count)
+    bullish = (1 + bias) / 3
+    bearish = (1 - bias) / 3
+    moods = rng.choice(3, size=count, p=[bullish, bearish, 1 - bullish - bearish])
+    templates = (BULLISH_TEMPLATES, BEARISH_TEMPLATES, NEUTRAL_TEMPLATES)
+    published = pd.Timestamp(end, tz="UTC") - pd.to_timedelta(np.sort(rng.integers(0, 48 * 60, count))[::-1], unit="m")
+
+    headlines = []
+    for i, mood in enumerate(moods):
+        title = templates[mood][rng.integers(len(templates[mood]))].format(name=coin_name, symbol=coin_symbol)
+        summary = f"{title}. Market participants react to the latest {coin_name} ({coin_symbol}) developments."
+        headlines.append({
+            "title": title,
+            "summary": summary,
+            "published": format_datetime(published[i].to_pydatetime()),
+            "source": SYNTHETIC_SOURCES[i % len(SYNTHETIC_SOURCES)],
+            "link": f"https://example.com/synthetic/{coin_symbol.lower()}/{i}",
+            "text": f"{title}. {summary}",
+        })
+    return headlines
+
+
+def synthetic_sentiment_history(symbols=None, days=365, seed=0, end=SYNTHETIC_END):
+    """
+    Sentiment log like data/sentiment_history.csv: one bullish / neutral / bearish
+    label per symbol every 30 minutes. Labels are sticky, as the real log is.
+    """
+    symbols = symbols or [f"{coin}USDT" for coin in DEFAULT_SYMBOL_NAME_MAP]
+    timestamps = pd.date_range(end=pd.Timestamp(end).floor("30min"), periods=days * 48, freq="30min")
+    labels = np.array(["bullish", "neutral", "bearish"])
+
+    frames = []
+    for symbol in symbols:
+        rng = _rng(seed, "sentiment", symbol)
+        # Keep the previous label 90% of the time
+        changes = np.cumsum(rng.random(len(timestamps)) < 0.1)
+        picks = rng.integers(0, 3, size=changes[-1] + 1)
+        frames.append(pd.DataFrame({"timestamp": timestamps, "symbol": symbol, "sentiment": labels[picks[changes]]}))
+    return pd.concat(frames, ignore_index=True)
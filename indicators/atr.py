@@ -0,0 +1,114 @@
+# indicators/atr.py
+
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+ATR_METHODS = ("sma", "wilder", "ema")
+
+
+def calculate_true_range(df: pd.DataFrame) -> pd.Series:
+    """
+    True range per candle: max(high - low, |high - prev close|, |low - prev close|).
+    The first candle has no previous close and falls back to high - low.
+    """
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    prev_close = np.roll(df["close"].to_numpy(dtype=float), 1)
+    if len(prev_close):
+        prev_close[0] = np.nan
+
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return pd.Series(tr, index=df.index, name="tr")
+
+
+def calculate_atr_series(df: pd.DataFrame, period: int = 14, method: str = "sma") -> pd.Series:
+    """
+    Average True Range for every candle of the frame, computed once.
+
+    - "sma":    simple rolling mean of the true range (the classic risk manager ATR)
+    - "wilder": Wilder smoothing, seeded with the SMA of the first `period` ranges
+    - "ema":    exponential moving average of the true range (span = period)
+
+    Values before the warm-up are NaN. Every value only depends on candles up to
+    its own index, so atr.iloc[i] equals the ATR of df.iloc[:i + 1].
+    """
+    if method not in ATR_METHODS:
+        raise ValueError(f"Unknown ATR method '{method}', expected one of {ATR_METHODS}")
+    if df is None or df.empty:
+        return pd.Series(dtype=float, name="atr")
+
+    tr = calculate_true_range(df)
+
+    if method == "sma":
+        atr = tr.rolling(window=period).mean()
+    elif method == "ema":
+        atr = tr.ewm(span=period, adjust=False).mean()
+    else:
+        seeded = tr.copy()
+        seeded.iloc[:period - 1] = np.nan
+        if len(tr) >= period:
+            seeded.iloc[period - 1] = tr.iloc[:period].mean()
+        atr = seeded.ewm(alpha=1.0 / period, adjust=False).mean()
+
+    return atr.rename("atr")
+
+
+class ATRState:
+    """
+    Rolling ATR state for live candles. update() costs O(1) per closed candle.
+
+    state = ATRState.from_frame(history_df, method="wilder")
+    atr = state.update(high, low, close)
+    """
+
+    def __init__(self, period=14, method="sma"):
+        if method not in ATR_METHODS:
+            raise ValueError(f"Unknown ATR method '{method}', expected one of {ATR_METHODS}")
+        self.period = period
+        self.method = method
+        self.prev_close = None
+        self.value = np.nan
+        self.count = 0
+        # Last true ranges ("sma" / Wilder seed). Their mean is summed afresh with fsum
+        # every time: a running sum would drift from the series over a long-lived stream
+        self._window = deque(maxlen=period)
+
+    @classmethod
+    def from_frame(cls, df, period=14, method="sma"):
+        """Seeds the state from the tail of an existing candle frame."""
+        state = cls(period, method)
+        if df is None or df.empty:
+            return state
+
+        tr = calculate_true_range(df)
+        state._window.extend(tr.iloc[-period:].tolist())
+        state.count = len(df)
+        state.prev_close = float(df["close"].iloc[-1])
+        state.value = float(calculate_atr_series(df, period, method).iloc[-1])
+        return state
+
+    def update(self, high, low, close):
+        """Feeds one closed candle and returns the new ATR (NaN while warming up)."""
+        if self.prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.count += 1
+
+        self._window.append(tr)
+
+        if self.method == "sma":
+            self.value = math.fsum(self._window) / self.period if self.count >= self.period else np.nan
+        elif self.method == "ema":
+            alpha = 2.0 / (self.period + 1)
+            self.value = tr if self.count == 1 else (1 - alpha) * self.value + alpha * tr
+        elif self.count == self.period:
+            self.value = math.fsum(self._window) / self.period
+        elif self.count > self.period:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+
+        return self.value
@@ -2,7 +2,7 @@
 
 import pandas as pd
 
-def calculate_macd(df):
+def calculate_macd(df, threshold=0.3):
     if df is None or df.empty or "close" not in df.columns:
         return "neutral"
 
@@ -18,9 +18,7 @@ def calculate_macd(df):
     current_hist = histogram.iloc[-1]
     prev_hist = histogram.iloc[-2] if len(histogram) > 1 else current_hist
 
-    # Noise filter: Ignore tiny fluctuations
-    threshold = 0.3
-
+    # Noise filter: Ignore tiny fluctuations (histogram moves below `threshold`)
     if current_hist > threshold and prev_hist <= threshold:
         return "bullish"
     elif current_hist < -threshold and prev_hist >= -threshold:
@@ -2,7 +2,7 @@
 
 import pandas as pd
 
-def calculate_rsi(df: pd.DataFrame, period: int = 14) -> tuple[float, str]:
+def calculate_rsi(df: pd.DataFrame, period: int = 14, overbought: float = 75, oversold: float = 25) -> tuple[float, str]:
     """
     Calculates RSI from closing prices.
     Returns: (RSI value, signal: 'overbought', 'oversold', or 'neutral')
@@ -28,9 +28,9 @@ def calculate_rsi(df: pd.DataFrame, period: int = 14) -> tuple[float, str]:
         return 50.0, "neutral"
 
     # RSI levels for crypto markets
-    if latest_rsi > 75:  
+    if latest_rsi > overbought:
         return latest_rsi, "overbought"
-    elif latest_rsi < 25:  
+    elif latest_rsi < oversold:
         return latest_rsi, "oversold"
     else:
         return latest_rsi, "neutral"
\ No newline at end of file
@@ -0,0 +1,297 @@
+# live_daemon.py
+#
+# Long-running live signal daemon. It keeps a watchlist of (symbol, interval)
+# pairs, sleeps until the next candle close of any interval it follows, fetches
+# only the candles that closed since the last one it saw, folds them into the
+# incremental indicator state of logic/live_engine.py and re-evaluates the pairs
+# whose interval just closed. Signal changes go to one or more sinks.
+#
+# Each pair also follows its adjacent timeframes (as main.py does), and no candle
+# history is kept after the warm-up, so memory stays flat however long it runs.
+#
+#   python live_daemon.py BTCUSDT ETHUSDT --intervals 15m 1h --sink stdout --sink file:reports/live_signals.jsonl
+#   python live_daemon.py --top 100 --intervals 1h --no-sentiment
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+
+import pandas as pd
+
+from data.async_fetch import AsyncFetcher
+from logic.live_engine import LiveSignalEngine
+from logic.signal_timer import INTERVAL_MINUTES
+from utils.http_client import get_session
+from utils.metrics import LIVE_SIGNAL_CHANGES, LIVE_TICK_SECONDS
+
+WARM_UP_CANDLES = 1000      # candles per stream at start-up (seeds EMA 200 and the percentiles)
+FETCH_LIMIT = 10            # candles per catch-up request (lowest Binance weight)
+CLOSE_DELAY = 1.0           # seconds after a close before fetching, for the exchange to publish it
+CLOSE_RETRIES = 3           # re-fetches of streams whose closed candle was not there yet
+SENTIMENT_REFRESH_SECONDS = 1800
+WEEK_OFFSET = 4 * 86400     # Binance weeks open on Monday; 1970-01-01 was a Thursday
+
+
+def candle_close(interval, open_time):
+    """Close time of the candle that opened at `open_time` (Timestamp)."""
+    if interval == "1M":
+        return open_time + pd.offsets.MonthBegin(1)
+    return open_time + pd.Timedelta(minutes=INTERVAL_MINUTES[interval])
+
+
+def next_candle_close(interval, now):
+    """First candle close of `interval` strictly after `now` (both in epoch seconds)."""
+    if interval == "1M":
+        return (pd.Timestamp(now, unit="s").normalize() + pd.offsets.MonthBegin(1)).timestamp()
+    step = INTERVAL_MINUTES[interval] * 60
+    offset = WEEK_OFFSET if interval == "1w" else 0
+    return (math.floor((now - offset) / step) + 1) * step + offset
+
+
+# === SINKS ===
+
+class StdoutSink:
+    def emit(self, event):
+        icon = {"BUY": "🟢", "SELL": "🔴"}.get(event["signal"], "⚪")
+        previous = event["previous"] or "-"
+        print(f"{icon} {event['time']} {event['symbol']} {event['interval']}: {previous} → {event['signal']} "
+              f"({event['confidence']}% confidence, close {event['close']})")
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    """Appends one JSON line per event."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "a")
+
+    def emit(self, event):
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class WebhookSink:
+    """POSTs each event as JSON; failures are printed, never raised."""
+
+    def __init__(self, url, timeout=5):
+        self.url, self.timeout = url, timeout
+
+    def emit(self, event):
+        try:
+            get_session().post(self.url, json=event, timeout=self.timeout).raise_for_status()
+        except Exception as e:
+            print(f"⚠️ Webhook {self.url} failed: {e}")
+
+    def close(self):
+        pass
+
+
+def make_sink(spec):
+    """Sink for a command-line spec: "stdout", "file:<path>" or "webhook:<url>"."""
+    kind, _, target = spec.partition(":")
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "file" and target:
+        return FileSink(target)
+    if kind == "webhook" and target:
+        return WebhookSink(target)
+    raise ValueError(f"Unknown sink {spec!r} (use stdout, file:<path> or webhook:<url>)")
+
+
+# === DAEMON ===
+
+class LiveDaemon:
+    """
+    Candle-close driven signal loop over a watchlist.
+
+    Parameters:
+    - watchlist: (symbol, interval) pairs to emit signals for
+    - sinks: objects with emit(event) and close()
+    - engine (LiveSignalEngine): incremental state; a fresh one by default
+    - use_sentiment (bool): score news per symbol (refreshed every `sentiment_refresh`
+      seconds); otherwise every symbol is "neutral"
+    - warm_up (int): candles fetched per stream before the first close
+    - clock: epoch-seconds time source (replaceable in tests)
+    """
+
+    def __init__(self, watchlist, sinks, engine=None, use_sentiment=True, sentiment_refresh=SENTIMENT_REFRESH_SECONDS,
+                 warm_up=WARM_UP_CANDLES, close_delay=CLOSE_DELAY, clock=time.time):
+        self.watchlist = list(dict.fromkeys(watchlist))
+        self.sinks = sinks
+        self.engine = engine or LiveSignalEngine()
+        self.use_sentiment = use_sentiment
+        self.sentiment_refresh = sentiment_refresh
+        self.warm_up = warm_up
+        self.close_delay = close_delay
+        self.clock = clock
+
+        self.streams = sorted({(symbol, tf) for symbol, interval in self.watchlist
+                               for tf in self.engine.timeframes(interval)})
+        self.signals = {}       # (symbol, interval) -> last emitted signal
+        self.sentiments = {}    # symbol -> (label, fetched at)
+        self.stats = {"ticks": 0, "candles": 0, "changes": 0}
+        self.stopping = None
+
+    def stop(self):
+        if self.stopping is not None:
+            self.stopping.set()
+
+    async def run(self, ticks=None):
+        """Warms up, then handles candle closes until stop() (or `ticks` closes)."""
+        self.stopping = asyncio.Event()
+        intervals = sorted({tf for _, tf in self.streams}, key=lambda tf: INTERVAL_MINUTES[tf])
+        async with AsyncFetcher() as fetcher:
+            now = self.clock()
+            print(f"🔥 Warming up {len(self.streams)} candle streams for {len(self.watchlist)} pairs...")
+            await asyncio.gather(*(self._catch_up(fetcher, symbol, tf, now) for symbol, tf in self.streams))
+            await self._evaluate(self.watchlist, now)
+
+            next_close = {tf: next_candle_close(tf, now) for tf in intervals}
+            while ticks is None or self.stats["ticks"] < ticks:
+                close_at = min(next_close.values())
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), max(close_at + self.close_delay - self.clock(), 0))
+                    break
+                except asyncio.TimeoutError:
+                    pass
+                due = [tf for tf, at in next_close.items() if at == close_at]
+                with LIVE_TICK_SECONDS.time():
+                    await self._tick(fetcher, due, close_at)
+                for tf in due:
+                    next_close[tf] = next_candle_close(tf, close_at)
+
+    async def _tick(self, fetcher, intervals, close_at):
+        closed_at = pd.Timestamp(close_at, unit="s")
+        streams = [(symbol, tf) for symbol, tf in self.streams if tf in intervals]
+        for attempt in range(CLOSE_RETRIES + 1):
+            await asyncio.gather(*(self._catch_up(fetcher, symbol, tf, self.clock()) for symbol, tf in streams))
+            # Streams whose candle closing at close_at has not been published yet
+            streams = [(symbol, tf) for symbol, tf in streams
+                       if self._stream_closed_at(symbol, tf) is None or self._stream_closed_at(symbol, tf) < closed_at]
+            if not streams or attempt == CLOSE_RETRIES:
+                break
+            await asyncio.sleep(1.0)
+        for symbol, tf in streams:
+            print(f"⚠️ {symbol} {tf}: candle closing at {closed_at} not available yet")
+
+        self.stats["ticks"] += 1
+        await self._evaluate([(symbol, interval) for symbol, interval in self.watchlist if interval in intervals],
+                             close_at)
+
+    def _stream_closed_at(self, symbol, tf):
+        state = self.engine.streams.get((symbol, tf))
+        if state is None or state.last_timestamp is None:
+            return None
+        return candle_close(tf, state.last_timestamp)
+
+    async def _catch_up(self, fetcher, symbol, tf, now):
+        """Fetches the stream's closed candles it has not seen (its warm-up if it has none yet)."""
+        now = pd.Timestamp(now, unit="s")
+        while True:
+            state = self.engine.streams.get((symbol, tf))
+            if state is None or state.last_timestamp is None:
+                limit, df = self.warm_up, await fetcher.klines(symbol, tf, self.warm_up)
+            else:
+                start = candle_close(tf, state.last_timestamp)
+                limit, df = FETCH_LIMIT, await fetcher.klines(symbol, tf, FETCH_LIMIT, start_time=start)
+            if df.empty:
+                return
+            closed = df[[candle_close(tf, ts) <= now for ts in df.index]]
+            self.stats["candles"] += self.engine.add_candles(symbol, tf, closed)
+            # A full page of closed candles means the stream was further behind
+            if len(closed) < limit or state is None:
+                return
+
+    async def _sentiment(self, symbol, now):
+        if not self.use_sentiment:
+            return "neutral"
+        label, fetched_at = self.sentiments.get(symbol, ("neutral", None))
+        if fetched_at is None or now - fetched_at >= self.sentiment_refresh:
+            from data.fetch_sentiment import get_sentiment_score
+            try:
+                label, _ = await asyncio.to_thread(get_sentiment_score, symbol, False)
+            except Exception as e:
+                print(f"⚠️ Sentiment for {symbol} failed ({e}), keeping {label}")
+            self.sentiments[symbol] = (label, now)
+        return label
+
+    async def _evaluate(self, pairs, close_at):
+        symbols = list(dict.fromkeys(symbol for symbol, _ in pairs))
+        labels = dict(zip(symbols, await asyncio.gather(*(self._sentiment(symbol, close_at) for symbol in symbols))))
+        for symbol, interval in pairs:
+            state = self.engine.streams.get((symbol, interval))
+            if state is None or state.last_timestamp is None:
+                continue
+            signal, confidence = self.engine.evaluate(symbol, interval, labels[symbol])
+            previous = self.signals.get((symbol, interval))
+            if signal == previous:
+                continue
+            self.signals[(symbol, interval)] = signal
+            self.stats["changes"] += 1
+            LIVE_SIGNAL_CHANGES.inc(interval=interval, signal=signal)
+            event = {
+                "time": str(candle_close(interval, state.last_timestamp)),
+                "symbol": symbol,
+                "interval": interval,
+                "signal": signal,
+                "confidence": confidence,
+                "previous": previous,
+                "close": float(state.row["close"][0]),
+                "sentiment": labels[symbol],
+            }
+            for sink in self.sinks:
+                sink.emit(event)
+
+
+def run_daemon(watchlist, sinks, ticks=None, **options):
+    """Runs a LiveDaemon until Ctrl+C (or `ticks` closes) and closes the sinks. Returns the daemon."""
+    daemon = LiveDaemon(watchlist, sinks, **options)
+    try:
+        asyncio.run(daemon.run(ticks))
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped.")
+    finally:
+        for sink in sinks:
+            sink.close()
+    print(f"📊 {daemon.stats['ticks']} candle closes, {daemon.stats['candles']} candles, "
+          f"{daemon.stats['changes']} signal changes.")
+    return daemon
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Emit live trading signals at every candle close.")
+    parser.add_argument("symbols", nargs="*", help="trading pairs, e.g. BTCUSDT ETHUSDT")
+    parser.add_argument("--top", type=int, help="watch the top N coins by market cap (as <COIN>USDT)")
+    parser.add_argument("--intervals", nargs="+", default=["1h"], help="signal intervals per symbol")
+    parser.add_argument("--sink", action="append", default=[], help="stdout, file:<path> or webhook:<url> (repeatable)")
+    parser.add_argument("--no-sentiment", action="store_true", help="treat every symbol as neutral")
+    parser.add_argument("--warm-up", type=int, default=WARM_UP_CANDLES, help="candles per stream at start-up")
+    parser.add_argument("--ticks", type=int, help="stop after this many candle closes")
+    args = parser.parse_args()
+
+    symbols = [s.upper() for s in args.symbols]
+    if args.top:
+        from config import build_symbol_name_map
+        symbols += [coin + "USDT" for coin in build_symbol_name_map(args.top)]
+    if not symbols:
+        parser.error("give symbols or --top N")
+    for interval in args.intervals:
+        if interval not in INTERVAL_MINUTES:
+            parser.error(f"unknown interval {interval!r}")
+
+    run_daemon(
+        [(symbol, interval) for symbol in dict.fromkeys(symbols) for interval in args.intervals],
+        [make_sink(spec) for spec in args.sink or ["stdout"]],
+        ticks=args.ticks,
+        use_sentiment=not args.no_sentiment,
+        warm_up=args.warm_up,
+    )
@@ -0,0 +1,277 @@
+# logic/live_engine.py
+#
+# Streaming version of logic/signal_series.py, for the live daemon (live_daemon.py)
+# and the replay feed. A StreamState holds the indicator state of one candle stream
+# (symbol, interval) and folds in each closed candle in constant time: exponential
+# averages are carried forward and rolling windows live in short deques, so no
+# candle history is kept. The values match indicator_frame bar for bar, and the
+# labels, strategies and vote go through the same signal_series functions the
+# backtester uses.
+#
+# The volatility classifier's percentile thresholds are the one part that looks at
+# every reading so far. A StreamState keeps the last `history` readings for them;
+# with history=None it keeps all of them and matches the backtester exactly.
+#
+#   engine = LiveSignalEngine()
+#   engine.add_candle("BTCUSDT", "1h", timestamp, close=64_000.0)
+#   engine.evaluate("BTCUSDT", "1h", "bullish")   -> ("BUY", 70)
+
+import bisect
+import math
+from collections import deque
+
+import numpy as np
+
+from data.fetch_price import get_adjacent_timeframes
+from logic.signal_series import (
+    BUY, SELL, bollinger_labels, macd_labels, rsi_labels, strategy_series, tally_series, volatility_labels
+)
+from strategies.params import resolve_params
+
+# Thresholds of generate_live_signal
+LIVE_MIN_AGREEING = 2
+LIVE_CONFIDENCE_THRESHOLD = 57
+
+# Volatility readings kept for the percentile thresholds of each stream
+LIVE_VOLATILITY_HISTORY = 5000
+
+# Fewer candles than this and a timeframe sits out the vote (as in generate_signal)
+MIN_CANDLES = 20
+
+
+class _Ewm:
+    """pandas' ewm(adjust=False).mean(), one value at a time (bit for bit)."""
+
+    __slots__ = ("alpha", "old_weight", "value")
+
+    def __init__(self, span=None, alpha=None):
+        # pandas goes through the centre of mass, which rounds alpha the same way
+        com = (span - 1) / 2 if span is not None else (1 - alpha) / alpha
+        self.alpha = 1.0 / (1.0 + com)
+        self.old_weight = 1.0 - self.alpha
+        self.value = None
+
+    def update(self, x):
+        if self.value is None:
+            self.value = x
+        elif self.value != x:
+            self.value = (self.old_weight * self.value + self.alpha * x) / (self.old_weight + self.alpha)
+        return self.value
+
+
+class _RollingStd:
+    """Sample standard deviation of the last `window` values, NaN until the window is full."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, window):
+        self.values = deque(maxlen=window)
+
+    def update(self, x):
+        self.values.append(x)
+        if len(self.values) < self.values.maxlen:
+            return math.nan
+        return float(np.std(self.values, ddof=1))
+
+
+class _Percentiles:
+    """Linear-interpolated quantiles of the last `history` values (all values with None)."""
+
+    __slots__ = ("sorted", "arrivals")
+
+    def __init__(self, history=None):
+        self.sorted = []
+        self.arrivals = deque(maxlen=history) if history else None
+
+    def add(self, x):
+        if self.arrivals is not None:
+            if len(self.arrivals) == self.arrivals.maxlen:
+                del self.sorted[bisect.bisect_left(self.sorted, self.arrivals[0])]
+            self.arrivals.append(x)
+        bisect.insort(self.sorted, x)
+
+    def __len__(self):
+        return len(self.sorted)
+
+    def quantile(self, q):
+        # Same interpolation as pandas' rolling / expanding quantile
+        position = q * (len(self.sorted) - 1)
+        low = int(position)
+        value = self.sorted[low]
+        if position == low:
+            return value
+        return value + (self.sorted[low + 1] - value) * (position - low)
+
+
+class StreamState:
+    """
+    Incremental indicator state of one candle stream.
+
+    Parameters:
+    - params (dict): strategy threshold overrides (see strategies.params)
+    - history (int): volatility readings kept for the percentile thresholds; None keeps all
+    """
+
+    def __init__(self, params=None, history=LIVE_VOLATILITY_HISTORY):
+        self.params = resolve_params(params)
+        self.bars = 0
+        self.last_timestamp = None
+        self.values = None
+        self._row = None
+
+        self.ema_20, self.ema_50 = _Ewm(span=20), _Ewm(span=50)
+        self.ema_200, self.macd_signal = _Ewm(span=200), _Ewm(span=9)
+        self.avg_gain, self.avg_loss = _Ewm(alpha=1 / 14), _Ewm(alpha=1 / 14)
+        self.closes = deque(maxlen=self.params["bb_window"])
+        self.short_vol, self.med_vol, self.long_vol = _RollingStd(5), _RollingStd(14), _RollingStd(30)
+        self.med_vol_history = _Percentiles(history)
+
+        self.prev_close = None
+        self.prev_histogram = None
+        self.prev_bands = (math.nan, math.nan)
+
+    def update(self, close, timestamp=None):
+        """Folds in the next closed candle. Its labels are only worked out when `row` is read."""
+        close = float(close)
+        first = self.prev_close is None
+        prev_close = close if first else self.prev_close
+
+        ema_20 = self.ema_20.update(close)
+        ema_50 = self.ema_50.update(close)
+        macd_line = ema_50 - self.ema_200.update(close)
+        histogram = macd_line - self.macd_signal.update(macd_line)
+        prev_histogram = histogram if first else self.prev_histogram
+
+        # RSI: the first bar has no change, which pandas counts as zero gain and loss
+        delta = 0.0 if first else close - prev_close
+        avg_gain = self.avg_gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self.avg_loss.update(-(delta if delta < 0 else 0.0))
+        if avg_loss == 0:
+            rs = math.nan if avg_gain == 0 else math.inf
+        else:
+            rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+
+        self.closes.append(close)
+        if len(self.closes) < self.closes.maxlen:
+            upper = lower = math.nan
+        else:
+            sma = float(np.mean(self.closes))
+            std = float(np.std(self.closes, ddof=1))
+            upper = sma + self.params["bb_num_std_dev"] * std
+            lower = sma - self.params["bb_num_std_dev"] * std
+        prev_upper, prev_lower = (upper, lower) if first else self.prev_bands
+
+        # Volatility: rolling deviations of returns, percentiles over the readings so far
+        if first:
+            short_vol = med_vol = long_vol = math.nan
+        else:
+            ret = close / prev_close - 1
+            short_vol, med_vol, long_vol = self.short_vol.update(ret), self.med_vol.update(ret), self.long_vol.update(ret)
+        if not math.isnan(med_vol):
+            self.med_vol_history.add(med_vol)
+        if len(self.med_vol_history) >= 10:
+            high = self.med_vol_history.quantile(0.75)
+            low = self.med_vol_history.quantile(0.25)
+        else:
+            high = low = math.nan
+        weighted_vol = short_vol * 0.5 + med_vol * 0.3 + long_vol * 0.2
+
+        self.prev_close, self.prev_histogram, self.prev_bands = close, histogram, (upper, lower)
+        self.bars += 1
+        self.last_timestamp = timestamp
+        self.values = (close, ema_20, ema_50, rsi, histogram, prev_histogram, upper, lower, prev_close,
+                       prev_upper, prev_lower, weighted_vol, high, low)
+        self._row = None
+
+    @property
+    def row(self):
+        """The indicator_frame columns at the latest bar, as one-element arrays (None before the first candle)."""
+        if self._row is None and self.values is not None:
+            (close, ema_20, ema_50, rsi, histogram, prev_histogram, upper, lower, prev_close,
+             prev_upper, prev_lower, weighted_vol, high, low) = (np.array([v]) for v in self.values)
+            rsi, rsi_signal = rsi_labels(rsi, self.params["rsi_overbought"], self.params["rsi_oversold"])
+            self._row = {
+                "close": close,
+                "ema_20": ema_20,
+                "ema_50": ema_50,
+                "rsi": rsi,
+                "rsi_signal": rsi_signal,
+                "macd": macd_labels(histogram, prev_histogram, self.params["macd_threshold"]),
+                "bollinger": bollinger_labels(close, upper, lower, prev_close, prev_upper, prev_lower),
+                "volatility": volatility_labels(weighted_vol, high, low),
+                # Streamed candles are always complete
+                "complete_rows": np.array([self.bars]),
+            }
+        return self._row
+
+    def strategies(self, sentiment):
+        """(signals, confidences) of the four strategies at the latest bar, as 4-element arrays."""
+        signals, confidences = strategy_series(self.row, sentiment, np.zeros(1, dtype=np.int64),
+                                               lengths=np.array([self.bars]))
+        return signals[0], confidences[0]
+
+
+class LiveSignalEngine:
+    """
+    Candle streams keyed by (symbol, interval), and the live signal of a symbol /
+    interval over its own stream and the adjacent timeframes' streams.
+
+    Parameters:
+    - params (dict): strategy threshold overrides
+    - min_agreeing, confidence_threshold: voting thresholds (generate_live_signal's by default)
+    - history (int): volatility readings kept per stream (see StreamState)
+    """
+
+    def __init__(self, params=None, min_agreeing=LIVE_MIN_AGREEING, confidence_threshold=LIVE_CONFIDENCE_THRESHOLD,
+                 history=LIVE_VOLATILITY_HISTORY):
+        self.params = params
+        self.min_agreeing = min_agreeing
+        self.confidence_threshold = confidence_threshold
+        self.history = history
+        self.streams = {}
+
+    def stream(self, symbol, interval):
+        key = (symbol, interval)
+        state = self.streams.get(key)
+        if state is None:
+            state = self.streams[key] = StreamState(self.params, self.history)
+        return state
+
+    def add_candle(self, symbol, interval, timestamp, close):
+        """Folds a closed candle into its stream; candles not newer than the last one are ignored. Returns True if used."""
+        state = self.stream(symbol, interval)
+        if state.last_timestamp is not None and timestamp <= state.last_timestamp:
+            return False
+        state.update(close, timestamp)
+        return True
+
+    def add_candles(self, symbol, interval, df):
+        """add_candle for every row of an OHLCV DataFrame. Returns the number of candles used."""
+        return sum(self.add_candle(symbol, interval, ts, close) for ts, close in zip(df.index, df["close"].to_numpy()))
+
+    def timeframes(self, interval):
+        lower_tf, higher_tf = get_adjacent_timeframes(interval)
+        return [tf for tf in (interval, lower_tf, higher_tf) if tf]
+
+    def evaluate(self, symbol, interval, sentiment):
+        """
+        The signal of `symbol` at `interval` from the latest candle of each of its timeframes.
+
+        Returns:
+        - (signal: str, confidence: int)
+        """
+        buy_votes = sell_votes = confidence_sum = strategy_count = 0
+        for tf in self.timeframes(interval):
+            state = self.streams.get((symbol, tf))
+            if state is None or state.bars < MIN_CANDLES:
+                continue
+            signals, confidences = state.strategies(sentiment)
+            buy_votes += int((signals == BUY).sum())
+            sell_votes += int((signals == SELL).sum())
+            confidence_sum += int(confidences.sum())
+            strategy_count += len(signals)
+
+        signal, confidence = tally_series(np.array([buy_votes]), np.array([sell_votes]), np.array([confidence_sum]),
+                                          np.array([strategy_count]), self.min_agreeing, self.confidence_threshold)
+        return signal[0], int(confidence[0])
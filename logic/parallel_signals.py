@@ -0,0 +1,107 @@
+# logic/parallel_signals.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from logic.signal_engine import evaluate_strategies, tally_votes
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def _export_frame(df):
+    """
+    Copies the OHLCV columns and the datetime index of a candle frame into one
+    shared memory block. Returns (shm, spec) where spec is the small picklable
+    description a worker needs to rebuild the frame.
+    """
+    values = np.ascontiguousarray(df[OHLCV_COLUMNS].to_numpy(dtype=np.float64))
+    index = pd.DatetimeIndex(df.index).values.astype("datetime64[ns]").view(np.int64)
+
+    rows = len(df)
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes + index.nbytes, 1))
+    np.ndarray((rows,), dtype=np.int64, buffer=shm.buf)[:] = index
+    np.ndarray((rows, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=shm.buf, offset=index.nbytes)[:] = values
+
+    return shm, {"name": shm.name, "rows": rows}
+
+
+def _attach_frame(spec):
+    """Rebuilds a candle frame from a shared memory spec (worker side)."""
+    # Pool workers share the parent's resource tracker, the parent unlinks the block
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    try:
+        rows = spec["rows"]
+        index = np.ndarray((rows,), dtype=np.int64, buffer=shm.buf).copy()
+        values = np.ndarray((rows, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=shm.buf, offset=index.nbytes).copy()
+    finally:
+        shm.close()
+
+    return pd.DataFrame(values, index=pd.DatetimeIndex(index.view("datetime64[ns]")), columns=OHLCV_COLUMNS)
+
+
+def _evaluate_unit(unit):
+    symbol, tf, spec, sentiment = unit
+    df = _attach_frame(spec)
+    return symbol, tf, evaluate_strategies(df, sentiment, symbol)
+
+
+def generate_signals_parallel(price_data_by_symbol, sentiments, min_agreeing=2, confidence_threshold=57,
+                              max_workers=None, executor=None):
+    """
+    Multi-symbol version of generate_signal.
+
+    Every (symbol, timeframe) frame is one work unit. Candle arrays are handed to the
+    worker processes through shared memory, only the strategy decisions travel back,
+    and they are merged per symbol with the same voting rules as generate_signal.
+
+    Parameters:
+    - price_data_by_symbol (dict): symbol -> {timeframe: DataFrame}
+    - sentiments (dict): symbol -> sentiment passed to the strategies
+    - min_agreeing, confidence_threshold: voting thresholds (live defaults)
+    - max_workers (int): pool size, defaults to the number of CPUs
+    - executor: optional ProcessPoolExecutor to reuse across calls
+
+    Returns:
+    - dict: symbol -> (signal: str, confidence: int)
+    """
+    blocks = []
+    units = []
+    try:
+        for symbol, price_data in price_data_by_symbol.items():
+            for tf, df in price_data.items():
+                if df is None or df.empty or len(df) < 20:
+                    continue
+                shm, spec = _export_frame(df)
+                blocks.append(shm)
+                units.append((symbol, tf, spec, sentiments.get(symbol, "neutral")))
+
+        results = {}
+        if units:
+            workers = max_workers or os.cpu_count() or 1
+            own_executor = executor is None
+            if own_executor:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            try:
+                chunksize = max(1, len(units) // (workers * 4))
+                for symbol, tf, strategies in executor.map(_evaluate_unit, units, chunksize=chunksize):
+                    results.setdefault(symbol, {})[tf] = strategies
+            finally:
+                if own_executor:
+                    executor.shutdown()
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    signals = {}
+    for symbol, price_data in price_data_by_symbol.items():
+        # Keep the caller's timeframe order so the merged votes match generate_signal
+        per_tf = results.get(symbol, {})
+        total_strategies = [s for tf in price_data if tf in per_tf for s in per_tf[tf]]
+        signals[symbol] = tally_votes(total_strategies, min_agreeing, confidence_threshold)
+
+    return signals
@@ -2,14 +2,10 @@
 
 import numpy as np
 from fractions import Fraction
+from indicators.atr import calculate_atr_series
 
-def calculate_atr(df, period=14):
-    df = df.copy()
-    df["H-L"] = df["high"] - df["low"]
-    df["H-PC"] = abs(df["high"] - df["close"].shift(1))
-    df["L-PC"] = abs(df["low"] - df["close"].shift(1))
-    df["TR"] = df[["H-L", "H-PC", "L-PC"]].max(axis=1)
-    atr = df["TR"].rolling(window=period).mean()
+def calculate_atr(df, period=14, method="sma"):
+    atr = calculate_atr_series(df, period, method)
     return round(atr.iloc[-1], 4) if not atr.empty else 0.0
 
 def estimate_reward_multiplier(trend_strength, sentiment_score, volatility_level, confidence):
@@ -46,7 +42,11 @@ def determine_risk_level(multiplier):
         return "moderate"
     return "high"
 
-def calculate_risk_management(df, signal, volatility_level, indicators, backtest_df=None, confidence=70):
+def calculate_risk_management(df, signal, volatility_level, indicators, backtest_df=None, confidence=70, atr=None):
+    """
+    Stop loss / take profit suggestion for an entry at the last close of df.
+    Pass `atr` (e.g. read from a precomputed calculate_atr_series) to skip recomputing it.
+    """
     if df.empty or signal not in ["BUY", "SELL"]:
         return {
             'risk_reward_ratio': 0.0,
@@ -58,7 +58,8 @@ def calculate_risk_management(df, signal, volatility_level, indicators, backtest
         }
 
     entry_price = df["close"].iloc[-1]
-    atr = calculate_atr(df)
+    if atr is None:
+        atr = calculate_atr(df)
 
     if atr == 0.0 or np.isnan(atr):
         return {
@@ -74,61 +75,102 @@ def calculate_risk_management(df, signal, volatility_level, indicators, backtest
     trend_strength = indicators.get("trend_strength", 0.5)
     volatility = indicators.get("volatility", "medium")
 
-    reward_multiplier = estimate_reward_multiplier(trend_strength, sentiment, volatility, confidence)
-    risk_level = determine_risk_level(reward_multiplier)
-
-    # 🛡 Adaptive SL logic based on confidence
-    if confidence >= 85:
-        sl_multiplier = 1.2
-    elif confidence <= 55:
-        sl_multiplier = 0.8
-    else:
-        sl_multiplier = 1.0
-
-    max_sl_percent = 1.5  # 💣 Don't allow SL > 1.5% from entry
-
-    if signal == "BUY":
-        raw_sl = atr * sl_multiplier
-        stop_loss = round(entry_price - min(raw_sl, entry_price * max_sl_percent / 100), 4)
-        take_profit = round(entry_price + (atr * reward_multiplier), 4)
-        risk = entry_price - stop_loss
-        reward = take_profit - entry_price
-        raw_return = ((take_profit - entry_price) / entry_price) * 100
-    else:
-        raw_sl = atr * sl_multiplier
-        stop_loss = round(entry_price + min(raw_sl, entry_price * max_sl_percent / 100), 4)
-        take_profit = round(entry_price - (atr * reward_multiplier), 4)
-        risk = stop_loss - entry_price
-        reward = entry_price - take_profit
-        raw_return = ((entry_price - take_profit) / entry_price) * 100
-
-    risk_reward_ratio = round(reward / risk, 2) if risk != 0 else 0.0
-    expected_profit_percent = round(abs(raw_return), 2)
+    batch = calculate_risk_management_batch(
+        [entry_price], [signal], [confidence], [volatility], [atr],
+        trend_strength=trend_strength, sentiment=sentiment
+    )
 
+    return {
+        'risk_reward_ratio': batch['risk_reward_ratio'][0],
+        'risk_reward_label': format_risk_reward_label(batch['risk'][0], batch['reward'][0]),
+        'suggested_stop_loss': batch['stop_loss'][0],
+        'suggested_take_profit': batch['take_profit'][0],
+        'risk_level': batch['risk_level'][0],
+        'expected_profit_percent': batch['expected_profit_percent'][0]
+    }
+
+def format_risk_reward_label(risk, reward):
+    """Display label for a risk:reward pair, e.g. "1 : 2". Only needed when showing a trade."""
     # ✅ Simplify as proper fraction using fractions module
     try:
-        ratio = Fraction(risk).limit_denominator(1000) / Fraction(reward).limit_denominator(1000)
+        ratio = Fraction(float(risk)).limit_denominator(1000) / Fraction(float(reward)).limit_denominator(1000)
         simplified = ratio.limit_denominator()
-        risk_reward_label = f"{simplified.numerator} : {simplified.denominator}"
+        return f"{simplified.numerator} : {simplified.denominator}"
     except:
-        risk_reward_label = f"{round(risk, 2)} : {round(reward, 2)}"
+        return f"{round(risk, 2)} : {round(reward, 2)}"
+
+def calculate_risk_management_batch(entry_prices, signals, confidences, volatility_levels, atr,
+                                    trend_strength=0.6, sentiment=0.0):
+    """
+    Vectorized calculate_risk_management for many candidate entries at once.
+
+    Parameters:
+    - entry_prices (array): entry price per candidate
+    - signals (array): "BUY" / "SELL" / "HOLD" per candidate
+    - confidences (array): signal confidence per candidate
+    - volatility_levels (array): "low" / "medium" / "high" per candidate
+    - atr (array): ATR at each entry
+    - trend_strength, sentiment: scalars or arrays
+
+    Returns:
+    - dict of arrays: stop_loss, take_profit, risk, reward, risk_reward_ratio,
+      expected_profit_percent, reward_multiplier, risk_level.
+      Risk:reward labels are left to format_risk_reward_label at display time.
+    """
+    entry = np.asarray(entry_prices, dtype=float)
+    signals = np.asarray(signals, dtype=object)
+    confidence = np.asarray(confidences, dtype=float)
+    volatility = np.asarray(volatility_levels, dtype=object)
+    atr = np.asarray(atr, dtype=float)
+    trend_strength = np.broadcast_to(np.asarray(trend_strength, dtype=float), entry.shape)
+    sentiment = np.broadcast_to(np.asarray(sentiment, dtype=float), entry.shape)
+
+    is_buy = signals == "BUY"
+    is_sell = signals == "SELL"
+    valid_atr = (atr != 0.0) & ~np.isnan(atr)
+    tradable = (is_buy | is_sell) & valid_atr
+
+    # Same additions, in the same order, as estimate_reward_multiplier
+    multiplier = np.full(entry.shape, 1.8)
+    multiplier = multiplier + np.select(
+        [trend_strength > 0.8, trend_strength > 0.6, trend_strength < 0.4], [0.5, 0.3, -0.3], 0.0)
+    multiplier = multiplier + np.select([sentiment > 0.6, sentiment < -0.6], [0.2, -0.2], 0.0)
+    multiplier = multiplier + np.select([volatility == "high", volatility == "low"], [-0.25, 0.1], 0.0)
+    multiplier = multiplier + np.select([confidence >= 85, confidence <= 55], [0.35, -0.35], 0.0)
+    multiplier = np.round(np.clip(multiplier, 1.4, 4.0), 2)
 
-    # ❌ Filter weak trades more strictly
-    if risk_reward_ratio < 1.2 or expected_profit_percent < 0.25:
-        return {
-            'risk_reward_ratio': risk_reward_ratio,
-            'risk_reward_label': risk_reward_label,
-            'suggested_stop_loss': stop_loss,
-            'suggested_take_profit': take_profit,
-            'risk_level': 'too_weak',
-            'expected_profit_percent': expected_profit_percent
-        }
+    # 🛡 Adaptive SL logic based on confidence
+    sl_multiplier = np.select([confidence >= 85, confidence <= 55], [1.2, 0.8], 1.0)
+    max_sl_percent = 1.5  # 💣 Don't allow SL > 1.5% from entry
 
+    sl_distance = np.minimum(atr * sl_multiplier, entry * max_sl_percent / 100)
+    direction = np.where(is_sell, -1.0, 1.0)
+    stop_loss = np.round(np.where(is_sell, entry + sl_distance, entry - sl_distance), 4)
+    take_profit = np.round(np.where(is_sell, entry - atr * multiplier, entry + atr * multiplier), 4)
+    risk = (entry - stop_loss) * direction
+    reward = (take_profit - entry) * direction
+    raw_return = reward / entry * 100
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        risk_reward_ratio = np.where(risk != 0, np.round(reward / risk, 2), 0.0)
+    expected_profit_percent = np.round(np.abs(raw_return), 2)
+
+    risk_level = np.select(
+        [~(is_buy | is_sell), ~valid_atr,
+         (risk_reward_ratio < 1.2) | (expected_profit_percent < 0.25),
+         multiplier < 1.8, multiplier < 2.5],
+        ["neutral", "invalid", "too_weak", "low", "moderate"],
+        "high"
+    ).astype(object)
+
+    zero = np.zeros(entry.shape)
     return {
-        'risk_reward_ratio': risk_reward_ratio,
-        'risk_reward_label': risk_reward_label,
-        'suggested_stop_loss': stop_loss,
-        'suggested_take_profit': take_profit,
-        'risk_level': risk_level,
-        'expected_profit_percent': expected_profit_percent
+        'stop_loss': np.where(tradable, stop_loss, zero),
+        'take_profit': np.where(tradable, take_profit, zero),
+        'risk': np.where(tradable, risk, zero),
+        'reward': np.where(tradable, reward, zero),
+        'risk_reward_ratio': np.where(tradable, risk_reward_ratio, zero),
+        'expected_profit_percent': np.where(tradable, expected_profit_percent, zero),
+        'reward_multiplier': multiplier,
+        'risk_level': risk_level
     }
\ No newline at end of file
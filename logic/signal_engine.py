@@ -5,27 +5,26 @@ from strategies.rsi_volatility_strategy import rsi_volatility_signal
 from strategies.trend_sentiment_strategy import trend_sentiment_signal
 from strategies.bollinger_squeezer_strategy import bollinger_squeeze_signal
 
-def evaluate_strategies(df, sentiment, symbol):
+def evaluate_strategies(df, sentiment, symbol, params=None):
     """
     Evaluates all individual strategies on a given timeframe's data.
     Returns a list of strategy decisions with signal and confidence.
+    `params` overrides strategy thresholds (see strategies.params).
     """
     return [
-        macd_ema_signal(df),
-        rsi_volatility_signal(df),
+        macd_ema_signal(df, params),
+        rsi_volatility_signal(df, params),
         trend_sentiment_signal(df, sentiment),
-        bollinger_squeeze_signal(df)
+        bollinger_squeeze_signal(df, params)
     ]
 
-def generate_signal(price_data, sentiment, symbol, min_agreeing=1, confidence_threshold=55, debug=False):
-    final_votes = {"BUY": 0, "SELL": 0, "HOLD": 0}
-    confidences = []
+def generate_signal(price_data, sentiment, symbol, min_agreeing=1, confidence_threshold=55, debug=False, params=None):
     total_strategies = []
 
     for tf, df in price_data.items():
         if df is None or df.empty or len(df) < 20:
             continue
-        strategies = evaluate_strategies(df, sentiment, symbol)
+        strategies = evaluate_strategies(df, sentiment, symbol, params)
         total_strategies.extend(strategies)
 
         if debug:
@@ -33,6 +32,17 @@ def generate_signal(price_data, sentiment, symbol, min_agreeing=1, confidence_th
             for strat in strategies:
                 print(f"  → {strat['strategy']}: {strat['signal']} ({strat['confidence']}%)")
 
+    return tally_votes(total_strategies, min_agreeing, confidence_threshold, debug)
+
+
+def tally_votes(total_strategies, min_agreeing=1, confidence_threshold=55, debug=False):
+    """
+    Merges strategy decisions (from any number of timeframes) into one final signal.
+    Returns (signal, avg_confidence).
+    """
+    final_votes = {"BUY": 0, "SELL": 0, "HOLD": 0}
+    confidences = []
+
     for strat in total_strategies:
         final_votes[strat["signal"]] += 1
         confidences.append(strat["confidence"])
@@ -62,7 +72,7 @@ def generate_signal(price_data, sentiment, symbol, min_agreeing=1, confidence_th
     return final_signal, avg_confidence
 
 
-def generate_live_signal(price_data, sentiment, symbol, debug=True):
+def generate_live_signal(price_data, sentiment, symbol, debug=True, params=None):
     """
     Stricter version of signal generator for real-ti me usage.
     Requires more agreement and higher confidence.
@@ -73,10 +83,11 @@ def generate_live_signal(price_data, sentiment, symbol, debug=True):
         symbol=symbol,
         min_agreeing=2,
         confidence_threshold=57,  #65 for more stricter trades
-        debug=debug
+        debug=debug,
+        params=params
     )
 
-def generate_backtest_signal(price_data, sentiment, symbol, debug=False):
+def generate_backtest_signal(price_data, sentiment, symbol, debug=False, params=None):
     """
     Looser signal generator for backtesting.
     Allows more frequent trade signals to assess strategy behavior across wider conditions.
@@ -89,6 +100,7 @@ def generate_backtest_signal(price_data, sentiment, symbol, debug=False):
     - sentiment (float): latest sentiment score at that point in time
     - symbol (str): trading pair
     - debug (bool): enable detailed signal voting logs for backtesting
+    - params (dict): optional strategy threshold overrides
 
     Returns:
     - (signal: str, confidence: int)
@@ -99,5 +111,6 @@ def generate_backtest_signal(price_data, sentiment, symbol, debug=False):
         symbol=symbol,
         min_agreeing=1,
         confidence_threshold=55,
-        debug=debug
+        debug=debug,
+        params=params
     )
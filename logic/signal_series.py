@@ -0,0 +1,265 @@
+# logic/signal_series.py
+#
+# Bar-by-bar versions of the indicators, strategies and signal vote.
+# Value i of every series equals what the scalar function returns for df.iloc[:i + 1],
+# so a backtest can compute each series once instead of re-running the strategies
+# on a growing slice at every bar.
+#
+# The *_labels functions turn indicator values into labels; logic/live_engine.py
+# calls them with one-element arrays, so live and batch signals share the rules.
+
+import numpy as np
+import pandas as pd
+
+from strategies.params import resolve_params
+
+HOLD, BUY, SELL = "HOLD", "BUY", "SELL"
+
+
+def _prev(values):
+    # Previous bar's value, the first bar uses its own value (as the scalar code does)
+    prev = np.roll(values, 1)
+    if len(prev):
+        prev[0] = values[0]
+    return prev
+
+
+def macd_labels(current, prev, threshold=0.3):
+    """MACD label from the histogram (MACD line - signal line) of this bar and the previous one."""
+    return np.select(
+        [
+            (current > threshold) & (prev <= threshold),
+            (current < -threshold) & (prev >= -threshold),
+            (current > prev) & (current > threshold),
+            (current < prev) & (current < -threshold),
+            np.abs(current) < threshold,
+            current > 0,
+        ],
+        ["bullish", "bearish", "bullish", "bearish", "neutral", "bullish"],
+        "bearish"
+    ).astype(object)
+
+
+def macd_series(close, threshold=0.3):
+    ema50 = close.ewm(span=50, adjust=False).mean()
+    ema200 = close.ewm(span=200, adjust=False).mean()
+    macd_line = ema50 - ema200
+    signal_line = macd_line.ewm(span=9, adjust=False).mean()
+    current = (macd_line - signal_line).to_numpy()
+    return pd.Series(macd_labels(current, _prev(current), threshold), index=close.index)
+
+
+def rsi_labels(rsi, overbought=75, oversold=25):
+    """(RSI with missing values as 50, label) for raw RSI values."""
+    missing = np.isnan(rsi)
+    rsi = np.where(missing, 50.0, rsi)
+    labels = np.select(
+        [missing, rsi > overbought, rsi < oversold],
+        ["neutral", "overbought", "oversold"],
+        "neutral"
+    )
+    return rsi, labels.astype(object)
+
+
+def rsi_series(close, period=14, overbought=75, oversold=25):
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+
+    alpha = 1.0 / period
+    avg_gain = gain.ewm(alpha=alpha, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=alpha, adjust=False).mean()
+
+    rs = avg_gain / avg_loss
+    rsi, labels = rsi_labels((100 - (100 / (1 + rs))).to_numpy(), overbought, oversold)
+    return pd.Series(rsi, index=close.index), pd.Series(labels, index=close.index)
+
+
+def bollinger_labels(price, upper, lower, prev_price, prev_upper, prev_lower):
+    """Bollinger label from this bar's and the previous bar's close and bands."""
+    upper_breach = price > upper
+    lower_breach = price < lower
+    prev_upper_breach = prev_price > prev_upper
+    prev_lower_breach = prev_price < prev_lower
+
+    return np.select(
+        [
+            upper_breach & prev_upper_breach,
+            lower_breach & prev_lower_breach,
+            upper_breach & ~prev_upper_breach,
+            lower_breach & ~prev_lower_breach,
+        ],
+        ["breakout_up", "breakout_down", "breakout_up", "breakout_down"],
+        "within_range"
+    ).astype(object)
+
+
+def bollinger_series(close, window=20, num_std_dev=2):
+    sma = close.rolling(window=window).mean()
+    std = close.rolling(window=window).std()
+    upper = (sma + num_std_dev * std).to_numpy()
+    lower = (sma - num_std_dev * std).to_numpy()
+    price = close.to_numpy()
+    labels = bollinger_labels(price, upper, lower, _prev(price), _prev(upper), _prev(lower))
+    return pd.Series(labels, index=close.index)
+
+
+def volatility_labels(weighted_vol, high_threshold, low_threshold):
+    """Volatility label from the weighted volatility and the percentile thresholds (NaN while warming up)."""
+    return np.select(
+        [
+            np.isnan(high_threshold) | np.isnan(weighted_vol),
+            weighted_vol > high_threshold * 1.2,
+            weighted_vol < low_threshold * 0.8,
+        ],
+        ["medium", "high", "low"],
+        "medium"
+    ).astype(object)
+
+
+def volatility_series(close):
+    returns = close.pct_change()
+    short_vol = returns.rolling(window=5).std()
+    med_vol = returns.rolling(window=14).std()
+    long_vol = returns.rolling(window=30).std()
+
+    # Percentile thresholds over all volatility readings so far
+    high_threshold = med_vol.expanding(min_periods=10).quantile(0.75).to_numpy()
+    low_threshold = med_vol.expanding(min_periods=10).quantile(0.25).to_numpy()
+    weighted_vol = (short_vol * 0.5 + med_vol * 0.3 + long_vol * 0.2).to_numpy()
+    return pd.Series(volatility_labels(weighted_vol, high_threshold, low_threshold), index=close.index)
+
+
+def indicator_frame(df, params=None):
+    """
+    Every indicator the strategies read, for every bar of one timeframe.
+    Independent of sentiment, so it can be computed once and cached per (frame, params).
+    """
+    params = resolve_params(params)
+    close = df["close"]
+
+    rsi, rsi_signal = rsi_series(close, overbought=params["rsi_overbought"], oversold=params["rsi_oversold"])
+    return pd.DataFrame({
+        "close": close,
+        "ema_20": close.ewm(span=20, adjust=False).mean(),
+        "ema_50": close.ewm(span=50, adjust=False).mean(),
+        "rsi": rsi,
+        "rsi_signal": rsi_signal,
+        "macd": macd_series(close, threshold=params["macd_threshold"]),
+        "bollinger": bollinger_series(close, window=params["bb_window"], num_std_dev=params["bb_num_std_dev"]),
+        "volatility": volatility_series(close),
+        # identify_trend counts the rows left after dropna()
+        "complete_rows": np.cumsum(df.notna().all(axis=1).to_numpy()),
+    }, index=df.index)
+
+
+def strategy_series(frame, sentiment, positions=None, lengths=None):
+    """
+    Signals and confidences of the four strategies, in evaluate_strategies order,
+    at the given bar positions of one timeframe (all bars by default).
+    `sentiment` is one value per position. `frame` is an indicator_frame or a dict
+    of the same columns as arrays; `lengths` (bars seen up to each position) defaults
+    to positions + 1 and is given when the frame only holds the latest bars.
+    Returns (signals, confidences), both shaped (positions, 4).
+    """
+    if positions is None:
+        positions = np.arange(len(frame["close"]))
+    length = positions + 1 if lengths is None else lengths
+    close = np.asarray(frame["close"])[positions]
+    ema_20 = np.asarray(frame["ema_20"])[positions]
+    ema_50 = np.asarray(frame["ema_50"])[positions]
+    macd = np.asarray(frame["macd"])[positions]
+    rsi_signal = np.asarray(frame["rsi_signal"])[positions]
+    volatility = np.asarray(frame["volatility"])[positions]
+    bollinger = np.asarray(frame["bollinger"])[positions]
+    complete_rows = np.asarray(frame["complete_rows"])[positions]
+    sentiment = np.broadcast_to(np.asarray(sentiment, dtype=object), positions.shape)
+
+    trend = np.where(
+        complete_rows < 50, "sideways",
+        np.where(ema_20 > ema_50, "uptrend", np.where(ema_20 < ema_50, "downtrend", "sideways"))
+    )
+
+    macd_ema = np.select(
+        [length < 50, (macd == "bullish") & (close > ema_50), (macd == "bearish") & (close < ema_50)],
+        [HOLD, BUY, SELL], HOLD
+    )
+    rsi_vol = np.select(
+        [length < 14, (rsi_signal == "oversold") & (volatility == "low"),
+         (rsi_signal == "overbought") & (volatility == "high")],
+        [HOLD, BUY, SELL], HOLD
+    )
+    trend_sent = np.select(
+        [(trend == "uptrend") & (sentiment == "bullish"), (trend == "downtrend") & (sentiment == "bearish")],
+        [BUY, SELL], HOLD
+    )
+    squeeze = np.select(
+        [length < 20, bollinger == "breakout_up", bollinger == "breakout_down"],
+        [HOLD, BUY, SELL], HOLD
+    )
+
+    signals = np.stack([macd_ema, rsi_vol, trend_sent, squeeze], axis=1).astype(object)
+    active = signals != HOLD
+    confidences = np.where(active, np.array([70, 65, 75, 70]), 50)
+    return signals, confidences
+
+
+def signal_series(price_data, index, sentiment, min_agreeing=1, confidence_threshold=55, params=None, frames=None):
+    """
+    generate_signal for every timestamp of `index` at once.
+
+    Each timeframe is cut at the timestamp the same way the backtester does
+    (candles with index <= timestamp) and skipped while it has fewer than 20 candles.
+
+    Parameters:
+    - price_data (dict): timeframe -> DataFrame
+    - index: timestamps to evaluate (usually the base timeframe's index)
+    - sentiment: sentiment value per timestamp
+    - min_agreeing, confidence_threshold: voting thresholds
+    - params (dict): strategy threshold overrides
+    - frames (dict): optional cache of indicator_frame results keyed by timeframe,
+      only valid for the same candles and params
+
+    Returns:
+    - (signals: object array, confidences: int array)
+    """
+    index = pd.DatetimeIndex(index)
+    sentiment = np.broadcast_to(np.asarray(sentiment, dtype=object), (len(index),))
+    buy_votes = np.zeros(len(index), dtype=np.int64)
+    sell_votes = np.zeros(len(index), dtype=np.int64)
+    confidence_sum = np.zeros(len(index), dtype=np.int64)
+    strategy_count = np.zeros(len(index), dtype=np.int64)
+
+    for tf, df in price_data.items():
+        if df is None or df.empty:
+            continue
+        if frames is not None and tf in frames:
+            frame = frames[tf]
+        else:
+            frame = indicator_frame(df, params)
+            if frames is not None:
+                frames[tf] = frame
+
+        position = pd.DatetimeIndex(df.index).searchsorted(index, side="right") - 1
+        usable = position + 1 >= 20
+        position = np.maximum(position, 0)
+
+        signals, confidences = strategy_series(frame, sentiment, position)
+        buy_votes += np.where(usable, (signals == BUY).sum(axis=1), 0)
+        sell_votes += np.where(usable, (signals == SELL).sum(axis=1), 0)
+        confidence_sum += np.where(usable, confidences.sum(axis=1), 0)
+        strategy_count += np.where(usable, signals.shape[1], 0)
+
+    return tally_series(buy_votes, sell_votes, confidence_sum, strategy_count, min_agreeing, confidence_threshold)
+
+
+def tally_series(buy_votes, sell_votes, confidence_sum, strategy_count, min_agreeing=1, confidence_threshold=55):
+    """tally_votes over vote counts per bar. Returns (signals: object array, confidences: int array)."""
+    avg_confidence = np.where(strategy_count > 0, confidence_sum // np.maximum(strategy_count, 1), 50)
+    confident = avg_confidence >= confidence_threshold
+    final = np.select(
+        [(buy_votes >= min_agreeing) & confident & (buy_votes > sell_votes),
+         (sell_votes >= min_agreeing) & confident & (sell_votes > buy_votes)],
+        [BUY, SELL], HOLD
+    ).astype(object)
+    return final, avg_confidence
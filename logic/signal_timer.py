@@ -1,49 +1,103 @@
 # signal_timer.py
 
+import numpy as np
+import pandas as pd
+
+# Candle length in minutes for every kline interval Binance offers
+INTERVAL_MINUTES = {
+    '1s': 1 / 60, '1m': 1, '3m': 3, '5m': 5, '15m': 15, '30m': 30,
+    '1h': 60, '2h': 120, '4h': 240, '6h': 360, '8h': 480, '12h': 720,
+    '1d': 1440, '3d': 4320, '1w': 10080, '1M': 43200
+}
+
+# Base signal validity per interval, in minutes
+BASE_DURATION_MINUTES = {
+    '1s': 1, '1m': 15, '3m': 20, '5m': 30, '15m': 60, '30m': 90,
+    '1h': 120, '2h': 180, '4h': 240, '6h': 360, '8h': 480, '12h': 720,
+    '1d': 1440, '3d': 4320, '1w': 10080, '1M': 43200
+}
+DEFAULT_BASE_DURATION = 60  # fallback for unknown intervals
+MIN_DURATION_MINUTES = 1  # covers at least one candle of every interval, 1s included
+
+# Multiplier adjustments, anything not listed adds 0
+TREND_ADJUSTMENT = {"uptrend": 0.25, "downtrend": 0.25, "sideways": -0.2}
+SENTIMENT_ADJUSTMENT = {  # (sentiment, signal)
+    ("bullish", "BUY"): 0.15, ("bearish", "SELL"): 0.15,
+    ("bullish", "SELL"): -0.1, ("bearish", "BUY"): -0.1
+}
+VOLATILITY_ADJUSTMENT = {"low": 0.1, "high": -0.15}
+
+
+def _confidence_adjustment(confidence):
+    # Stronger signals can run longer
+    if confidence >= 80:
+        return 0.25
+    elif confidence <= 55:
+        return -0.15
+    return 0.0
+
+
 def estimate_signal_duration(signal_type, confidence, trend, sentiment, volatility, timeframe):
     """
     Estimate signal duration intelligently based on real-time contextual inputs.
 
     Returns duration in minutes.
     """
-    base_duration = {
-        '1m': 15, '5m': 30, '15m': 60,
-        '1h': 120, '4h': 240,
-        '1d': 1440
-    }.get(timeframe, 60)  # fallback = 60 mins
+    base_duration = BASE_DURATION_MINUTES.get(timeframe, DEFAULT_BASE_DURATION)
 
     multiplier = 1.0
-
-    # Trend strength impact
-    if trend == "uptrend" or trend == "downtrend":
-        multiplier += 0.25
-    elif trend == "sideways":
-        multiplier -= 0.2
-
-    # Sentiment impact
-    if sentiment == "bullish" and signal_type == "BUY":
-        multiplier += 0.15
-    elif sentiment == "bearish" and signal_type == "SELL":
-        multiplier += 0.15
-    elif sentiment == "bullish" and signal_type == "SELL":
-        multiplier -= 0.1
-    elif sentiment == "bearish" and signal_type == "BUY":
-        multiplier -= 0.1
-
-    # Volatility impact
-    if volatility == "low":
-        multiplier += 0.1
-    elif volatility == "high":
-        multiplier -= 0.15
-
-    # Confidence adjustment (stronger signals can run longer)
-    if confidence >= 80:
-        multiplier += 0.25
-    elif confidence <= 55:
-        multiplier -= 0.15
+    multiplier += TREND_ADJUSTMENT.get(trend, 0.0)
+    multiplier += SENTIMENT_ADJUSTMENT.get((sentiment, signal_type), 0.0)
+    multiplier += VOLATILITY_ADJUSTMENT.get(volatility, 0.0)
+    multiplier += _confidence_adjustment(confidence)
 
     # Clamp multiplier between 0.6x and 1.6x
     multiplier = max(0.6, min(multiplier, 1.6))
 
-    final_duration = int(base_duration * multiplier)
+    final_duration = max(int(base_duration * multiplier), MIN_DURATION_MINUTES)
     return final_duration
+
+
+def _category_codes(values, categories):
+    # Unknown labels get code -1, which indexes the trailing "other" slot of a table
+    return pd.Index(categories).get_indexer(np.asarray(values, dtype=object).ravel())
+
+
+def estimate_signal_durations(signal_types, confidences, trends, sentiments, volatilities, timeframe):
+    """
+    Vectorized estimate_signal_duration for a whole backtest.
+
+    All arguments are equal-length arrays (timeframe may also be a single interval).
+    Returns an int array of durations in minutes, identical to calling
+    estimate_signal_duration element by element.
+    """
+    confidences = np.asarray(confidences, dtype=float)
+
+    trend_keys = list(TREND_ADJUSTMENT)
+    trend_table = np.array([TREND_ADJUSTMENT[k] for k in trend_keys] + [0.0])
+
+    sentiment_keys = sorted({k[0] for k in SENTIMENT_ADJUSTMENT})
+    signal_keys = sorted({k[1] for k in SENTIMENT_ADJUSTMENT})
+    sentiment_table = np.zeros((len(sentiment_keys) + 1, len(signal_keys) + 1))
+    for (sentiment, signal), adjustment in SENTIMENT_ADJUSTMENT.items():
+        sentiment_table[sentiment_keys.index(sentiment), signal_keys.index(signal)] = adjustment
+
+    volatility_keys = list(VOLATILITY_ADJUSTMENT)
+    volatility_table = np.array([VOLATILITY_ADJUSTMENT[k] for k in volatility_keys] + [0.0])
+
+    interval_keys = list(BASE_DURATION_MINUTES)
+    base_table = np.array([BASE_DURATION_MINUTES[k] for k in interval_keys] + [DEFAULT_BASE_DURATION])
+    timeframes = np.broadcast_to(np.asarray(timeframe, dtype=object), confidences.shape)
+
+    # Same additions, in the same order, as the scalar version
+    multiplier = np.ones(confidences.shape)
+    multiplier += trend_table[_category_codes(trends, trend_keys)]
+    multiplier += sentiment_table[_category_codes(sentiments, sentiment_keys),
+                                  _category_codes(signal_types, signal_keys)]
+    multiplier += volatility_table[_category_codes(volatilities, volatility_keys)]
+    multiplier += np.select([confidences >= 80, confidences <= 55], [0.25, -0.15], 0.0)
+
+    multiplier = np.clip(multiplier, 0.6, 1.6)
+
+    base_duration = base_table[_category_codes(timeframes, interval_keys)]
+    return np.maximum((base_duration * multiplier).astype(int), MIN_DURATION_MINUTES)
@@ -1,7 +1,15 @@
+import argparse
+import contextlib
 import datetime
+import json
+import math
+import sys
+import time
 
+import numpy as np
 import pandas as pd
-from data.fetch_price import get_price_data
+from data.fetch_price import get_adjacent_timeframes
+from data.async_fetch import get_price_data_many
 from data.fetch_sentiment import get_sentiment_score
 from indicators.macd import calculate_macd
 from indicators.rsi import calculate_rsi
@@ -10,54 +18,69 @@ from indicators.volatility import calculate_volatility
 from logic.signal_engine import generate_live_signal
 #from logic.signal_engine import generate_backtest_signal as generate_live_signal
 from logic.risk_manager import calculate_risk_management
-from logic.risk_manager import calculate_atr
 from logic.signal_timer import estimate_signal_duration
-from backtesting.backtester import run_backtest
-from backtesting.evaluator import evaluate_backtest_results
-from data.fetch_news_utils import fetch_rss_headlines
-from reports.visualization import plot_backtest_results, plot_price_with_indicators
-from reports.generate_pdf import create_pdf_report
+# The backtester, matplotlib (charts) and fpdf are imported by the stages that use
+# them, so short runs with stages switched off do not pay for them at start-up
+from utils.profiler import enable_profiling, finish_profiling, span
+from config import PROFILE, PROFILE_PSTATS
 import os
 
-os.makedirs("reports/plots", exist_ok=True)
-
-def get_adjacent_timeframes(interval):
-    tf_map = {
-        "1m": (None, "5m"),
-        "5m": ("1m", "15m"),
-        "15m": ("5m", "1h"),
-        "30m": ("15m", "2h"),
-        "1h": ("15m", "4h"),
-        "2h": ("30m", "6h"),
-        "4h": ("1h", "1d"),
-        "1d": ("4h", "3d"),
-        "1w": ("1d", "1M")
-    }
-    return tf_map.get(interval, (None, None))
+# Charts written by reports/visualization.py that the PDF embeds, in report order
+CHART_FILES = ["price_chart_price.png", "price_chart_pnl.png", "price_chart_cumulative.png", "backtest_chart.png"]
 
 def run_trading_pipeline():
     print("-----Welcome to TradingSignals!-----")
     symbol = input("Enter the trading pair (e.g., BTCUSDT): ").upper()
     interval = input("Enter the timeframe (e.g., 1m, 5m, 1h, 4h, 1d): ").lower()
+    return run_pipeline(symbol, interval)
+
+def run_pipeline(symbol, interval, output_dir="reports", pdf=True, charts=True, backtest=True, plots_dir=None):
+    """
+    Runs the pipeline for one symbol / interval without prompting.
+
+    Parameters:
+    - symbol (str), interval (str): e.g. "BTCUSDT", "1h"
+    - output_dir (str): charts go to <output_dir>/plots, PDFs to <output_dir>/generated_pdfs
+    - pdf, charts, backtest (bool): stage toggles; skipped stages cost nothing
+    - plots_dir (str): chart directory override (the batch CLI uses one per symbol / interval)
+
+    Returns:
+    - dict with the signal, indicators, risk, timing, backtest metrics and output paths
+    """
+    if PROFILE:
+        enable_profiling(PROFILE_PSTATS)
+    try:
+        return _run_pipeline(symbol, interval, output_dir, pdf, charts, backtest, plots_dir)
+    finally:
+        # A failed pair still writes its profile and leaves no profiler running in the worker
+        if PROFILE:
+            finish_profiling()
+
+def _run_pipeline(symbol, interval, output_dir, pdf, charts, backtest, plots_dir):
+    started = time.perf_counter()
+    plots_dir = plots_dir or os.path.join(output_dir, "plots")
 
     print(f"\nProcessing {symbol} at interval {interval}...")
 
-    lower_tf, higher_tf = get_adjacent_timeframes(interval)
-    price_data = {interval: get_price_data(symbol, interval)}
+    with span("fetch"):
+        lower_tf, higher_tf = get_adjacent_timeframes(interval)
+        # All timeframes are fetched concurrently
+        frames = get_price_data_many([(symbol, tf) for tf in (interval, lower_tf, higher_tf) if tf])
+        price_data = {interval: frames[(symbol, interval)]}
 
-    if lower_tf:
-        print(f"Fetching lower timeframe ({lower_tf})...")
-        lower_df = get_price_data(symbol, lower_tf)
-        price_data[lower_tf] = lower_df
-    else:
-        lower_df = None
+        if lower_tf:
+            print(f"Fetching lower timeframe ({lower_tf})...")
+            lower_df = frames[(symbol, lower_tf)]
+            price_data[lower_tf] = lower_df
+        else:
+            lower_df = None
 
-    if higher_tf:
-        print(f"Fetching higher timeframe ({higher_tf})...")
-        higher_df = get_price_data(symbol, higher_tf)
-        price_data[higher_tf] = higher_df
-    else:
-        higher_df = None
+        if higher_tf:
+            print(f"Fetching higher timeframe ({higher_tf})...")
+            higher_df = frames[(symbol, higher_tf)]
+            price_data[higher_tf] = higher_df
+        else:
+            higher_df = None
 
     print("\n📊 Preview of Multi-Timeframe Price Data:")
     for tf, df in price_data.items():
@@ -65,19 +88,23 @@ def run_trading_pipeline():
         print(df.tail(5))
 
     price_df = price_data[interval]
+    if price_df is None or price_df.empty:
+        raise ValueError(f"No {interval} candles returned for {symbol}")
 
     # Step 2: Sentiment
-    sentiment_score, scored_headlines = get_sentiment_score(symbol, print_news=True)
+    with span("sentiment"):
+        sentiment_score, scored_headlines = get_sentiment_score(symbol, print_news=True)
     print(f"\nSentiment Score: {sentiment_score}")
 
     # Convert string label to numeric score (needed for signal duration logic)
     sentiment_float = 1.0 if sentiment_score == "bullish" else -1.0 if sentiment_score == "bearish" else 0.0
 
     # Step 3: Indicators
-    macd_signal = calculate_macd(price_df)
-    rsi_val, rsi_signal = calculate_rsi(price_df)
-    bb_signal = calculate_bollinger_bands(price_df)
-    volatility = calculate_volatility(price_df)
+    with span("indicators"):
+        macd_signal = calculate_macd(price_df)
+        rsi_val, rsi_signal = calculate_rsi(price_df)
+        bb_signal = calculate_bollinger_bands(price_df)
+        volatility = calculate_volatility(price_df)
 
     print(f"\nMACD Signal: {macd_signal}")
     print(f"RSI Signal: {rsi_signal}")
@@ -85,7 +112,8 @@ def run_trading_pipeline():
     print(f"Volatility Level: {volatility}")
 
     # Step 4: Signal
-    final_signal, confidence = generate_live_signal(price_data, sentiment_score, symbol)
+    with span("signal"):
+        final_signal, confidence = generate_live_signal(price_data, sentiment_score, symbol)
 
     print(f"\n✅ FINAL SIGNAL: {final_signal} ({confidence}% confidence)\n")
 
@@ -104,7 +132,8 @@ def run_trading_pipeline():
         "trend_strength": 0.6
     }
 
-    risk_result = calculate_risk_management(price_df, final_signal, volatility, indicators, confidence)
+    with span("risk"):
+        risk_result = calculate_risk_management(price_df, final_signal, volatility, indicators, confidence)
 
     print(f"\nRisk Management:")
     print(f"Stop Loss: {risk_result['suggested_stop_loss']}")
@@ -114,14 +143,15 @@ def run_trading_pipeline():
     print(f"Expected Profit %: {risk_result['expected_profit_percent']}%")
 
     # Step 6: Signal Duration (Real-Time)
-    duration_minutes = estimate_signal_duration(
-        signal_type=final_signal,
-        confidence=confidence,
-        trend="uptrend" if macd_signal == "bullish" else "downtrend" if macd_signal == "bearish" else "sideways",
-        sentiment="bullish" if sentiment_float > 0.3 else "bearish" if sentiment_float < -0.3 else "neutral",
-        volatility=volatility,
-        timeframe=interval
-    )
+    with span("duration"):
+        duration_minutes = estimate_signal_duration(
+            signal_type=final_signal,
+            confidence=confidence,
+            trend="uptrend" if macd_signal == "bullish" else "downtrend" if macd_signal == "bearish" else "sideways",
+            sentiment="bullish" if sentiment_float > 0.3 else "bearish" if sentiment_float < -0.3 else "neutral",
+            volatility=volatility,
+            timeframe=interval
+        )
 
     start = price_df.index[-1]
     end = start + datetime.timedelta(minutes=duration_minutes)
@@ -137,27 +167,38 @@ def run_trading_pipeline():
     if higher_tf and higher_df is not None:
         price_data[higher_tf] = higher_df
 
-    try:
-        backtest_df = run_backtest(price_df, symbol, interval, scored_headlines, price_data)
-
-        if backtest_df.empty:
-            print("\n⚠️ No trades were triggered during backtest. Please review signal logic or data coverage.")
-            summary = {}
-        else:
-            print(f"\n✅ Backtest completed with {len(backtest_df)} trades.")
-            summary = evaluate_backtest_results(backtest_df)
-
-    except Exception as e:
-        print(f"\n❌ Backtest Failed: {e}")
-        backtest_df = pd.DataFrame()
-        summary = {}
-
-
+    backtest_df, summary, backtest_metrics = pd.DataFrame(), {}, {}
+    if backtest:
+        from backtesting.evaluator import evaluate_backtest_results
+        from backtesting.result_cache import cached_backtest
+        with span("backtest"):
+            try:
+                backtest_df, metrics = cached_backtest(price_df, symbol, interval, price_data)
+
+                if backtest_df.empty:
+                    print("\n⚠️ No trades were triggered during backtest. Please review signal logic or data coverage.")
+                else:
+                    print(f"\n✅ Backtest completed with {len(backtest_df)} trades.")
+                    summary = evaluate_backtest_results(backtest_df)
+                    backtest_metrics = metrics.scalars()
+
+            except Exception as e:
+                print(f"\n❌ Backtest Failed: {e}")
+                backtest_df = pd.DataFrame()
+    else:
+        print("\n⏭️ Backtest skipped.")
 
     # Step 8: Visualization
-    backtest_chart = "reports/plots/backtest_chart.png"
-    plot_backtest_results(backtest_df, backtest_chart)
-    plot_price_with_indicators(price_df, backtest_df, symbol, "reports/plots/price_chart.png")
+    # The PDF embeds the charts made by this run only, never older ones left in plots_dir
+    chart_paths = []
+    if charts:
+        os.makedirs(plots_dir, exist_ok=True)
+        from reports.visualization import plot_backtest_results, plot_price_with_indicators
+        with span("charts"):
+            backtest_chart = plot_backtest_results(backtest_df, os.path.join(plots_dir, "backtest_chart.png"))
+            written = plot_price_with_indicators(price_df, backtest_df, symbol, os.path.join(plots_dir, "price_chart.png"))
+        written = set(written) | {backtest_chart}
+        chart_paths = [path for path in (os.path.join(plots_dir, name) for name in CHART_FILES) if path in written]
     
     # Step 9: Generate PDF Report
     signal_info = {
@@ -187,11 +228,172 @@ def run_trading_pipeline():
         "duration": signal_duration
     }
 
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    pdf_path = f"reports/generated_pdfs/{symbol}_{interval}_{timestamp}_TradingSignals.pdf"
-    create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, summary, pdf_path, backtest_df, scored_headlines)
+    pdf_path = None
+    if pdf:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        pdf_path = os.path.join(output_dir, "generated_pdfs", f"{symbol}_{interval}_{timestamp}_TradingSignals.pdf")
+        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+        from reports.generate_pdf import create_pdf_report
+        with span("pdf"):
+            create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, summary, pdf_path, backtest_df,
+                              scored_headlines, plots_dir=plots_dir, charts=chart_paths)
+
+        print(f"\n✅ PDF Report saved to: {pdf_path}")
+
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "signal": final_signal,
+        "confidence": confidence,
+        "sentiment": sentiment_score,
+        "indicators": signal_info["indicators"],
+        "risk": risk_info,
+        "valid_from": start,
+        "valid_to": end,
+        "duration_minutes": duration_minutes,
+        "trades": len(backtest_df),
+        "backtest": backtest_metrics,
+        "charts": chart_paths,
+        "pdf": pdf_path,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
 
-    print(f"\n✅ PDF Report saved to: {pdf_path}")
+# === BATCH CLI ===
+
+def _json_default(value):
+    if isinstance(value, (pd.Timestamp, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+def _json_safe(value):
+    # Strict JSON has no NaN / Infinity: non-finite metrics go out as null
+    if isinstance(value, dict):
+        return {key: _json_safe(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def _run_job(job):
+    symbol, interval, options, quiet = job
+    # With --json, stdout carries only the JSON document
+    with contextlib.redirect_stdout(sys.stderr if quiet else sys.stdout):
+        try:
+            return run_pipeline(symbol, interval, **options)
+        except Exception as e:
+            print(f"\n❌ {symbol} {interval} failed: {e}")
+            return {"symbol": symbol, "interval": interval, "error": str(e)}
+
+def run_batch(symbols, intervals, jobs=1, quiet=False, output_dir="reports", **options):
+    """
+    run_pipeline for every symbol / interval, on `jobs` worker processes. A failing
+    pair is reported in its result and does not stop the others.
+
+    Returns:
+    - list of run_pipeline results (or {"symbol", "interval", "error"}), in input order
+    """
+    units = [
+        (symbol, interval, dict(options, output_dir=output_dir,
+                                plots_dir=os.path.join(output_dir, "plots", f"{symbol}_{interval}")), quiet)
+        for symbol in symbols for interval in intervals
+    ]
+    if jobs > 1 and len(units) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(_run_job, units))
+    return [_run_job(unit) for unit in units]
+
+def run_signal_scan(symbols, intervals, jobs=1):
+    """
+    The final signal of every symbol / interval, without risk levels, backtest, charts
+    or PDF. All candles are fetched concurrently and the strategies of every
+    (symbol, timeframe) run on `jobs` processes (logic/parallel_signals.py).
+
+    Returns:
+    - list of {"symbol", "interval", "signal", "confidence", "sentiment"}, in input order
+    """
+    from logic.parallel_signals import generate_signals_parallel
+
+    timeframes = {interval: [tf for tf in (interval, *get_adjacent_timeframes(interval)) if tf] for interval in intervals}
+    frames = get_price_data_many(list(dict.fromkeys(
+        (symbol, tf) for symbol in symbols for interval in intervals for tf in timeframes[interval]
+    )))
+    sentiments = {symbol: get_sentiment_score(symbol, print_news=False)[0] for symbol in symbols}
+
+    from concurrent.futures import ProcessPoolExecutor
+    # One pool for every interval
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        signals = {
+            interval: generate_signals_parallel(
+                {symbol: {tf: frames[(symbol, tf)] for tf in timeframes[interval]} for symbol in symbols},
+                sentiments, max_workers=jobs, executor=executor
+            )
+            for interval in intervals
+        }
+    return [
+        {"symbol": symbol, "interval": interval, "signal": signals[interval][symbol][0],
+         "confidence": signals[interval][symbol][1], "sentiment": sentiments[symbol]}
+        for symbol in symbols for interval in intervals
+    ]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the TradingSignals pipeline (interactive without arguments).")
+    parser.add_argument("--symbols", nargs="+", default=[], help="trading pairs, e.g. BTCUSDT ETHUSDT")
+    parser.add_argument("--top", type=int, help="also run the top N coins by market cap (as <COIN>USDT)")
+    parser.add_argument("--intervals", nargs="+", default=["1h"], help="timeframes, e.g. 15m 1h 4h")
+    parser.add_argument("--output-dir", default="reports", help="directory for plots/ and generated_pdfs/")
+    parser.add_argument("--no-pdf", action="store_true", help="skip the PDF report")
+    parser.add_argument("--no-charts", action="store_true", help="skip the charts")
+    parser.add_argument("--no-backtest", action="store_true", help="skip the backtest")
+    parser.add_argument("--jobs", type=int, default=1, help="symbols / intervals run in parallel (processes)")
+    parser.add_argument("--signals-only", action="store_true",
+                        help="only compute the final signals (no risk, backtest, charts or PDF)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON (logs go to stderr)")
+    args = parser.parse_args(argv)
+
+    args.symbols = [symbol.upper() for symbol in args.symbols]
+    if args.top:
+        from config import build_symbol_name_map
+        args.symbols += [coin + "USDT" for coin in build_symbol_name_map(args.top) if coin != "USDT"]
+    args.symbols = list(dict.fromkeys(args.symbols))
+    if not args.symbols:
+        parser.error("give --symbols or --top N")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.signals_only:
+        with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+            results = run_signal_scan(args.symbols, args.intervals, jobs=args.jobs)
+        if args.json:
+            print(json.dumps(results, indent=2, allow_nan=False))
+        else:
+            print("\n📋 Signals:")
+            for result in results:
+                print(f"  {result['symbol']} {result['interval']}: {result['signal']} ({result['confidence']}%), "
+                      f"sentiment {result['sentiment']}")
+        return 0
+
+    results = run_batch(
+        args.symbols, args.intervals, jobs=args.jobs, quiet=args.json, output_dir=args.output_dir,
+        pdf=not args.no_pdf, charts=not args.no_charts, backtest=not args.no_backtest,
+    )
+    if args.json:
+        print(json.dumps(_json_safe(results), indent=2, default=_json_default, allow_nan=False))
+    else:
+        print("\n📋 Batch summary:")
+        for result in results:
+            if "error" in result:
+                print(f"  ❌ {result['symbol']} {result['interval']}: {result['error']}")
+            else:
+                print(f"  {result['symbol']} {result['interval']}: {result['signal']} ({result['confidence']}%), "
+                      f"{result['trades']} trades, {result['seconds']} s" + (f" → {result['pdf']}" if result["pdf"] else ""))
+    return 1 if any("error" in result for result in results) else 0
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
     run_trading_pipeline()
\ No newline at end of file
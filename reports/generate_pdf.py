@@ -1,7 +1,6 @@
 from fpdf import FPDF
 import re
 import pandas as pd
-import requests
 import os
 from urllib.parse import urlparse
 import tempfile
@@ -9,6 +8,9 @@ import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 from dateutil import parser
 import matplotlib.dates as mdates
+from config import DATA_SOURCE
+from utils.profiler import profiled, span
+from utils.transport import http_get, upstream_get
         
 def remove_unicode(text):
     return re.sub(r'[^\x00-\x7F]+', '', text)
@@ -39,6 +41,10 @@ class PDFReport(FPDF):
         Returns:
         - path to temporary PNG file or None if failed
         """
+        # No icons offline (synthetic data source)
+        if DATA_SOURCE == "synthetic":
+            return None
+
         try:
             # Normalize symbol
             symbol = symbol.upper().strip()
@@ -126,16 +132,14 @@ class PDFReport(FPDF):
             coin_id = symbol_map.get(symbol, symbol.lower())
             
             # CoinGecko API endpoint for coin icons
-            url = f"https://api.coingecko.com/api/v3/coins/{coin_id}"
-            
-            response = requests.get(url, timeout=5)
+            response = upstream_get("coingecko", f"/coins/{coin_id}", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 icon_url = data.get('image', {}).get('small')  # 32x32 size
                 
                 if icon_url:
                     # Download the icon
-                    icon_response = requests.get(icon_url, timeout=5)
+                    icon_response = http_get(icon_url, timeout=5)
                     if icon_response.status_code == 200:
                         # Create temporary file
                         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
@@ -212,6 +216,7 @@ class PDFReport(FPDF):
         self.set_text_color(30, 30, 30)
         self.ln(2)
 
+    @profiled("pdf.add_image")
     def add_image(self, path, w=120, h=100, size_type='default'):
         """
         Add image with flexible sizing options
@@ -565,7 +570,14 @@ class PDFReport(FPDF):
         self.add_table_with_coin_icons(dataframe, columns, apply_row_coloring)
 
 
-def create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, summary, pdf_path, backtest_df, headlines):
+def create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, summary, pdf_path, backtest_df, headlines,
+                      plots_dir="reports/plots", charts=None):
+    """
+    Builds the PDF report. Charts made for the report are written to `plots_dir`.
+    `charts` lists the price / backtest chart files of reports/visualization.py to
+    embed (e.g. the ones made in this run, [] for none); by default they are read
+    from `plots_dir`. Missing files are left out.
+    """
     pdf = PDFReport()
     pdf.add_page()
 
@@ -857,10 +869,11 @@ def create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, sum
                 plt.tight_layout()
                 
                 # Save with unique name for this section
-                os.makedirs("reports/plots", exist_ok=True)
-                professional_chart_path = "reports/plots/professional_trading_chart.png"
-                plt.savefig(professional_chart_path, dpi=150, bbox_inches='tight', 
-                           facecolor='#1a1a1a', edgecolor='none')
+                os.makedirs(plots_dir, exist_ok=True)
+                professional_chart_path = os.path.join(plots_dir, "professional_trading_chart.png")
+                with span("chart.professional_trading"):
+                    plt.savefig(professional_chart_path, dpi=150, bbox_inches='tight',
+                                facecolor='#1a1a1a', edgecolor='none')
                 plt.close()
                 
                 # Reset matplotlib style to default for other plots
@@ -925,8 +938,10 @@ def create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, sum
             plt.xticks([])
             plt.tight_layout()
 
-            fallback_path = "reports/plots/signal_risk_setup.png"
-            plt.savefig(fallback_path)
+            os.makedirs(plots_dir, exist_ok=True)
+            fallback_path = os.path.join(plots_dir, "signal_risk_setup.png")
+            with span("chart.signal_risk_setup"):
+                plt.savefig(fallback_path)
             plt.close()
 
             pdf.ln(2)
@@ -1294,14 +1309,16 @@ def create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, sum
             plt.tight_layout()
             
             # Save the plot
-            os.makedirs("reports", exist_ok=True)
-            plt.savefig("reports/indicators_summary.png", dpi=150, bbox_inches='tight', facecolor='white')
+            os.makedirs(plots_dir, exist_ok=True)
+            indicators_path = os.path.join(plots_dir, "indicators_summary.png")
+            with span("chart.indicators_summary"):
+                plt.savefig(indicators_path, dpi=150, bbox_inches='tight', facecolor='white')
             plt.close()
 
             # Add to PDF if file exists
-            if os.path.exists("reports/indicators_summary.png"):
+            if os.path.exists(indicators_path):
                 pdf.ln(4)
-                pdf.add_image("reports/indicators_summary.png", size_type='large')
+                pdf.add_image(indicators_path, size_type='large')
                 pdf.ln(5)
 
         except Exception as e:
@@ -1388,9 +1405,10 @@ def create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, sum
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
 
-        os.makedirs("reports/plots", exist_ok=True)
-        img_path = "reports/plots/risk_management_plot.png"
-        plt.savefig(img_path)
+        os.makedirs(plots_dir, exist_ok=True)
+        img_path = os.path.join(plots_dir, "risk_management_plot.png")
+        with span("chart.risk_management"):
+            plt.savefig(img_path)
         plt.close()
 
         pdf.add_image(img_path, size_type="small")
@@ -1449,8 +1467,12 @@ def create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, sum
 
     # 4. Backtest Table with row coloring
     pdf.add_section_title("4. Backtest Table (Last 250 candles)")
-    formatted_df = format_backtest_table(backtest_df)
-    pdf.add_table(formatted_df, list(formatted_df.columns), apply_row_coloring=True)
+    if backtest_df is None or backtest_df.empty:
+        # Skipped, failed or no trades
+        pdf.add_paragraph("No backtest trades to show.")
+    else:
+        formatted_df = format_backtest_table(backtest_df)
+        pdf.add_table(formatted_df, list(formatted_df.columns), apply_row_coloring=True)
 
     # Clarify return % for SELL signals
     pdf.add_paragraph(
@@ -1471,13 +1493,21 @@ def create_pdf_report(symbol, interval, signal_info, risk_info, timing_info, sum
     # 6. Charts - UPDATED WITH LARGER PRICE CHART
     pdf.add_section_title("6. Visualizations")
     
-    pdf.add_image("reports/plots/price_chart_price.png", size_type='large')
-    pdf.add_image("reports/plots/price_chart_pnl.png", size_type='large')
-    pdf.add_image("reports/plots/price_chart_cumulative.png", size_type='large')
-    #pdf.add_image("reports/plots/price_chart_summary.png", size_type='large')
-    
-    # Add the pie chart with SMALL size (keep it compact as requested)
-    pdf.add_image("reports/plots/backtest_chart.png", size_type='default')
+    chart_sizes = {
+        "price_chart_price.png": 'large',
+        "price_chart_pnl.png": 'large',
+        "price_chart_cumulative.png": 'large',
+        #"price_chart_summary.png": 'large',
+        # Add the pie chart with SMALL size (keep it compact as requested)
+        "backtest_chart.png": 'default',
+    }
+    if charts is None:
+        charts = [os.path.join(plots_dir, name) for name in chart_sizes]
+    charts = [(path, chart_sizes.get(os.path.basename(path), 'large')) for path in charts if os.path.exists(path)]
+    if not charts:
+        pdf.add_paragraph("Charts were not generated for this report.")
+    for path, size in charts:
+        pdf.add_image(path, size_type=size)
 
     pdf.output(pdf_path)
 
@@ -4,7 +4,9 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from matplotlib.dates import DateFormatter
+from utils.profiler import profiled
 
+@profiled("chart.price_with_indicators")
 def plot_price_with_indicators(df, backtest_df, symbol, save_path):
     if not isinstance(backtest_df, pd.DataFrame):
         raise ValueError(f"Expected backtest_df to be a DataFrame, but got {type(backtest_df)}")
@@ -199,14 +201,16 @@ def plot_price_with_indicators(df, backtest_df, symbol, save_path):
     print(f"📊 Summary chart saved to: {summary_path}")
 
     print(f"🎯 All 4 charts saved as separate files with prefix: {base_path}")
+    return [price_path, pnl_path, cumulative_path, summary_path]
 
+@profiled("chart.backtest_results")
 def plot_backtest_results(df, save_path):
     if not isinstance(df, pd.DataFrame):
         raise ValueError(f"Expected DataFrame for backtest results, got {type(df)}")
 
     if df.empty or 'result' not in df.columns:
         print("⚠️ No backtest data available for plotting.")
-        return
+        return None
 
     summary = df['result'].value_counts()
     colors = ['green' if label == 'SUCCESS' else 'red' if label == 'FAILURE' else 'gray' for label in summary.index]
@@ -217,4 +221,5 @@ def plot_backtest_results(df, save_path):
     plt.tight_layout()
     plt.savefig(save_path)
     plt.close()
-    print(f"📊 Backtest pie chart saved to: {save_path}")
\ No newline at end of file
+    print(f"📊 Backtest pie chart saved to: {save_path}")
+    return save_path
\ No newline at end of file
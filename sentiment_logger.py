@@ -5,8 +5,13 @@ import pandas as pd
 import os
 from data.fetch_sentiment import get_sentiment_score
 from config import SYMBOL_NAME_MAP
+from utils.metrics import SENTIMENT_LOG_RUNNING, SENTIMENT_LOG_SECONDS, SENTIMENT_ROWS_APPENDED
 
 def log_sentiment():
+    with SENTIMENT_LOG_RUNNING.track_in_progress(), SENTIMENT_LOG_SECONDS.time():
+        _log_sentiment()
+
+def _log_sentiment():
     os.makedirs("data", exist_ok=True)
     FILENAME = "data/sentiment_history.csv"
     symbols = [sym + "USDT" for sym in list(SYMBOL_NAME_MAP.keys())][:20]  # Top 20 coins
@@ -39,6 +44,7 @@ def log_sentiment():
             df.to_csv(FILENAME, index=False)
         else:
             df.to_csv(FILENAME, mode='a', header=False, index=False)
+        SENTIMENT_ROWS_APPENDED.inc(len(entries))
 
         print(f"✅ Logged {len(entries)} sentiment records.")
     else:
@@ -1,9 +1,32 @@
 # server.py
-from flask import Flask, send_file
+from flask import Flask, Response, g, request, send_file
 import os
+import threading
+import time
+
+from utils.metrics import PROCESS_MAX_RSS, PROCESS_THREADS, SERVER_IN_FLIGHT, SERVER_REQUEST_SECONDS, render
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 app = Flask(__name__)
 
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    SERVER_IN_FLIGHT.inc()
+
+@app.teardown_request
+def record_request_latency(exc=None):
+    if "request_start" not in g:
+        return
+    SERVER_IN_FLIGHT.dec()
+    # Route pattern rather than the raw path, so label values stay bounded
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    SERVER_REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, route=route)
+
 @app.route('/')
 def home():
     return "Sentiment Logger is Running"
@@ -25,6 +48,14 @@ def log_and_return():
     Thread(target=background_task).start()
     return "Sentiment logging started.", 202
 
+@app.route('/metrics')
+def metrics():
+    PROCESS_THREADS.set(threading.active_count())
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux
+        PROCESS_MAX_RSS.set(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
 
 def start():
     print("Starting Flask server...")
@@ -1,13 +1,17 @@
 #strategies\bollinger_squeezer_strategy.py
 
 from indicators.bollinger import calculate_bollinger_bands
+from strategies.params import resolve_params
+from utils.profiler import profiled
 
-def bollinger_squeeze_signal(df):
+@profiled("strategy.bollinger_squeeze")
+def bollinger_squeeze_signal(df, params=None):
+    params = resolve_params(params)
     if len(df) < 20:
         return {"strategy": "Bollinger Squeeze", "signal": "HOLD", "confidence": 50}
 
     try:
-        bb_signal = calculate_bollinger_bands(df)
+        bb_signal = calculate_bollinger_bands(df, window=params["bb_window"], num_std_dev=params["bb_num_std_dev"])
         price = df["close"].iloc[-1]
     except Exception:
         return {"strategy": "Bollinger Squeeze", "signal": "HOLD", "confidence": 50}
@@ -1,8 +1,12 @@
 #strategies\macd_ema_strategy.py
 from indicators.macd import calculate_macd
 from indicators.trend import calculate_ema
+from strategies.params import resolve_params
+from utils.profiler import profiled
 
-def macd_ema_signal(df):
+@profiled("strategy.macd_ema")
+def macd_ema_signal(df, params=None):
+    params = resolve_params(params)
     df = df.copy()
 
     if len(df) < 50:
@@ -16,7 +20,7 @@ def macd_ema_signal(df):
     try:
         ema_50 = df["ema_50"].iloc[-1]
         price = df["close"].iloc[-1]
-        macd_signal = calculate_macd(df)
+        macd_signal = calculate_macd(df, threshold=params["macd_threshold"])
     except Exception:
         return {"strategy": "MACD+EMA", "signal": "HOLD", "confidence": 50}
 
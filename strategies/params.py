@@ -0,0 +1,17 @@
+# strategies/params.py
+
+# Tunable strategy thresholds (the values the strategies were written with)
+DEFAULT_STRATEGY_PARAMS = {
+    "macd_threshold": 0.3,
+    "rsi_overbought": 75,
+    "rsi_oversold": 25,
+    "bb_window": 20,
+    "bb_num_std_dev": 2,
+}
+
+def resolve_params(params=None):
+    """Defaults overlaid with the given overrides."""
+    resolved = dict(DEFAULT_STRATEGY_PARAMS)
+    if params:
+        resolved.update(params)
+    return resolved
@@ -2,13 +2,17 @@
 
 from indicators.rsi import calculate_rsi
 from indicators.volatility import calculate_volatility
+from strategies.params import resolve_params
+from utils.profiler import profiled
 
-def rsi_volatility_signal(df):
+@profiled("strategy.rsi_volatility")
+def rsi_volatility_signal(df, params=None):
+    params = resolve_params(params)
     if len(df) < 14:
         return {"strategy": "RSI+Volatility", "signal": "HOLD", "confidence": 50}
 
     try:
-        rsi_val, rsi_signal = calculate_rsi(df)
+        rsi_val, rsi_signal = calculate_rsi(df, overbought=params["rsi_overbought"], oversold=params["rsi_oversold"])
         volatility = calculate_volatility(df)
         price = df["close"].iloc[-1]
     except Exception:
@@ -1,7 +1,9 @@
 #strategies\trend_sentiment_strategy.py
 
 from indicators.trend import identify_trend
+from utils.profiler import profiled
 
+@profiled("strategy.trend_sentiment")
 def trend_sentiment_signal(df, sentiment):
     trend = identify_trend(df)
 
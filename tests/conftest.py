@@ -0,0 +1,9 @@
+# tests/conftest.py
+#
+# Tests run offline on the synthetic data source (data/synthetic.py).
+
+import os
+import sys
+
+os.environ.setdefault("TRADINGSIGNALS_DATA_SOURCE", "synthetic")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
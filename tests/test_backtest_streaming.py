@@ -0,0 +1,44 @@
+# tests/test_backtest_streaming.py
+
+import pandas as pd
+import pytest
+
+from backtesting.backtester import iter_backtest, run_backtest, write_backtest_results
+from backtesting.replay import synthetic_candles
+
+PRICE_DATA = synthetic_candles("BTCUSDT", "15m", 3000, seed=2)
+PRICE_DF = PRICE_DATA["15m"]
+DATES = ["timestamp", "exit_time", "Time"]
+
+
+def chunks():
+    return iter_backtest(PRICE_DF, "BTCUSDT", "15m", PRICE_DATA, chunk_bars=250)
+
+
+def test_chunks_add_up_to_run_backtest():
+    expected = run_backtest(PRICE_DF, "BTCUSDT", "15m", [], PRICE_DATA, verbose=False)
+    parts = list(chunks())
+    assert len(parts) > 1
+    pd.testing.assert_frame_equal(pd.concat(parts, ignore_index=True), expected)
+
+    streamed = []
+    count = run_backtest(PRICE_DF, "BTCUSDT", "15m", [], PRICE_DATA, verbose=False, on_trades=streamed.append)
+    assert count == len(expected)
+    pd.testing.assert_frame_equal(pd.concat(streamed, ignore_index=True), expected)
+
+
+def test_csv_round_trip(tmp_path):
+    expected = run_backtest(PRICE_DF, "BTCUSDT", "15m", [], PRICE_DATA, verbose=False)
+    path = str(tmp_path / "trades.csv")
+    assert write_backtest_results(chunks(), path) == len(expected)
+    written = pd.read_csv(path, parse_dates=DATES)
+    assert list(written.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(written, expected, check_dtype=False)
+
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    expected = run_backtest(PRICE_DF, "BTCUSDT", "15m", [], PRICE_DATA, verbose=False)
+    path = str(tmp_path / "trades.parquet")
+    assert write_backtest_results(chunks(), path) == len(expected)
+    pd.testing.assert_frame_equal(pd.read_parquet(path), expected, check_dtype=False)
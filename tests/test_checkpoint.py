@@ -0,0 +1,63 @@
+# tests/test_checkpoint.py
+
+import os
+
+import pandas as pd
+import pytest
+
+from backtesting import checkpoint
+from backtesting.backtester import run_backtest
+from backtesting.checkpoint import load_checkpoint, run_backtest_resumable, save_checkpoint
+from backtesting.replay import synthetic_candles
+
+
+class Preempted(Exception):
+    pass
+
+
+def test_resumed_run_matches_uninterrupted(tmp_path, monkeypatch):
+    price_data = synthetic_candles("BTCUSDT", "15m", 3000, seed=2)
+    price_df = price_data["15m"]
+    expected = run_backtest(price_df, "BTCUSDT", "15m", [], price_data, verbose=False)
+    path = str(tmp_path / "run.ckpt")
+
+    saves = []
+
+    def save_then_stop(*args):
+        save_checkpoint(*args)
+        saves.append(args)
+        if len(saves) == 3:
+            raise Preempted
+
+    monkeypatch.setattr(checkpoint, "save_checkpoint", save_then_stop)
+    with pytest.raises(Preempted):
+        run_backtest_resumable(price_df, "BTCUSDT", "15m", price_data, path, chunk_bars=200)
+    assert os.path.exists(path)
+    stopped_at = saves[-1][2]["state"]["cursor"]
+    assert 20 < stopped_at < len(price_df) - 5
+
+    monkeypatch.undo()
+    resumed = run_backtest_resumable(price_df, "BTCUSDT", "15m", price_data, path, chunk_bars=200)
+    pd.testing.assert_frame_equal(resumed, expected)
+    assert not os.path.exists(path)
+
+
+def test_checkpoint_of_other_inputs_is_ignored(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    save_checkpoint(path, "fingerprint-a", {"state": {"cursor": 500}})
+    assert load_checkpoint(path, "fingerprint-a") == {"state": {"cursor": 500}}
+    assert load_checkpoint(path, "fingerprint-b") is None
+
+
+def test_failed_write_keeps_the_previous_checkpoint(tmp_path, monkeypatch):
+    path = str(tmp_path / "run.ckpt")
+    save_checkpoint(path, "fingerprint", {"state": {"cursor": 500}})
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(checkpoint.pickle, "dump", crash)
+    with pytest.raises(OSError):
+        save_checkpoint(path, "fingerprint", {"state": {"cursor": 900}})
+    monkeypatch.undo()
+    assert load_checkpoint(path, "fingerprint") == {"state": {"cursor": 500}}
@@ -0,0 +1,58 @@
+# tests/test_evaluator.py
+
+import json
+
+import pandas as pd
+import pytest
+
+from backtesting.evaluator import MAX_PROFIT_FACTOR, calculate_backtest_metrics
+
+
+def trades(returns, signals=None, reasons=None):
+    # One trade per hour, each in the market for 30 minutes
+    timestamps = pd.date_range("2024-06-01", periods=len(returns), freq="h")
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "exit_time": timestamps + pd.Timedelta(minutes=30),
+        "signal": signals or ["BUY"] * len(returns),
+        "exit_reason": reasons or ["TIME"] * len(returns),
+        "result": ["SUCCESS" if r > 0 else "FAILURE" for r in returns],
+        "net_return_percent": returns,
+    })
+
+
+def test_mixed_trades():
+    metrics = calculate_backtest_metrics(trades([10.0, -5.0, 20.0], ["BUY", "SELL", "BUY"], ["TP", "SL", "TIME"]))
+    assert metrics.total_signals == 3 and metrics.success_rate == 66.67
+    assert metrics.cumulative_return == 25.4  # 1.1 * 0.95 * 1.2
+    assert metrics.profit_factor == 6.0 and metrics.expectancy == pytest.approx(8.3333)
+    assert (metrics.avg_win, metrics.avg_loss) == (15.0, -5.0)
+    # Equity 1 -> 1.1 -> 1.045 -> 1.254: one trade (an hour) under the 1.1 high
+    assert metrics.max_drawdown == -5.0
+    assert (metrics.max_drawdown_duration_trades, metrics.max_drawdown_duration_hours) == (1, 1.0)
+    assert metrics.exposure_percent == 60.0  # 1.5 of 2.5 hours
+    assert metrics.by_signal == {
+        "BUY": {"trades": 2, "wins": 2, "avg_return": 15.0, "total_return": 30.0, "win_rate": 100.0},
+        "SELL": {"trades": 1, "wins": 0, "avg_return": -5.0, "total_return": -5.0, "win_rate": 0.0},
+    }
+    assert sorted(metrics.by_exit_reason) == ["SL", "TIME", "TP"]
+
+
+def test_all_wins():
+    metrics = calculate_backtest_metrics(trades([2.0, 3.0]))
+    assert metrics.success_rate == 100.0 and metrics.avg_loss == 0.0
+    assert metrics.profit_factor == MAX_PROFIT_FACTOR
+    assert (metrics.max_drawdown, metrics.max_drawdown_duration_trades) == (0.0, 0)
+    json.dumps(metrics.scalars(), allow_nan=False)
+
+
+def test_all_losses():
+    metrics = calculate_backtest_metrics(trades([-2.0, -3.0]))
+    assert metrics.success_rate == 0.0 and metrics.avg_win == 0.0 and metrics.profit_factor == 0.0
+    assert metrics.cumulative_return == metrics.max_drawdown == -4.94  # 0.98 * 0.97
+    assert (metrics.max_drawdown_duration_trades, metrics.max_drawdown_duration_hours) == (2, 1.0)
+    assert metrics.sharpe_ratio < 0 and metrics.sortino_ratio < 0
+
+
+def test_no_trades():
+    assert calculate_backtest_metrics(pd.DataFrame()).total_signals == 0
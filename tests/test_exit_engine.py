@@ -0,0 +1,47 @@
+# tests/test_exit_engine.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.exit_engine import duration_to_bars, find_exits, interval_to_minutes
+
+# Candle 1 touches both levels of the BUY and the SELL entered at candle 0
+HIGH = np.array([100.0, 106.0, 101.0, 102.0, 101.0])
+LOW = np.array([99.0, 94.0, 99.0, 98.5, 99.0])
+CLOSE = np.array([100.0, 100.0, 100.5, 101.0, 100.0])
+
+
+def exits(ambiguity, window_bars=3):
+    # BUY and SELL at candle 0 (SL 95 / TP 105 and SL 105 / TP 95), a BUY at candle 1 that never touches
+    return find_exits(HIGH, LOW, CLOSE, [0, 0, 1], ["BUY", "SELL", "BUY"], [95.0, 105.0, 90.0],
+                      [105.0, 95.0, 110.0], window_bars, ambiguity=ambiguity)
+
+
+def test_candle_touching_both_levels():
+    index, price, reason = exits("sl_first")
+    assert list(reason[:2]) == ["SL", "SL"] and list(index[:2]) == [1, 1]
+    assert list(price[:2]) == [95.0, 105.0]
+
+    index, price, reason = exits("tp_first")
+    assert list(reason[:2]) == ["TP", "TP"] and list(index[:2]) == [1, 1]
+    assert list(price[:2]) == [105.0, 95.0]
+
+
+def test_timeout_exits_on_the_last_window_candle():
+    for ambiguity in ("sl_first", "tp_first"):
+        index, price, reason = exits(ambiguity)
+        assert (index[2], price[2], reason[2]) == (4, 100.0, "TIME")
+    # The window is cut at the end of the data
+    index, price, reason = exits("sl_first", window_bars=10)
+    assert (index[2], price[2], reason[2]) == (4, 100.0, "TIME")
+    with pytest.raises(ValueError):
+        exits("both")
+
+
+def test_duration_and_interval_conversion():
+    assert list(duration_to_bars([90, 60, 0], 60)) == [2, 1, 1]
+    assert interval_to_minutes("4h") == 240 and interval_to_minutes("1s") == 1 / 60
+    assert interval_to_minutes("7m", pd.date_range("2024-06-01", periods=5, freq="7min")) == 7
+    with pytest.raises(ValueError):
+        interval_to_minutes("7m")
@@ -0,0 +1,79 @@
+# tests/test_http_client.py
+
+import threading
+import time
+
+import requests
+
+from utils import http_client
+
+
+class FakeSession:
+    def __init__(self, statuses, headers=None, delay=None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.delay = delay
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        if self.delay:
+            self.delay.wait(5)
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response.headers.update(self.headers)
+        response._content = b"[]"
+        return response
+
+
+def test_retries_with_backoff(monkeypatch):
+    session = FakeSession([503, 429, 200])
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+
+    response = http_client.get("http://example.test/a")
+    assert response.status_code == 200
+    assert session.calls == 3
+    assert len(sleeps) == 2 and all(0 <= s <= http_client.BACKOFF_CAP for s in sleeps)
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    session = FakeSession([500] * (http_client.MAX_RETRIES + 1))
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+
+    assert http_client.get("http://example.test/b").status_code == 500
+    assert session.calls == http_client.MAX_RETRIES + 1
+
+
+def test_identical_requests_are_coalesced(monkeypatch):
+    release = threading.Event()
+    session = FakeSession([200], delay=release)
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+
+    coalesced = http_client.HTTP_COALESCED.value(upstream="other")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(http_client.get("http://example.test/c", {"q": 1})))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    # Release the first request once the other four are waiting on it
+    while http_client.HTTP_COALESCED.value(upstream="other") < coalesced + 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert session.calls == 1
+    assert len(results) == 5 and all(r is results[0] for r in results)
+
+
+def test_token_bucket_follows_used_weight():
+    bucket = http_client.TokenBucket(100, period=60)
+    bucket.acquire(10)
+    assert round(bucket.tokens) == 90
+    bucket.sync_used(95)
+    assert bucket.tokens < 6
+    bucket.sync_used(20)  # never hands back tokens the local count already spent
+    assert bucket.tokens < 6
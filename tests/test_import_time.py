@@ -0,0 +1,46 @@
+# tests/test_import_time.py
+#
+# Start-up budget of the entry points. Heavy dependencies are imported by the code
+# that uses them, so a short cron run does not spend its time importing.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative `python -X importtime` of the module, best of a few runs
+IMPORT_BUDGET_MS = {"main": 500, "server": 300}
+
+# Modules that importing the entry point must not load
+DEFERRED_MODULES = {
+    "main": ["matplotlib", "fpdf", "prettytable", "vaderSentiment", "aiohttp", "feedparser", "requests",
+             "backtesting.backtester", "data.fetch_news_utils"],
+    "server": ["pandas", "sentiment_logger", "vaderSentiment", "requests"],
+}
+
+
+def import_time_ms(module):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    # "import time: <self us> | <cumulative us> | <module>", nested modules indented
+    for line in reversed(result.stderr.splitlines()):
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].rstrip() == f" {module}":
+            return int(parts[1]) / 1000
+    raise AssertionError(f"no importtime line for {module}")
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_MS))
+def test_import_time_budget(module):
+    best = min(import_time_ms(module) for _ in range(3))
+    assert best <= IMPORT_BUDGET_MS[module], f"import {module} took {best:.0f} ms"
+
+
+@pytest.mark.parametrize("module", sorted(DEFERRED_MODULES))
+def test_heavy_modules_are_deferred(module):
+    code = f"import sys, {module}; print(' '.join(m for m in {DEFERRED_MODULES[module]!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == []
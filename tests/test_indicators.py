@@ -0,0 +1,81 @@
+# tests/test_indicators.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.synthetic import synthetic_ohlcv
+from indicators.atr import ATRState, calculate_atr_series, calculate_true_range
+from indicators.bollinger import calculate_bollinger_bands
+from indicators.macd import calculate_macd
+from indicators.rsi import calculate_rsi
+from indicators.volatility import calculate_volatility
+from logic.signal_series import bollinger_series, macd_series, rsi_series, volatility_series
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return synthetic_ohlcv("BTCUSDT", "15m", 400, seed=1)
+
+
+def test_synthetic_ohlcv_is_deterministic():
+    a = synthetic_ohlcv("ETHUSDT", "1h", 300, seed=3)
+    b = synthetic_ohlcv("ETHUSDT", "1h", 300, seed=3)
+    c = synthetic_ohlcv("ETHUSDT", "1h", 300, seed=4)
+    pd.testing.assert_frame_equal(a, b)
+    assert not a["close"].equals(c["close"])
+
+
+def test_synthetic_ohlcv_is_consistent(candles):
+    assert list(candles.columns) == ["open", "high", "low", "close", "volume"]
+    assert candles.index.is_monotonic_increasing
+    assert (candles.index.to_series().diff().dropna() == pd.Timedelta(minutes=15)).all()
+    assert (candles["high"] >= candles[["open", "close"]].max(axis=1)).all()
+    assert (candles["low"] <= candles[["open", "close"]].min(axis=1)).all()
+    assert (candles[["open", "high", "low", "close", "volume"]] > 0).all().all()
+
+
+def test_synthetic_ohlcv_rejects_unknown_interval():
+    with pytest.raises(ValueError):
+        synthetic_ohlcv("BTCUSDT", "7m", 10)
+
+
+def test_rsi_range_and_label(candles):
+    rsi, label = calculate_rsi(candles)
+    assert 0 <= rsi <= 100
+    assert label in ("overbought", "oversold", "neutral")
+    assert calculate_rsi(pd.DataFrame()) == (50.0, "neutral")
+
+
+def test_atr_state_matches_series(candles):
+    for method in ("sma", "wilder", "ema"):
+        expected = calculate_atr_series(candles, period=14, method=method).to_numpy()
+        state = ATRState.from_frame(candles.iloc[:100], period=14, method=method)
+        for high, low, close in candles[["high", "low", "close"]].to_numpy()[100:]:
+            value = state.update(high, low, close)
+        assert value == pytest.approx(expected[-1], rel=1e-9)
+
+
+def test_atr_state_does_not_drift():
+    # True ranges spanning orders of magnitude: a running sum loses bits with every update
+    rng = np.random.default_rng(0)
+    close = 50_000 + np.cumsum(rng.normal(0, 50, 50_000))
+    spread = np.exp(rng.normal(0, 3, len(close)))
+    candles = pd.DataFrame({"high": close + spread, "low": close - spread, "close": close})
+    tr = calculate_true_range(candles).to_numpy()
+
+    state = ATRState(period=14)
+    for i, (high, low, close) in enumerate(candles.to_numpy()):
+        value = state.update(high, low, close)
+        if i >= 13:
+            assert value == pytest.approx(tr[i - 13:i + 1].mean(), rel=1e-15, abs=0)
+
+
+@pytest.mark.parametrize("position", [30, 120, 250, 399])
+def test_series_match_scalar_indicators(candles, position):
+    window = candles.iloc[:position + 1]
+    close = candles["close"]
+    assert macd_series(close).iloc[position] == calculate_macd(window)
+    assert rsi_series(close)[1].iloc[position] == calculate_rsi(window)[1]
+    assert bollinger_series(close).iloc[position] == calculate_bollinger_bands(window)
+    assert volatility_series(close).iloc[position] == calculate_volatility(window)
@@ -0,0 +1,73 @@
+# tests/test_live_engine.py
+
+import numpy as np
+import pandas as pd
+
+from backtesting.replay import replay_signals, synthetic_candles, verify_replay
+from data.synthetic import synthetic_ohlcv
+from live_daemon import next_candle_close
+from logic.live_engine import LiveSignalEngine, StreamState
+from logic.signal_series import indicator_frame, signal_series
+
+
+def test_stream_state_matches_indicator_frame():
+    df = synthetic_ohlcv("ETHUSDT", "15m", 1500, seed=4)
+    state = StreamState(history=None)
+    rows = []
+    for close in df["close"]:
+        state.update(close)
+        rows.append(state.row)
+    expected = indicator_frame(df)
+    for column in expected.columns:
+        streamed = np.concatenate([row[column] for row in rows])
+        assert np.array_equal(streamed, expected[column].to_numpy()), column
+
+
+def test_engine_matches_signal_series_at_latest_bar():
+    price_data = {
+        "1h": synthetic_ohlcv("BTCUSDT", "1h", 400, seed=5),
+        "15m": synthetic_ohlcv("BTCUSDT", "15m", 1600, seed=5),
+        "4h": synthetic_ohlcv("BTCUSDT", "4h", 100, seed=5),
+    }
+    engine = LiveSignalEngine(history=None)
+    for tf, df in price_data.items():
+        assert engine.add_candles("BTCUSDT", tf, df) == len(df)
+    assert engine.add_candles("BTCUSDT", "1h", price_data["1h"].tail(3)) == 0
+
+    # The backtester cuts every timeframe at the base bar; make the cut the last candle
+    ts = price_data["1h"].index[-1]
+    cut = {tf: df[df.index <= ts] for tf, df in price_data.items()}
+    engine = LiveSignalEngine(history=None)
+    for tf, df in cut.items():
+        engine.add_candles("BTCUSDT", tf, df)
+    for sentiment in ("bullish", "bearish", "neutral"):
+        signals, confidences = signal_series(cut, [ts], sentiment, min_agreeing=2, confidence_threshold=57)
+        assert engine.evaluate("BTCUSDT", "1h", sentiment) == (signals[0], confidences[0])
+
+
+def test_next_candle_close():
+    now = pd.Timestamp("2024-06-05 13:47:12").timestamp()
+    closes = {tf: pd.Timestamp(next_candle_close(tf, now), unit="s") for tf in ("1m", "15m", "4h", "1d", "1w", "1M")}
+    assert closes == {
+        "1m": pd.Timestamp("2024-06-05 13:48"),
+        "15m": pd.Timestamp("2024-06-05 14:00"),
+        "4h": pd.Timestamp("2024-06-05 16:00"),
+        "1d": pd.Timestamp("2024-06-06"),
+        "1w": pd.Timestamp("2024-06-10"),  # a Monday
+        "1M": pd.Timestamp("2024-07-01"),
+    }
+    # Exactly at a close, the next one is a full candle later
+    assert next_candle_close("1h", pd.Timestamp("2024-06-05 14:00").timestamp()) == pd.Timestamp("2024-06-05 15:00").timestamp()
+
+
+def test_replay_matches_backtester():
+    price_data = synthetic_candles("SOLUSDT", "15m", 1200, seed=6)
+    report = verify_replay(price_data, "SOLUSDT", "15m", verbose=False)
+    assert report["bars"] == 1200
+    assert report["mismatches"] == 0, report["first_mismatches"]
+
+    sleeps = []
+    replayed = list(replay_signals(price_data, "SOLUSDT", "15m", sentiment=0.0, speed=900, sleep=sleeps.append))
+    assert [ts for ts, _, _ in replayed] == list(price_data["15m"].index)
+    # 5-minute steps between candle opens at 900× real time
+    assert set(sleeps) == {300 / 900}
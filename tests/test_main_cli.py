@@ -0,0 +1,72 @@
+# tests/test_main_cli.py
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from utils.profiler import profiling_enabled
+
+
+def test_batch_cli_json(tmp_path, capsys):
+    argv = ["--symbols", "btcusdt", "ETHUSDT", "--intervals", "1h", "4h", "--no-pdf", "--no-charts", "--no-backtest",
+            "--json", "--output-dir", str(tmp_path)]
+    assert main.main(argv) == 0
+
+    results = json.loads(capsys.readouterr().out)
+    assert [(r["symbol"], r["interval"]) for r in results] == [
+        ("BTCUSDT", "1h"), ("BTCUSDT", "4h"), ("ETHUSDT", "1h"), ("ETHUSDT", "4h")
+    ]
+    for result in results:
+        assert result["signal"] in ("BUY", "SELL", "HOLD")
+        assert result["pdf"] is None and result["charts"] == [] and result["trades"] == 0
+    assert not list(tmp_path.rglob("*.png"))
+
+
+def test_json_output_is_strict(monkeypatch, capsys):
+    def run_pipeline(symbol, interval, **options):
+        return {"symbol": symbol, "interval": interval, "valid_from": pd.Timestamp("2024-06-05 14:00"),
+                "backtest": {"profit_factor": float("inf"), "sharpe_ratio": np.float64("nan"), "trades": np.int64(1)}}
+
+    monkeypatch.setattr(main, "run_pipeline", run_pipeline)
+    assert main.main(["--symbols", "BTCUSDT", "--json"]) == 0
+
+    def reject(constant):
+        raise ValueError(f"not strict JSON: {constant}")
+
+    [result] = json.loads(capsys.readouterr().out, parse_constant=reject)
+    assert result["backtest"] == {"profit_factor": None, "sharpe_ratio": None, "trades": 1}
+    assert result["valid_from"] == "2024-06-05T14:00:00"
+
+
+def test_failed_pipeline_stops_profiling(tmp_path, monkeypatch):
+    pstats_path = tmp_path / "pipeline.pstats"
+    monkeypatch.setattr(main, "PROFILE", True)
+    monkeypatch.setattr(main, "PROFILE_PSTATS", str(pstats_path))
+    monkeypatch.setattr(main, "get_price_data_many", lambda pairs: {pair: pd.DataFrame() for pair in pairs})
+    with pytest.raises(ValueError, match="No 1h candles"):
+        main.run_pipeline("BTCUSDT", "1h", output_dir=str(tmp_path), pdf=False, charts=False, backtest=False)
+    assert not profiling_enabled()
+    assert pstats_path.exists()
+
+
+def test_skipping_charts_keeps_existing_ones(tmp_path):
+    plots_dir = tmp_path / "plots"
+    plots_dir.mkdir()
+    for name in main.CHART_FILES:
+        (plots_dir / name).write_bytes(b"earlier run")
+    result = main.run_pipeline("BTCUSDT", "1h", output_dir=str(tmp_path), pdf=False, charts=False, backtest=False)
+    assert result["charts"] == []
+    assert all((plots_dir / name).read_bytes() == b"earlier run" for name in main.CHART_FILES)
+
+
+def test_signal_scan_matches_the_pipeline(tmp_path, capsys):
+    argv = ["--symbols", "BTCUSDT", "ETHUSDT", "--intervals", "1h", "4h", "--json", "--output-dir", str(tmp_path)]
+    assert main.main(argv + ["--signals-only", "--jobs", "2"]) == 0
+    scan = json.loads(capsys.readouterr().out)
+    assert main.main(argv + ["--no-pdf", "--no-charts", "--no-backtest"]) == 0
+    pipeline = json.loads(capsys.readouterr().out)
+    assert [(r["symbol"], r["interval"], r["signal"], r["confidence"]) for r in scan] == \
+        [(r["symbol"], r["interval"], r["signal"], r["confidence"]) for r in pipeline]
@@ -0,0 +1,31 @@
+# tests/test_metrics.py
+
+from server import app
+from utils import metrics
+
+
+def test_histogram_exposition():
+    latency = metrics.histogram("test_latency_seconds", "Test latency.", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 5):
+        latency.observe(value, route="/a")
+
+    lines = [line for line in metrics.render().splitlines() if line.startswith("test_latency_seconds")]
+    assert lines == [
+        'test_latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'test_latency_seconds_bucket{route="/a",le="1"} 2',
+        'test_latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_latency_seconds_sum{route="/a"} 5.15',
+        'test_latency_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_metrics_endpoint_records_routes():
+    client = app.test_client()
+    before = metrics.SERVER_REQUEST_SECONDS.count(route="/")
+    assert client.get("/").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert metrics.SERVER_REQUEST_SECONDS.count(route="/") == before + 1
+    assert "# TYPE tradingsignals_http_fetch_duration_seconds histogram" in response.get_data(as_text=True)
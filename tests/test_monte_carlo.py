@@ -0,0 +1,41 @@
+# tests/test_monte_carlo.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.monte_carlo import monte_carlo_report, monte_carlo_resample
+
+RETURNS = [5.0, -3.0, 2.0, -1.0, 4.0]
+REALISED = (np.prod(1 + np.array(RETURNS) / 100) - 1) * 100
+
+
+@pytest.mark.parametrize("method", ["bootstrap", "shuffle"])
+def test_resample_is_seeded(method):
+    # chunk_size below n_simulations, so the chunks are stitched too
+    results = monte_carlo_resample(RETURNS, n_simulations=500, method=method, seed=7, chunk_size=128)
+    again = monte_carlo_resample(RETURNS, n_simulations=500, method=method, seed=7, chunk_size=128)
+    assert set(results) == {"final_return_percent", "max_drawdown_percent", "max_losing_streak"}
+    for name, values in results.items():
+        assert values.shape == (500,)
+        np.testing.assert_array_equal(values, again[name])
+    assert (results["max_drawdown_percent"] <= 0).all()
+
+
+def test_shuffle_keeps_the_final_return():
+    results = monte_carlo_resample(RETURNS, n_simulations=500, method="shuffle", seed=3)
+    np.testing.assert_allclose(results["final_return_percent"], REALISED)
+    # Only the order changes: the two losses are either apart or back to back
+    assert set(results["max_losing_streak"]) == {1, 2}
+    assert len(np.unique(results["max_drawdown_percent"].round(9))) > 1
+
+    bootstrap = monte_carlo_resample(RETURNS, n_simulations=500, method="bootstrap", seed=3)
+    assert bootstrap["final_return_percent"].std() > 0
+
+
+def test_report_percentiles(capsys):
+    report = monte_carlo_report(pd.DataFrame({"net_return_percent": RETURNS}), n_simulations=200, method="shuffle",
+                                seed=1, print_report=False)
+    assert report["trades"] == 5 and report["final_return_percent"]["p50"] == pytest.approx(REALISED)
+    assert monte_carlo_report(pd.DataFrame(), print_report=False) == {}
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,34 @@
+# tests/test_optimizer.py
+
+import pandas as pd
+
+from backtesting.optimizer import grid_search_space, random_search_space, run_parameter_sweep
+from backtesting.replay import synthetic_candles
+
+SPACE = {"min_agreeing": [1, 3], "confidence_threshold": [55, 70]}
+
+
+def test_search_spaces():
+    grid = grid_search_space(SPACE)
+    assert grid == [{"min_agreeing": 1, "confidence_threshold": 55}, {"min_agreeing": 1, "confidence_threshold": 70},
+                    {"min_agreeing": 3, "confidence_threshold": 55}, {"min_agreeing": 3, "confidence_threshold": 70}]
+    sample = random_search_space(SPACE, n_trials=3, seed=1)
+    assert len(sample) == 3 and all(params in grid for params in sample)
+    assert sample == random_search_space(SPACE, n_trials=3, seed=1)
+    assert random_search_space(SPACE, n_trials=10) == grid
+
+
+def test_sweep_ranking_is_independent_of_workers():
+    price_data = synthetic_candles("BTCUSDT", "1h", 600, seed=3)
+    # Lowest return first, but only the trial with enough trades is eligible
+    sweeps = [
+        run_parameter_sweep(price_data["1h"], "BTCUSDT", "1h", price_data, trials=grid_search_space(SPACE),
+                            ascending=True, min_trades=100, max_workers=workers)
+        for workers in (1, 2)
+    ]
+    pd.testing.assert_frame_equal(sweeps[0], sweeps[1])
+
+    ranking = sweeps[0]
+    assert ranking["total_signals"].iloc[0] >= 100
+    assert (ranking["total_signals"].iloc[1:] < 100).all()
+    assert ranking["cumulative_return"].iloc[0] > ranking["cumulative_return"].iloc[1:].max()
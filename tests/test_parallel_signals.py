@@ -0,0 +1,53 @@
+# tests/test_parallel_signals.py
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pytest
+
+from data.synthetic import synthetic_ohlcv
+from logic import parallel_signals
+from logic.parallel_signals import generate_signals_parallel
+from logic.signal_engine import evaluate_strategies, tally_votes
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]
+PRICE_DATA = {
+    symbol: {tf: synthetic_ohlcv(symbol, tf, bars, seed=seed) for tf, bars in (("1h", 250), ("15m", 250), ("4h", 15))}
+    for seed, symbol in enumerate(SYMBOLS)
+}
+SENTIMENTS = {"BTCUSDT": "bullish", "ETHUSDT": "bearish", "SOLUSDT": "neutral"}
+
+
+def test_matches_serial_evaluation():
+    expected = {}
+    for symbol, price_data in PRICE_DATA.items():
+        # The 4h frame is too short to vote, as in generate_signal
+        strategies = [s for tf, df in price_data.items() if len(df) >= 20
+                      for s in evaluate_strategies(df, SENTIMENTS.get(symbol, "neutral"), symbol)]
+        expected[symbol] = tally_votes(strategies, min_agreeing=2, confidence_threshold=57)
+
+    assert generate_signals_parallel(PRICE_DATA, SENTIMENTS, max_workers=2) == expected
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert generate_signals_parallel(PRICE_DATA, SENTIMENTS, executor=executor) == expected
+
+
+def test_shared_memory_is_unlinked_on_error(monkeypatch):
+    exported = []
+    export_frame = parallel_signals._export_frame
+
+    def tracked(df):
+        shm, spec = export_frame(df)
+        exported.append(spec["name"])
+        return shm, spec
+
+    class FailingExecutor:
+        def map(self, *args, **kwargs):
+            raise RuntimeError("worker died")
+
+    monkeypatch.setattr(parallel_signals, "_export_frame", tracked)
+    with pytest.raises(RuntimeError):
+        generate_signals_parallel(PRICE_DATA, SENTIMENTS, executor=FailingExecutor())
+    assert len(exported) == 2 * len(SYMBOLS)
+    for name in exported:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
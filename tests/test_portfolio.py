@@ -0,0 +1,57 @@
+# tests/test_portfolio.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting import portfolio
+from backtesting.portfolio import run_portfolio_backtest
+
+T0 = pd.Timestamp("2024-06-01")
+HOUR = 3_600_000_000_000
+
+
+def candidates(*trades):
+    # (entry hour, exit hour, gate hour, net return %) per candidate trade
+    entry, exit_, gate, ret = (np.array(values) for values in zip(*trades))
+    return {
+        "entry_time": T0.value + entry * HOUR,
+        "exit_time": T0.value + exit_ * HOUR,
+        "gate_until": T0.value + gate * HOUR,
+        "net_return_percent": ret.astype(float),
+        "signal": np.full(len(trades), "BUY", dtype=object),
+        "confidence": np.full(len(trades), 70),
+        "exit_reason": np.full(len(trades), "TIME", dtype=object),
+    }
+
+
+CANDIDATES = {
+    "AAA": candidates((0, 2, 3, 10.0), (2, 4, 3, 0.0), (3, 6, 4, 20.0)),
+    "BBB": candidates((1, 5, 2, -10.0),),
+    "CCC": candidates((3, 4, 4, 5.0),),
+}
+
+
+def test_limits_and_equity_curve(monkeypatch):
+    monkeypatch.setattr(portfolio, "_symbol_candidates", lambda symbol, *args: CANDIDATES[symbol])
+    trades, equity, attribution = run_portfolio_backtest(
+        {symbol: (None, None) for symbol in CANDIDATES}, "1h", initial_capital=1000.0, max_positions=2,
+        position_fraction=0.6
+    )
+    # AAA at 2h: closed, but its first signal is still valid until 3h.
+    # BBB at 1h: only 400 cash left for a 600 position. CCC at 3h: two positions open.
+    assert list(zip(trades["symbol"], trades["entry_time"])) == [
+        ("AAA", T0), ("BBB", T0 + pd.Timedelta(hours=1)), ("AAA", T0 + pd.Timedelta(hours=3))
+    ]
+    assert trades["position_size"].tolist() == pytest.approx([600.0, 400.0, 636.0])
+    assert trades["pnl"].tolist() == pytest.approx([60.0, -40.0, 127.2])
+
+    assert list(equity.index) == [T0 + pd.Timedelta(hours=h) for h in (0, 1, 2, 3, 5, 6)]
+    assert equity.tolist() == pytest.approx([1000.0, 1000.0, 1060.0, 1060.0, 1020.0, 1147.2])
+    assert attribution["trades"].tolist() == [2, 1, 0]
+
+
+@pytest.mark.parametrize("options", [{"max_positions": 0}, {"position_fraction": 1.5}, {"position_fraction": -0.1}])
+def test_invalid_limits(options):
+    with pytest.raises(ValueError):
+        run_portfolio_backtest({}, "1h", **options)
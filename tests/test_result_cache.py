@@ -0,0 +1,37 @@
+# tests/test_result_cache.py
+
+import pandas as pd
+
+from backtesting.backtester import run_backtest
+from backtesting.replay import synthetic_candles
+from backtesting.result_cache import cached_backtest
+
+HISTORY = synthetic_candles("BTCUSDT", "1h", 400, seed=2)
+
+
+def rolling_window(closed_since, limit=250):
+    # What main.py fetches: the last `limit` candles of every timeframe
+    return {tf: df.iloc[max(0, len(df) - limit - closed_since):len(df) - closed_since] for tf, df in HISTORY.items()}
+
+
+def growing_history(closed_since):
+    return {tf: df.iloc[:len(df) - closed_since] for tf, df in HISTORY.items()}
+
+
+def check(price_data, tmp_path, capsys):
+    results, _ = cached_backtest(price_data["1h"], "BTCUSDT", "1h", price_data, cache_dir=str(tmp_path))
+    expected = run_backtest(price_data["1h"], "BTCUSDT", "1h", [], price_data, verbose=False)
+    pd.testing.assert_frame_equal(results, expected)
+    return capsys.readouterr().out
+
+
+def test_shifted_rolling_window_runs_in_full(tmp_path, capsys):
+    check(rolling_window(3), tmp_path, capsys)
+    out = check(rolling_window(0), tmp_path, capsys)
+    assert "Extending" not in out and "from cache" not in out
+    assert "from cache" in check(rolling_window(0), tmp_path, capsys)
+
+
+def test_appended_candles_extend_the_cached_run(tmp_path, capsys):
+    check(growing_history(12), tmp_path, capsys)
+    assert "Extending cached backtest for BTCUSDT 1h by 12 new candles" in check(growing_history(0), tmp_path, capsys)
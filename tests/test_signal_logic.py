@@ -0,0 +1,87 @@
+# tests/test_signal_logic.py
+
+import numpy as np
+import pytest
+
+from backtesting import backtester
+from backtesting.backtester import run_backtest
+from data.synthetic import synthetic_headlines, synthetic_ohlcv
+from logic.risk_manager import calculate_risk_management, calculate_risk_management_batch
+from logic.signal_engine import generate_signal, tally_votes
+from logic.signal_series import signal_series
+from logic.signal_timer import estimate_signal_duration, estimate_signal_durations
+
+
+@pytest.fixture(scope="module")
+def price_data():
+    return {
+        "15m": synthetic_ohlcv("BTCUSDT", "15m", 600, seed=2),
+        "5m": synthetic_ohlcv("BTCUSDT", "5m", 1800, seed=2),
+        "1h": synthetic_ohlcv("BTCUSDT", "1h", 150, seed=2),
+    }
+
+
+def test_tally_votes():
+    buy = {"strategy": "a", "signal": "BUY", "confidence": 70}
+    sell = {"strategy": "b", "signal": "SELL", "confidence": 70}
+    hold = {"strategy": "c", "signal": "HOLD", "confidence": 50}
+    assert tally_votes([buy, buy, hold], min_agreeing=2, confidence_threshold=55) == ("BUY", 63)
+    assert tally_votes([buy, sell], min_agreeing=1, confidence_threshold=55)[0] == "HOLD"
+    assert tally_votes([], min_agreeing=1)[0] == "HOLD"
+
+
+def test_signal_series_matches_generate_signal(price_data):
+    index = price_data["15m"].index
+    signals, confidences = signal_series(price_data, index, "bullish", min_agreeing=2, confidence_threshold=57)
+    for position in range(40, len(index), 37):
+        ts = index[position]
+        window = {tf: df[df.index <= ts] for tf, df in price_data.items()}
+        assert (signals[position], confidences[position]) == generate_signal(
+            window, "bullish", "BTCUSDT", min_agreeing=2, confidence_threshold=57
+        )
+
+
+def test_risk_batch_matches_scalar(price_data):
+    df = price_data["15m"]
+    indicators = {"trend_strength": 0.6, "sentiment": 0.3, "volatility": "medium"}
+    for signal in ("BUY", "SELL"):
+        scalar = calculate_risk_management(df, signal, "medium", indicators, confidence=65, atr=2.5)
+        batch = calculate_risk_management_batch(
+            np.array([df["close"].iloc[-1]]), np.array([signal], dtype=object), np.array([65]),
+            np.array(["medium"], dtype=object), np.array([2.5]), trend_strength=0.6, sentiment=0.3
+        )
+        assert scalar["suggested_stop_loss"] == batch["stop_loss"][0]
+        assert scalar["suggested_take_profit"] == batch["take_profit"][0]
+
+
+def test_signal_durations_match_scalar():
+    cases = [("BUY", 80, "uptrend", "bullish", "low"), ("SELL", 55, "downtrend", "neutral", "high"),
+             ("HOLD", 40, "sideways", "bearish", "medium")]
+    columns = [np.array(values, dtype=object) for values in zip(*cases)]
+    durations = estimate_signal_durations(*columns, timeframe="15m")
+    assert list(durations) == [estimate_signal_duration(*case, timeframe="15m") for case in cases]
+    # A 1s signal still blocks new entries for at least one candle
+    assert estimate_signal_duration("BUY", 40, "sideways", "neutral", "high", "1s") == 1
+    assert list(estimate_signal_durations(*columns, timeframe="1s")) == [1, 1, 1]
+
+
+def test_synthetic_headlines_mention_coin():
+    headlines = synthetic_headlines("Ethereum", "ETH", count=12, seed=5)
+    assert len(headlines) == 12
+    assert headlines == synthetic_headlines("Ethereum", "ETH", count=12, seed=5)
+    assert all({"title", "summary", "published", "source", "link", "text"} <= set(h) for h in headlines)
+    assert all("ETH" in h["text"] or "Ethereum" in h["text"] for h in headlines)
+
+
+def test_backtest_is_deterministic_and_extends(price_data):
+    assert backtester.DATA_SOURCE == "synthetic"
+    base = price_data["15m"]
+    full = run_backtest(base, "BTCUSDT", "15m", [], price_data, verbose=False)
+    assert full.equals(run_backtest(base, "BTCUSDT", "15m", [], price_data, verbose=False))
+
+    cutoff = base.index[449]
+    prefix = {tf: df[df.index <= cutoff] for tf, df in price_data.items()}
+    state = {}
+    previous = run_backtest(prefix["15m"], "BTCUSDT", "15m", [], prefix, verbose=False, state=state)
+    extended = run_backtest(base, "BTCUSDT", "15m", [], price_data, verbose=False, state=state, previous=previous)
+    assert extended.equals(full)
@@ -0,0 +1,61 @@
+# tests/test_standin_server.py
+
+import time
+
+import pytest
+import requests
+
+import config
+from data import async_fetch, fetch_news_utils, fetch_price, standin_server
+from utils.transport import using_upstreams
+
+
+@pytest.fixture
+def standin(request, monkeypatch):
+    # The fetchers short-circuit to data/synthetic.py in synthetic mode; go through HTTP instead
+    for module in (config, fetch_price, fetch_news_utils, async_fetch):
+        monkeypatch.setattr(module, "DATA_SOURCE", "binance")
+    server = standin_server.start_standin_server(binance_weight_limit=getattr(request, "param", 4))
+    with using_upstreams(server.base_urls):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetchers_read_from_standin(standin):
+    df = fetch_price.get_price_data("BTCUSDT", "1h")
+    assert len(df) == config.HISTORICAL_LIMIT
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+    assert df.index.is_monotonic_increasing
+
+    coins = config.build_symbol_name_map(3)
+    assert coins == {"BTC": ("Bitcoin", "BTC"), "ETH": ("Ethereum", "ETH"), "BNB": ("Binance Coin", "BNB")}
+
+    headlines = fetch_news_utils.fetch_rss_headlines(standin.rss_feeds, "Bitcoin", "BTC")
+    assert headlines and all("Bitcoin" in item["text"] or "BTC" in item["text"] for item in headlines)
+
+
+def test_binance_weight_budget(standin, monkeypatch):
+    # Keep every request inside one rate-limit minute
+    minute = time.time() // 60 * 60
+    monkeypatch.setattr(standin, "clock", lambda: minute + 30)
+    url = standin.base_url + "/api/v3/klines"
+    params = {"symbol": "BTCUSDT", "interval": "15m", "limit": 250}  # weight 2 each, budget 4
+
+    responses = [requests.get(url, params=params) for _ in range(3)]
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert [r.headers["X-MBX-USED-WEIGHT-1M"] for r in responses] == ["2", "4", "4"]
+    assert responses[2].headers["Retry-After"] == "30"
+
+
+@pytest.mark.parametrize("standin", [10_000], indirect=True)
+def test_async_fetch_many(standin):
+    pairs = [(f"C{i}USDT", interval) for i in range(40) for interval in ("15m", "1h", "4h")]
+    frames = async_fetch.get_price_data_many(pairs + pairs[:5])
+    assert set(frames) == set(pairs)
+    assert all(len(df) == config.HISTORICAL_LIMIT for df in frames.values())
+    assert frames[("C1USDT", "1h")].equals(fetch_price.get_price_data("C1USDT", "1h"))
+
+    feeds = async_fetch.fetch_feeds(standin.rss_feeds + [standin.base_url + "/rss/missing.xml"])
+    assert all(feed.entries for feed in feeds[:-1])
+    assert isinstance(feeds[-1], Exception)
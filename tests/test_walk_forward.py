@@ -0,0 +1,47 @@
+# tests/test_walk_forward.py
+
+import pandas as pd
+import pytest
+
+from backtesting.backtester import run_backtest
+from backtesting.replay import synthetic_candles
+from backtesting.walk_forward import run_walk_forward, walk_forward_folds
+
+TRIALS = [{"confidence_threshold": 55, "min_agreeing": 1}, {"confidence_threshold": 57, "min_agreeing": 2}]
+
+
+def test_in_sample_trades_exit_inside_the_train_window():
+    price_data = synthetic_candles("BTCUSDT", "1h", 1200, seed=3)
+    price_df = price_data["1h"]
+    cache, leaked = {}, 0
+    for train_start, train_end, _, _ in walk_forward_folds(len(price_df), 300, 200):
+        train_to = price_df.index[train_end - 1]
+        for params in TRIALS:
+            run = dict(params=params, cache=cache, start=train_start, end=train_end, verbose=False)
+            trades = run_backtest(price_df, "BTCUSDT", "1h", [], price_data, horizon=train_end, **run)
+            assert not trades.empty
+            assert (pd.DatetimeIndex(trades["exit_time"]) <= train_to).all()
+            # Without the horizon some exits fall in the out-of-sample window
+            unbounded = run_backtest(price_df, "BTCUSDT", "1h", [], price_data, **run)
+            leaked += int((pd.DatetimeIndex(unbounded["exit_time"]) > train_to).sum())
+    assert leaked
+
+
+def test_stitched_trades_do_not_overlap():
+    price_data = synthetic_candles("BTCUSDT", "1h", 1200, seed=3)
+    # Overlapping test windows, so folds trade the same candles
+    trades, folds, equity = run_walk_forward(price_data["1h"], "BTCUSDT", "1h", price_data, 300, 200, step=150,
+                                             trials=TRIALS, max_workers=2)
+    assert len(folds) == 6 and len(equity) == len(trades) > 0
+    assert folds["oos_overlapping_dropped"].sum() > 0
+    entries = pd.DatetimeIndex(trades["timestamp"])
+    exits = pd.DatetimeIndex(trades["exit_time"])
+    fold_ids = trades["fold"].to_numpy()
+    for fold in sorted(set(fold_ids))[1:]:
+        assert entries[fold_ids == fold].min() >= exits[fold_ids < fold].max()
+
+
+def test_unknown_rank_by_fails_before_the_pool_starts():
+    price_data = synthetic_candles("BTCUSDT", "1h", 600, seed=3)
+    with pytest.raises(ValueError, match="sharpe"):
+        run_walk_forward(price_data["1h"], "BTCUSDT", "1h", price_data, 300, 200, trials=TRIALS, rank_by="sharpe")
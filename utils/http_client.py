@@ -0,0 +1,186 @@
+# utils/http_client.py
+#
+# Shared HTTP client behind utils/transport.py. It provides:
+# - one keep-alive requests.Session with a connection pool per host
+# - a token bucket per upstream (Binance request weight, CoinGecko calls), kept in
+#   step with Binance's X-MBX-USED-WEIGHT-1M header and paused on Retry-After
+# - retries with jittered exponential backoff on 429 / 418 / 5xx and connection errors
+# - coalescing: identical GETs already in flight share one response
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from config import BINANCE_WEIGHT_PER_MINUTE, COINGECKO_CALLS_PER_MINUTE
+from utils.metrics import HTTP_COALESCED, HTTP_RATE_LIMIT_WAIT_SECONDS, HTTP_RETRIES
+
+POOL_CONNECTIONS = 10   # hosts kept in the pool
+POOL_MAXSIZE = 32       # connections per host
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5      # seconds, doubled per attempt
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = {418, 429, 500, 502, 503, 504}
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+
+
+class TokenBucket:
+    """`capacity` tokens, refilled continuously over `period` seconds."""
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount=1):
+        """Takes `amount` tokens and returns 0 if available, else the seconds to wait before trying again."""
+        amount = min(amount, self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self.paused_until and self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return max(self.paused_until - now, (amount - self.tokens) / self.rate)
+
+    def acquire(self, amount=1):
+        """Blocks until `amount` tokens are available and takes them. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            delay = self.reserve(amount)
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def sync_used(self, used):
+        """Server-reported usage of the current window; never leaves more tokens than it allows."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, max(self.capacity - used, 0.0))
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+# upstream -> bucket; hosts without one (feeds, icon CDNs) are not throttled
+_buckets = {
+    "binance": TokenBucket(BINANCE_WEIGHT_PER_MINUTE),
+    "coingecko": TokenBucket(COINGECKO_CALLS_PER_MINUTE),
+}
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            # requests loads on the first request, not at start-up
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def rate_limit_bucket(upstream):
+    return _buckets.get(upstream)
+
+
+def set_rate_limit(upstream, capacity, period=60.0):
+    """Replaces the upstream's budget (`capacity` tokens per `period` seconds); None removes it."""
+    if capacity is None:
+        _buckets.pop(upstream, None)
+    else:
+        _buckets[upstream] = TokenBucket(capacity, period)
+
+
+def retry_after_seconds(headers):
+    try:
+        return float(headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt):
+    # "Full jitter": uniform over [0, base * 2^attempt], capped
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def _fetch(url, params, timeout, upstream, weight):
+    import requests
+    bucket = _buckets.get(upstream)
+    label = upstream or "other"
+    for attempt in range(MAX_RETRIES + 1):
+        if bucket is not None:
+            waited = bucket.acquire(weight)
+            if waited:
+                HTTP_RATE_LIMIT_WAIT_SECONDS.inc(waited, upstream=label)
+        try:
+            response = get_session().get(url, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+            HTTP_RETRIES.inc(upstream=label, reason="connection")
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        used = response.headers.get(USED_WEIGHT_HEADER)
+        if bucket is not None and used and used.isdigit():
+            bucket.sync_used(int(used))
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response
+
+        HTTP_RETRIES.inc(upstream=label, reason=str(response.status_code))
+        retry_after = retry_after_seconds(response.headers)
+        if bucket is not None and response.status_code in (418, 429) and retry_after:
+            # The whole upstream is throttled, not just this request
+            bucket.pause(retry_after)
+        time.sleep(max(retry_after or 0.0, backoff_delay(attempt)))
+
+
+def get(url, params=None, timeout=10, upstream=None, weight=1):
+    """
+    GET with pooling, rate limiting, retries and coalescing.
+
+    Parameters:
+    - url (str), params (dict), timeout (float): as for requests.get
+    - upstream (str): name of the rate-limit budget to charge ("binance", "coingecko")
+    - weight (int): tokens the request costs (Binance request weight)
+
+    Returns:
+    - requests.Response; the final one if retries ran out. Connection errors are raised
+      after the last retry. Callers of identical concurrent requests get the same object.
+    """
+    key = (url, tuple(sorted((params or {}).items())))
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        leader = future is None
+        if leader:
+            future = _in_flight[key] = Future()
+    if not leader:
+        HTTP_COALESCED.inc(upstream=upstream or "other")
+        return future.result()
+
+    try:
+        future.set_result(_fetch(url, params, timeout, upstream, weight))
+    except BaseException as e:
+        future.set_exception(e)
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+    return future.result()
@@ -0,0 +1,197 @@
+# utils/metrics.py
+#
+# Small in-process metrics registry with Prometheus text exposition, for the
+# /metrics endpoint in server.py. Counters, gauges and fixed-bucket histograms
+# keep their values in plain dicts keyed by label values; recording is a dict
+# update under a per-metric lock, cheap enough for per-request use.
+#
+#   HTTP_FETCH_SECONDS.observe(0.12, upstream="api.binance.com")
+#   SENTIMENT_ROWS_APPENDED.inc(20)
+#   render()  -> text/plain exposition of every registered metric
+
+import bisect
+import contextlib
+import math
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help):
+        self.name, self.help = name, help
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(_label_key(labels), 0)
+
+    def samples(self):
+        with self.lock:
+            return [(self.name, key, value) for key, value in sorted(self.values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextlib.contextmanager
+    def track_in_progress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name, self.help = name, help
+        self.buckets = tuple(sorted(buckets))
+        self.values = {}  # label key -> [per-bucket counts (+Inf last), sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][slot] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        entry = self.values.get(_label_key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self):
+        with self.lock:
+            entries = [(key, list(counts), total, count) for key, (counts, total, count) in sorted(self.values.items())]
+        samples = []
+        for key, counts, total, count in entries:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                samples.append((f"{self.name}_bucket", key + (("le", _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", key, total))
+            samples.append((f"{self.name}_count", key, count))
+        return samples
+
+
+def _register(metric):
+    with _registry_lock:
+        # Re-registering (e.g. a module reload) returns the existing metric
+        return _registry.setdefault(metric.name, metric)
+
+
+def counter(name, help):
+    return _register(Counter(name, help))
+
+
+def gauge(name, help):
+    return _register(Gauge(name, help))
+
+
+def histogram(name, help, buckets=DEFAULT_BUCKETS):
+    return _register(Histogram(name, help, buckets))
+
+
+def render():
+    """Every registered metric in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, key, value in metric.samples():
+            lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# === APPLICATION METRICS ===
+
+HTTP_FETCH_SECONDS = histogram(
+    "tradingsignals_http_fetch_duration_seconds", "Outgoing HTTP request latency per upstream host, including retries and rate-limit waits."
+)
+HTTP_FETCH_RESPONSES = counter(
+    "tradingsignals_http_fetch_responses_total", "Outgoing HTTP requests per upstream host and status (error = no response)."
+)
+HTTP_RETRIES = counter("tradingsignals_http_retries_total", "Retried outgoing requests per upstream and reason.")
+HTTP_RATE_LIMIT_WAIT_SECONDS = counter(
+    "tradingsignals_http_rate_limit_wait_seconds_total", "Time spent waiting for the upstream's request budget."
+)
+HTTP_COALESCED = counter(
+    "tradingsignals_http_coalesced_total", "Requests answered by an identical request already in flight."
+)
+RSS_ENTRIES_PARSED = counter("tradingsignals_rss_entries_parsed_total", "RSS entries parsed, per feed host.")
+HEADLINES_SCORED = counter("tradingsignals_headlines_scored_total", "Headlines scored for sentiment.")
+CACHE_REQUESTS = counter("tradingsignals_cache_requests_total", "Cache lookups per cache and result (hit / miss).")
+CACHE_HIT_RATIO = gauge("tradingsignals_cache_hit_ratio", "Share of lookups served from the cache, per cache.")
+SENTIMENT_LOG_SECONDS = histogram(
+    "tradingsignals_sentiment_log_duration_seconds", "Duration of sentiment logging jobs.",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600),
+)
+SENTIMENT_LOG_RUNNING = gauge("tradingsignals_sentiment_log_jobs_running", "Sentiment logging jobs in progress.")
+SENTIMENT_ROWS_APPENDED = counter("tradingsignals_sentiment_rows_appended_total", "Rows appended to the sentiment history.")
+SERVER_REQUEST_SECONDS = histogram("tradingsignals_server_request_duration_seconds", "Server request latency per route.")
+SERVER_IN_FLIGHT = gauge("tradingsignals_server_requests_in_flight", "Server requests being handled.")
+LIVE_TICK_SECONDS = histogram("tradingsignals_live_tick_duration_seconds", "Live daemon work per candle close (fetch + evaluate).")
+LIVE_SIGNAL_CHANGES = counter("tradingsignals_live_signal_changes_total", "Live signal changes emitted, per interval and signal.")
+PROCESS_THREADS = gauge("tradingsignals_process_threads", "Live threads in the process.")
+PROCESS_MAX_RSS = gauge("tradingsignals_process_max_resident_memory_bytes", "Peak resident memory of the process.")
+
+
+def record_cache_lookup(cache, hit):
+    """Counts a hit or miss of `cache` and updates its hit ratio."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+    hits = CACHE_REQUESTS.value(cache=cache, result="hit")
+    misses = CACHE_REQUESTS.value(cache=cache, result="miss")
+    CACHE_HIT_RATIO.set(hits / (hits + misses), cache=cache)
@@ -0,0 +1,167 @@
+# utils/profiler.py
+#
+# Lightweight pipeline instrumentation. Code marks stages and hot calls with
+#
+#   with span("backtest"): ...          or          @profiled("strategy.macd_ema")
+#
+# Spans nest, so an HTTP request made inside the "fetch" stage is recorded as
+# fetch > http api.binance.com. While profiling is disabled, span() hands back a
+# shared no-op context manager and @profiled calls straight through, so the marks
+# can stay in hot paths. Enabled, every span adds its wall time to a per-path total,
+# printed as a tree by profile_report(); an optional cProfile run is dumped as pstats.
+
+import contextlib
+import cProfile
+import functools
+import threading
+import time
+
+_enabled = False
+_cprofile = None
+_cprofile_path = None
+_totals = {}  # span path (tuple of names) -> [calls, seconds]
+_lock = threading.Lock()
+_local = threading.local()
+_NO_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("name", "path", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.path = (stack[-1] if stack else ()) + (self.name,)
+        stack.append(self.path)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        _local.stack.pop()
+        with _lock:
+            total = _totals.setdefault(self.path, [0, 0.0])
+            total[0] += 1
+            total[1] += elapsed
+        return False
+
+
+def span(name):
+    """Context manager timing the enclosed block under `name` (no-op while profiling is off)."""
+    return _Span(name) if _enabled else _NO_SPAN
+
+
+def profiled(name=None):
+    """Decorator version of span(); the span name defaults to module.function."""
+    def decorate(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def profiling_enabled():
+    return _enabled
+
+
+def enable_profiling(pstats_path=None):
+    """
+    Starts collecting spans (clearing earlier ones). With `pstats_path`, cProfile
+    runs as well and finish_profiling() writes its stats there.
+    """
+    global _enabled, _cprofile, _cprofile_path
+    reset_profile()
+    _enabled = True
+    if pstats_path:
+        _cprofile, _cprofile_path = cProfile.Profile(), pstats_path
+        _cprofile.enable()
+
+
+def finish_profiling(print_report=True, min_percent=0.5):
+    """
+    Stops profiling, writes the cProfile stats if requested and prints the span tree.
+
+    Returns:
+    - dict of span path ("fetch > http api.binance.com") -> {"calls", "seconds"}
+    """
+    global _enabled, _cprofile, _cprofile_path
+    _enabled = False
+    if _cprofile is not None:
+        _cprofile.disable()
+        _cprofile.dump_stats(_cprofile_path)
+        print(f"\n💾 cProfile stats saved to: {_cprofile_path} (python -m pstats {_cprofile_path})")
+        _cprofile = _cprofile_path = None
+    if print_report:
+        profile_report(min_percent)
+    return profile_stats()
+
+
+def reset_profile():
+    with _lock:
+        _totals.clear()
+
+
+def profile_stats():
+    with _lock:
+        return {" > ".join(path): {"calls": calls, "seconds": seconds} for path, (calls, seconds) in _totals.items()}
+
+
+def collapsed_stacks():
+    """
+    Self time per span path in the "a;b;c <microseconds>" format that flamegraph
+    tools (flamegraph.pl, speedscope) read.
+    """
+    with _lock:
+        totals = {path: seconds for path, (_, seconds) in _totals.items()}
+    children = {}
+    for path, seconds in totals.items():
+        children[path[:-1]] = children.get(path[:-1], 0.0) + seconds
+    return [
+        f"{';'.join(path)} {max(int((seconds - children.get(path, 0.0)) * 1e6), 0)}"
+        for path, seconds in sorted(totals.items())
+    ]
+
+
+def profile_report(min_percent=0.5, bar_width=30):
+    """Prints the spans as an indented tree, inner spans sorted by time and hidden under `min_percent`."""
+    with _lock:
+        totals = {path: tuple(values) for path, values in _totals.items()}
+    roots = [path for path in totals if len(path) == 1]
+    grand_total = sum(totals[path][1] for path in roots)
+    if not grand_total:
+        print("\n⏱️ No profile spans were recorded.")
+        return
+
+    print(f"\n⏱️ Pipeline profile ({grand_total:.2f} s in {len(roots)} stages):\n" + "-"*80)
+
+    def show(path):
+        calls, seconds = totals[path]
+        percent = seconds / grand_total * 100
+        # Every stage is listed; inner spans only above min_percent
+        if len(path) > 1 and percent < min_percent:
+            return
+        label = "  " * (len(path) - 1) + path[-1]
+        bar = "█" * int(round(percent / 100 * bar_width)) or "▏"
+        print(f"{label:<42} {seconds:9.3f} s {percent:5.1f}%  ×{calls:<5} {bar}")
+        kids = [p for p in totals if len(p) == len(path) + 1 and p[:-1] == path]
+        for child in sorted(kids, key=lambda p: totals[p][1], reverse=True):
+            show(child)
+        if kids:
+            own = seconds - sum(totals[p][1] for p in kids)
+            if own / grand_total * 100 >= min_percent:
+                print(f"{'  ' * len(path) + '(self)':<42} {own:9.3f} s {own / grand_total * 100:5.1f}%")
+
+    # Stages in the order they ran, everything below them by time
+    for root in roots:
+        show(root)
+    print("-"*80)
@@ -0,0 +1,86 @@
+# utils/transport.py
+#
+# The single place outgoing HTTP requests go through. Upstreams are addressed by
+# name ("binance", "coingecko") and their base URLs can be swapped at runtime, and
+# the function that actually performs a GET can be replaced, e.g. to point the
+# fetch layer at the local stand-in server (data/standin_server.py) or a recorder.
+# By default requests go through utils/http_client.py (pooling, rate limits, retries).
+
+import contextlib
+import time
+from urllib.parse import urlparse
+
+from config import BINANCE_BASE_URL, COINGECKO_BASE_URL
+from utils import http_client
+from utils.metrics import HTTP_FETCH_RESPONSES, HTTP_FETCH_SECONDS
+from utils.profiler import span
+
+BASE_URLS = {
+    "binance": BINANCE_BASE_URL,
+    "coingecko": COINGECKO_BASE_URL,
+}
+
+
+# transport(url, params=None, timeout=10, upstream=None, weight=1) -> requests.Response-like object
+_transport = http_client.get
+
+
+def set_transport(transport):
+    """Replaces the GET function (None restores the shared client). Returns the previous one."""
+    global _transport
+    previous = _transport
+    _transport = transport or http_client.get
+    return previous
+
+
+def set_base_url(upstream, url):
+    """Points an upstream at another base URL. Returns the previous one."""
+    previous = BASE_URLS.get(upstream)
+    BASE_URLS[upstream] = url.rstrip("/")
+    return previous
+
+
+@contextlib.contextmanager
+def using_upstreams(base_urls=None, transport=None):
+    """Temporarily overrides base URLs ({upstream: url}) and/or the transport."""
+    previous_urls = dict(BASE_URLS)
+    previous_transport = set_transport(transport) if transport else None
+    try:
+        for upstream, url in (base_urls or {}).items():
+            set_base_url(upstream, url)
+        yield
+    finally:
+        BASE_URLS.clear()
+        BASE_URLS.update(previous_urls)
+        if transport:
+            set_transport(previous_transport)
+
+
+def upstream_url(upstream, path):
+    if upstream not in BASE_URLS:
+        raise ValueError(f"Unknown upstream '{upstream}', expected one of {sorted(BASE_URLS)}")
+    return BASE_URLS[upstream] + path
+
+
+def http_get(url, params=None, timeout=10, upstream=None, weight=1):
+    """
+    GET an absolute URL (feeds, icon images) through the current transport. `upstream`
+    names the rate-limit budget to charge `weight` to, if any.
+    """
+    host = urlparse(url).netloc
+    start = time.perf_counter()
+    with span(f"http {host}"):
+        try:
+            response = _transport(url, params=params, timeout=timeout, upstream=upstream, weight=weight)
+        except Exception:
+            HTTP_FETCH_RESPONSES.inc(upstream=host, status="error")
+            raise
+        finally:
+            HTTP_FETCH_SECONDS.observe(time.perf_counter() - start, upstream=host)
+    HTTP_FETCH_RESPONSES.inc(upstream=host, status=str(response.status_code))
+    return response
+
+
+def upstream_get(upstream, path, params=None, timeout=10, weight=1):
+    """GET `path` relative to the upstream's base URL, e.g. upstream_get("binance", "/api/v3/klines")."""
+    return http_get(upstream_url(upstream, path), params=params, timeout=timeout, upstream=upstream, weight=weight)